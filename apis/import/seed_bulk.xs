@@ -0,0 +1,51 @@
+// Bulk-load one batch of seed rows into a table (driven by examples/seed_import.py)
+// Tables must be loaded in dependency order: agencies, categories, sources, subcategories, fees
+query "seed/bulk" verb=POST {
+  api_group = "import"
+
+  input {
+    // agencies, categories, sources, subcategories or fees
+    text table filters=trim|lower
+  
+    // Up to 1000 rows keyed by slug/name (see functions/import_bulk.xs)
+    json rows
+  
+    // Recount catalog_stats after this batch. seed_import.py sends it once,
+    // with no rows, after the last table
+    bool refresh_stats?=false
+  }
+
+  stack {
+    precondition ((($input.rows|count) > 0 || $input.refresh_stats) && ($input.rows|count) <= 1000) {
+      error_type = "inputerror"
+      error = "rows must contain between 1 and 1000 rows (or none with refresh_stats)"
+    }
+  
+    var $batch_result {
+      value = {imported: 0, updated: 0, skipped: 0, rejected: []}
+    }
+  
+    conditional {
+      if (($input.rows|count) > 0) {
+        function.run "import/bulk" {
+          input = {table: $input.table, rows: $input.rows}
+        } as $imported_batch
+      
+        var.update $batch_result {
+          value = $imported_batch
+        }
+      }
+    }
+  
+    conditional {
+      if ($input.refresh_stats) {
+        // Keep the /metadata summary row current
+        function.run "catalog_stats/refresh" {
+          input = {}
+        } as $catalog_stats
+      }
+    }
+  }
+
+  response = $batch_result
+}
\ No newline at end of file
@@ -1,4 +1,4 @@
-// Retrieve fees with filtering, sorting, and pagination.
+// Retrieve fees with filtering, sorting, and pagination (page/per_page or keyset cursor).
 query fees verb=GET {
   api_group = "public"
 
@@ -9,179 +9,311 @@ query fees verb=GET {
     int page?=1 filters=min:1
     int per_page?=20 filters=min:1|max:100
   
+    // Opaque meta.next_cursor from the previous page; when set, page is ignored
+    text cursor? filters=trim
+  
+    // Count the total matching fees (set false to skip the count on every page)
+    bool include_total?=true
+  
+    // Comma-separated fields to return (e.g. "id,name,amount,currency")
+    text fields? filters=trim
+  
+    // Return only id, name, amount and currency unless fields says otherwise
+    bool compact?=false
+  
     // API key for authentication (required)
     text api_key
   }
 
   stack {
-    // Authenticate API key
-    var $api_key_value {
-      value = $input.api_key
-    }
+    // Authenticate API key and enforce the 100 requests/hour rate limit
+    function.run "auth/api_key" {
+      input = {api_key: $input.api_key}
+    } as $auth
   
-    // If api_key starts with "Bearer ", extract the actual key
     conditional {
-      if ($api_key_value != null && (($api_key_value|index:"Bearer ") == 0)) {
-        var.update $api_key_value {
-          value = $api_key_value|replace:"Bearer ":""
-        }
+      if ($input.category != null && $input.category != "") {
+        db.query categories {
+          where = $db.categories.slug == $input.category || $db.categories.name == $input.category
+          return = {type: "exists"}
+        } as $category_exists
       
-        var.update $api_key_value {
-          value = $api_key_value|trim
+        precondition ($category_exists) {
+          error_type = "inputerror"
+          error = "Category not found"
         }
       }
     }
   
-    // Check if API key was provided
-    precondition ($api_key_value != null && ($api_key_value|strlen) > 0) {
-      error_type = "accessdenied"
-      error = "Missing API Key. Please provide api_key query parameter."
+    var $category_filter {
+      value = ($input.category != "") ? $input.category : null
     }
   
-    // Query api_keys table for matching key
-    db.get api_keys {
-      field_name = "key"
-      field_value = $api_key_value
-    } as $key_record
-  
-    // Check if key exists and is active
-    precondition ($key_record != null && $key_record.is_active) {
-      error_type = "accessdenied"
-      error = "Invalid or inactive API Key."
+    var $state_filter {
+      value = ($input.state != "") ? ($input.state|to_lower) : null
     }
   
-    // ===== RATE LIMITING BLOCK START =====
-    // This entire block can be removed to disable rate limiting
-    // Rate limit: 100 requests per hour per API key
-  
-    // Calculate 1 hour ago timestamp
-    var $one_hour_ago {
-      value = now
-        |transform_timestamp:"-1 hour":"UTC"
+    var $search_filter {
+      value = ($input.search != "") ? $input.search : null
     }
   
-    // Check if reset is needed (last_reset_at is null or >1 hour ago)
-    var $needs_reset {
-      value = ($key_record.last_reset_at == null) || ($key_record.last_reset_at < $one_hour_ago)
+    // Keyset position: the (category name, fee name, id) of the last fee on the
+    // previous page. Seeking past it costs the same on every page, where an
+    // offset has to produce and discard all the rows before it
+    var $after {
+      value = null
     }
   
-    // Reset count if needed
     conditional {
-      if ($needs_reset) {
-        db.edit api_keys {
-          field_name = "id"
-          field_value = $key_record.id
-          data = {request_count: 0, last_reset_at: now}
+      if ($input.cursor != null && $input.cursor != "") {
+        try_catch {
+          try {
+            var.update $after {
+              value = $input.cursor|base64_decode_urlsafe|json_decode
+            }
+          }
+        
+          catch {
+            var.update $after {
+              value = null
+            }
+          }
         }
       
-        // Update key_record for rate limit check
-        var.update $key_record {
-          value = $key_record|set:"request_count":0
+        precondition ($after != null && $after.id != null) {
+          error_type = "inputerror"
+          error = "Invalid cursor. Pass meta.next_cursor from a previous /fees response."
         }
       }
     }
   
-    // Check if rate limit exceeded (after potential reset)
-    var $current_count {
-      value = $key_record.request_count|first_notnull:0
+    var $after_category {
+      value = ($after != null) ? $after.c : null
     }
   
-    precondition ($current_count < 100) {
-      error_type = "accessdenied"
-      error = "Rate limit exceeded. Maximum 100 requests per hour. Please try again later."
+    var $after_name {
+      value = ($after != null) ? $after.n : null
     }
   
-    // ===== RATE LIMITING BLOCK END =====
+    var $after_id {
+      value = ($after != null) ? $after.id : null
+    }
   
-    // Increment request_count and update last_request_at
-    db.edit api_keys {
-      field_name = "id"
-      field_value = $key_record.id
-      data = {
-        request_count  : ($key_record.request_count|first_notnull:0) + 1
-        last_request_at: now
+    var $page {
+      value = ($after != null) ? 1 : $input.page
+    }
+  
+    // Projection: [] returns every field
+    function.run "fees/fields" {
+      input = {
+        fields : $input.fields
+        compact: $input.compact
+        allowed: [
+          "id"
+          "name"
+          "amount"
+          "currency"
+          "service_type"
+          "payment_code"
+          "description"
+          "meta"
+          "subcategory_id"
+          "source_id"
+          "created_at"
+          "updated_at"
+          "category_name"
+          "category_slug"
+          "agency_name"
+          "agency_slug"
+          "subcategory_name"
+          "source_name"
+        ]
       }
+    } as $projection
+  
+    var $fields {
+      value = $projection.fields
+    }
+  
+    // The source and agency joins only feed agency_*/source_name, and the
+    // category join is always needed for sorting and the cursor
+    var $join_sources {
+      value = ($fields|count) == 0 || (($fields|intersect:["agency_name", "agency_slug", "source_name"])|count) > 0
+    }
+  
+    var $format_timestamps {
+      value = ($fields|count) == 0 || (($fields|intersect:["created_at", "updated_at"])|count) > 0
+    }
+  
+    // Resolve the category to its subcategory ids up front, so the fees query
+    // filters on fees.subcategory_id (index on subcategory_id, name) instead
+    // of comparing joined category columns row by row
+    var $subcategory_ids {
+      value = null
     }
   
     conditional {
-      if ($input.category != null && $input.category != "") {
-        db.query categories {
-          where = $db.categories.slug == $input.category || $db.categories.name == $input.category
-          return = {type: "exists"}
-        } as $category_exists
+      if ($category_filter != null) {
+        db.query subcategories {
+          join = {
+            category: {
+              table: "categories"
+              where: $db.subcategories.category_id == $db.category.id
+            }
+          }
+        
+          where = $db.category.slug ==? $category_filter || $db.category.name ==? $category_filter
+          output = ["id"]
+          return = {type: "list"}
+        } as $category_subcategories
       
-        precondition ($category_exists) {
-          error_type = "inputerror"
-          error = "Category not found"
+        var.update $subcategory_ids {
+          value = $category_subcategories|map:$$.id
         }
       }
     }
   
-    var $category_filter {
-      value = ($input.category != "") ? $input.category : null
+    conditional {
+      if ($join_sources) {
+        db.query fees {
+          join = {
+            subcategory: {
+              table: "subcategories"
+              where: $db.fees.subcategory_id == $db.subcategory.id
+            }
+            category   : {
+              table: "categories"
+              where: $db.subcategory.category_id == $db.category.id
+            }
+            source     : {
+              table: "sources"
+              where: $db.fees.source_id == $db.source.id
+            }
+            agency     : {
+              table: "agencies"
+              where: $db.source.agency_id == $db.agency.id
+            }
+          }
+        
+          // The state is matched by containment on meta.state_key (the lowercased
+          // state, see functions/fee_import_key.xs) so the gin index applies
+          where = ($search_filter == null || $db.fees.name includes? $search_filter || $db.fees.description includes? $search_filter) && ($subcategory_ids == null || $db.fees.subcategory_id in $subcategory_ids) && ($state_filter == null || $db.fees.meta contains {state_key: $state_filter}) && ($after_id == null || ($db.category.name >= $after_category && ($db.category.name > $after_category || $db.fees.name > $after_name || ($db.fees.name == $after_name && $db.fees.id > $after_id))))
+          sort = {category.name: "asc", fees.name: "asc", fees.id: "asc"}
+          eval = {
+            category_name   : $db.category.name
+            category_slug   : $db.category.slug
+            agency_name     : $db.agency.name
+            agency_slug     : $db.agency.slug
+            subcategory_name: $db.subcategory.name
+            source_name     : $db.source.name
+          }
+        
+          return = {
+            type  : "list"
+            paging: {
+              page    : $page
+              per_page: $input.per_page
+              totals  : $input.include_total
+            }
+          }
+        } as $fees_result
+      }
+    
+      else {
+        db.query fees {
+          join = {
+            subcategory: {
+              table: "subcategories"
+              where: $db.fees.subcategory_id == $db.subcategory.id
+            }
+            category   : {
+              table: "categories"
+              where: $db.subcategory.category_id == $db.category.id
+            }
+          }
+        
+          // The state is matched by containment on meta.state_key (the lowercased
+          // state, see functions/fee_import_key.xs) so the gin index applies
+          where = ($search_filter == null || $db.fees.name includes? $search_filter || $db.fees.description includes? $search_filter) && ($subcategory_ids == null || $db.fees.subcategory_id in $subcategory_ids) && ($state_filter == null || $db.fees.meta contains {state_key: $state_filter}) && ($after_id == null || ($db.category.name >= $after_category && ($db.category.name > $after_category || $db.fees.name > $after_name || ($db.fees.name == $after_name && $db.fees.id > $after_id))))
+          sort = {category.name: "asc", fees.name: "asc", fees.id: "asc"}
+          eval = {
+            category_name   : $db.category.name
+            category_slug   : $db.category.slug
+            subcategory_name: $db.subcategory.name
+          }
+        
+          return = {
+            type  : "list"
+            paging: {
+              page    : $page
+              per_page: $input.per_page
+              totals  : $input.include_total
+            }
+          }
+        } as $fees_result
+      }
     }
   
-    var $state_filter {
-      value = ($input.state != "") ? $input.state : null
+    var $formatted_items {
+      value = $fees_result.items
     }
   
-    var $search_filter {
-      value = ($input.search != "") ? $input.search : null
+    conditional {
+      if ($format_timestamps) {
+        array.map ($fees_result.items) {
+          by = $this
+            |set:"created_at":($this.created_at|format_timestamp:"c")
+            |set:"updated_at":($this.updated_at|format_timestamp:"c")
+            |unset:"natural_key"
+            |unset:"content_hash"
+        } as $formatted_items
+      }
     }
   
-    db.query fees {
-      join = {
-        subcategory: {
-          table: "subcategories"
-          where: $db.fees.subcategory_id == $db.subcategory.id
-        }
-        category   : {
-          table: "categories"
-          where: $db.subcategory.category_id == $db.category.id
-        }
-        source     : {
-          table: "sources"
-          where: $db.fees.source_id == $db.source.id
-        }
-        agency     : {
-          table: "agencies"
-          where: $db.source.agency_id == $db.agency.id
-        }
+    // meta.state_key only serves the state filter; the payload keeps meta as stored upstream
+    conditional {
+      if (($fields|count) == 0 || (($fields|intersect:["meta"])|count) > 0) {
+        array.map ($formatted_items) {
+          by = $this|set:"meta":(($this.meta != null) ? ($this.meta|unset:"state_key") : null)
+        } as $formatted_items
       }
-    
-      where = ($search_filter == null || $db.fees.name includes? $search_filter || $db.fees.description includes? $search_filter) && ($category_filter == null || $db.category.slug ==? $category_filter || $db.category.name ==? $category_filter) && ($state_filter == null || $db.fees.meta.state ==? $state_filter)
-      sort = {category.name: "asc", fees.name: "asc"}
-      eval = {
-        category_name   : $db.category.name
-        agency_name     : $db.agency.name
-        subcategory_name: $db.subcategory.name
-        source_name     : $db.source.name
+    }
+  
+    conditional {
+      if (($fields|count) > 0) {
+        array.map ($formatted_items) {
+          by = $this|pick:$fields
+        } as $formatted_items
       }
-    
-      return = {
-        type  : "list"
-        paging: {
-          page    : $input.page
-          per_page: $input.per_page
-          totals  : true
+    }
+  
+    // Cursor for the page after this one (raw names, before formatting)
+    var $next_cursor {
+      value = null
+    }
+  
+    conditional {
+      if ($fees_result.nextPage != null && ($fees_result.items|count) > 0) {
+        var $last_fee {
+          value = $fees_result.items|last
+        }
+      
+        var.update $next_cursor {
+          value = {c: $last_fee.category_name, n: $last_fee.name, id: $last_fee.id}|json_encode|base64_encode_urlsafe
         }
       }
-    } as $fees_result
-  
-    array.map ($fees_result.items) {
-      by = $this
-        |set:"created_at":($this.created_at|format_timestamp:"c")
-        |set:"updated_at":($this.updated_at|format_timestamp:"c")
-    } as $formatted_items
+    }
   
     var $response_object {
       value = {
         items: $formatted_items
         meta : {
-          total: $fees_result.itemsTotal
+          total: $input.include_total ? $fees_result.itemsTotal : null
           limit: $fees_result.perPage
           offset: $fees_result.offset
           page: $fees_result.curPage
+          next_cursor: $next_cursor
+          has_more: $next_cursor != null
         }
       }
     }
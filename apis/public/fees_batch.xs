@@ -0,0 +1,159 @@
+// GET /fees/batch - Returns up to 100 fees by ID in one joined query
+// Results follow the order of the ids parameter; ids without a fee get a {id, not_found: true} marker. Counts as one request against the API key's quota.
+query "fees/batch" verb=GET {
+  api_group = "public"
+
+  input {
+    // Comma-separated fee IDs (e.g. "1,5,20"), at most 100
+    text ids filters=trim
+  
+    // Comma-separated fields to return (e.g. "id,name,amount,currency")
+    text fields? filters=trim
+  
+    // Return only id, name, amount and currency unless fields says otherwise
+    bool compact?=false
+  
+    // API key for authentication (required)
+    text api_key
+  }
+
+  stack {
+    // Authenticate API key and enforce the 100 requests/hour rate limit
+    // (one batch is one request, however many ids it carries)
+    function.run "auth/api_key" {
+      input = {api_key: $input.api_key}
+    } as $auth
+  
+    var $id_values {
+      value = (($input.ids|first_notnull:"")|split:",")|filter:(($$|trim|strlen) > 0)
+    }
+  
+    array.map ($id_values) {
+      by = $this|trim|to_int
+    } as $ids
+  
+    precondition (($ids|count) > 0 && ($ids|count) <= 100) {
+      error_type = "inputerror"
+      error = "Parameter 'ids' must list between 1 and 100 fee IDs"
+    }
+  
+    precondition (($ids|filter:($$ == null || $$ < 1)|count) == 0) {
+      error_type = "inputerror"
+      error = "Parameter 'ids' must be a comma-separated list of positive integers"
+    }
+  
+    // Projection: [] returns every field
+    function.run "fees/fields" {
+      input = {
+        fields : $input.fields
+        compact: $input.compact
+        allowed: [
+          "id"
+          "name"
+          "amount"
+          "currency"
+          "service_type"
+          "payment_code"
+          "description"
+          "meta"
+          "subcategory_id"
+          "source_id"
+          "created_at"
+          "updated_at"
+          "category_name"
+          "category_slug"
+          "agency_name"
+          "agency_slug"
+          "subcategory_name"
+          "source_name"
+        ]
+      }
+    } as $projection
+  
+    var $fields {
+      value = $projection.fields
+    }
+  
+    // Every requested fee with its relationships in one query; left joins keep
+    // fees whose subcategory or source is missing
+    db.query fees {
+      join = {
+        subcategory: {
+          table: "subcategories"
+          type : "left"
+          where: $db.fees.subcategory_id == $db.subcategory.id
+        }
+        category   : {
+          table: "categories"
+          type : "left"
+          where: $db.subcategory.category_id == $db.category.id
+        }
+        source     : {
+          table: "sources"
+          type : "left"
+          where: $db.fees.source_id == $db.source.id
+        }
+        agency     : {
+          table: "agencies"
+          type : "left"
+          where: $db.source.agency_id == $db.agency.id
+        }
+      }
+    
+      where = $db.fees.id in ($ids|unique)
+      eval = {
+        category_name   : $db.category.name
+        category_slug   : $db.category.slug
+        agency_name     : $db.agency.name
+        agency_slug     : $db.agency.slug
+        subcategory_name: $db.subcategory.name
+        source_name     : $db.source.name
+      }
+    
+      return = {type: "list"}
+    } as $fees
+  
+    array.map ($fees) {
+      by = $this
+        |set:"created_at":($this.created_at|format_timestamp:"c")
+        |set:"updated_at":($this.updated_at|format_timestamp:"c")
+        |unset:"natural_key"
+        |unset:"content_hash"
+        |set:"meta":(($this.meta != null) ? ($this.meta|unset:"state_key") : null)
+    } as $fees
+  
+    var $fees_by_id {
+      value = $fees|index_by:"id"
+    }
+  
+    // Back to the caller's order, with a marker for every id that has no fee
+    array.map ($ids) {
+      by = $fees_by_id|get:($this|to_text):{id: $this, not_found: true}
+    } as $items
+  
+    conditional {
+      if (($fields|count) > 0) {
+        array.map ($items) {
+          by = ($this.not_found == true) ? $this : ($this|pick:$fields)
+        } as $items
+      }
+    }
+  
+    var $missing_ids {
+      value = $ids|filter:(($fees_by_id|get:($$|to_text)) == null)
+    }
+  
+    var $response_object {
+      value = {
+        items: $items
+        meta : {
+          requested: $ids|count
+          found    : ($ids|count) - ($missing_ids|count)
+          not_found: $missing_ids|unique
+        }
+      }
+    }
+  }
+
+  response = $response_object
+}
\ No newline at end of file
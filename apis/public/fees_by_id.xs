@@ -1,5 +1,5 @@
 // GET /fees/{id} - Returns a single fee by ID with all relationships
-// Returns a single government fee by ID with all relationships including subcategory, category, agency, and source. Returns 404 if not found.
+// Returns a single government fee by ID with all relationships including subcategory, category, agency, and source. Returns 404 if not found. Supports fields= projection and compact=true.
 query "fees/{id}" verb=GET {
   api_group = "public"
 
@@ -7,126 +7,191 @@ query "fees/{id}" verb=GET {
     // Fee ID
     int id filters=min:1
   
+    // Comma-separated fields to return (e.g. "id,name,amount,currency,source")
+    text fields? filters=trim
+  
+    // Return only id, name, amount and currency unless fields says otherwise
+    bool compact?=false
+  
     // API key for authentication (required)
     text api_key
   }
 
   stack {
-    // Authenticate API key
-    var $api_key_value {
-      value = $input.api_key
-    }
+    // Authenticate API key and enforce the 100 requests/hour rate limit
+    function.run "auth/api_key" {
+      input = {api_key: $input.api_key}
+    } as $auth
   
-    // If api_key starts with "Bearer ", extract the actual key
-    conditional {
-      if ($api_key_value != null && (($api_key_value|index:"Bearer ") == 0)) {
-        var.update $api_key_value {
-          value = $api_key_value|replace:"Bearer ":""
-        }
-      
-        var.update $api_key_value {
-          value = $api_key_value|trim
-        }
+    // Projection: [] returns every field
+    function.run "fees/fields" {
+      input = {
+        fields : $input.fields
+        compact: $input.compact
+        allowed: [
+          "id"
+          "name"
+          "amount"
+          "currency"
+          "service_type"
+          "payment_code"
+          "description"
+          "meta"
+          "subcategory_id"
+          "source_id"
+          "created_at"
+          "updated_at"
+          "subcategory"
+          "source"
+        ]
       }
-    }
+    } as $projection
   
-    // Check if API key was provided
-    precondition ($api_key_value != null && ($api_key_value|strlen) > 0) {
-      error_type = "accessdenied"
-      error = "Missing API Key. Please provide api_key query parameter."
+    var $fields {
+      value = $projection.fields
     }
   
-    // Query api_keys table for matching key
-    db.get api_keys {
-      field_name = "key"
-      field_value = $api_key_value
-    } as $key_record
-  
-    // Check if key exists and is active
-    precondition ($key_record != null && $key_record.is_active) {
-      error_type = "accessdenied"
-      error = "Invalid or inactive API Key."
-    }
-  
-    // ===== RATE LIMITING BLOCK START =====
-    // This entire block can be removed to disable rate limiting
-    // Rate limit: 100 requests per hour per API key
-  
-    // Calculate 1 hour ago timestamp
-    var $one_hour_ago {
-      value = now
-        |transform_timestamp:"-1 hour":"UTC"
+    // The relationship joins only feed the nested subcategory and source, so
+    // a projection without them (compact=true, fields=id,name,...) skips them
+    var $join_relationships {
+      value = ($fields|count) == 0 || (($fields|intersect:["subcategory", "source"])|count) > 0
     }
   
-    // Check if reset is needed (last_reset_at is null or >1 hour ago)
-    var $needs_reset {
-      value = ($key_record.last_reset_at == null) || ($key_record.last_reset_at < $one_hour_ago)
-    }
-  
-    // Reset count if needed
     conditional {
-      if ($needs_reset) {
-        db.edit api_keys {
+      if ($join_relationships) {
+        // Retrieve the fee with its subcategory, category, source and agency in
+        // one left-joined query; a missing relationship leaves its columns null
+        db.query fees {
+          join = {
+            subcategory: {
+              table: "subcategories"
+              type : "left"
+              where: $db.fees.subcategory_id == $db.subcategory.id
+            }
+            category   : {
+              table: "categories"
+              type : "left"
+              where: $db.subcategory.category_id == $db.category.id
+            }
+            source     : {
+              table: "sources"
+              type : "left"
+              where: $db.fees.source_id == $db.source.id
+            }
+            agency     : {
+              table: "agencies"
+              type : "left"
+              where: $db.source.agency_id == $db.agency.id
+            }
+          }
+        
+          where = $db.fees.id == $input.id
+          eval = {
+            subcategory__id         : $db.subcategory.id
+            subcategory__category_id: $db.subcategory.category_id
+            subcategory__name       : $db.subcategory.name
+            subcategory__slug       : $db.subcategory.slug
+            subcategory__description: $db.subcategory.description
+            subcategory__created_at : $db.subcategory.created_at
+            subcategory__updated_at : $db.subcategory.updated_at
+            category__id            : $db.category.id
+            category__name          : $db.category.name
+            category__slug          : $db.category.slug
+            category__description   : $db.category.description
+            category__created_at    : $db.category.created_at
+            category__updated_at    : $db.category.updated_at
+            source__id              : $db.source.id
+            source__agency_id       : $db.source.agency_id
+            source__name            : $db.source.name
+            source__url             : $db.source.url
+            source__document_ref    : $db.source.document_ref
+            source__notes           : $db.source.notes
+            source__created_at      : $db.source.created_at
+            source__updated_at      : $db.source.updated_at
+            agency__id              : $db.agency.id
+            agency__name            : $db.agency.name
+            agency__slug            : $db.agency.slug
+            agency__website         : $db.agency.website
+            agency__notes           : $db.agency.notes
+            agency__created_at      : $db.agency.created_at
+            agency__updated_at      : $db.agency.updated_at
+          }
+        
+          return = {type: "single"}
+        } as $row
+      }
+    
+      else {
+        db.get fees {
           field_name = "id"
-          field_value = $key_record.id
-          data = {request_count: 0, last_reset_at: now}
-        }
-      
-        // Update key_record for rate limit check
-        var.update $key_record {
-          value = $key_record|set:"request_count":0
-        }
+          field_value = $input.id
+        } as $row
       }
     }
   
-    // Check if rate limit exceeded (after potential reset)
-    var $current_count {
-      value = $key_record.request_count|first_notnull:0
+    precondition ($row != null) {
+      error_type = "notfound"
+      error = "Fee not found with ID " ~ ($input.id|to_text)
     }
   
-    precondition ($current_count < 100) {
-      error_type = "accessdenied"
-      error = "Rate limit exceeded. Maximum 100 requests per hour. Please try again later."
+    var $fee {
+      value = $row|pick:["id", "subcategory_id", "source_id", "name", "amount", "currency", "service_type", "payment_code", "description", "meta", "created_at", "updated_at"]
     }
   
-    // ===== RATE LIMITING BLOCK END =====
-  
-    // Increment request_count and update last_request_at
-    db.edit api_keys {
-      field_name = "id"
-      field_value = $key_record.id
-      data = {
-        request_count  : ($key_record.request_count|first_notnull:0) + 1
-        last_request_at: now
+    // meta.state_key only serves GET /fees?state=; keep it out of the payload
+    conditional {
+      if ($fee.meta != null) {
+        var.update $fee {
+          value = $fee|set:"meta":($fee.meta|unset:"state_key")
+        }
       }
     }
   
-    // Retrieve the main fee record by ID
-    db.get fees {
-      field_name = "id"
-      field_value = $input.id
-    } as $fee
-  
-    // Validate fee exists before fetching relationships
-    precondition ($fee != null) {
-      error_type = "notfound"
-      error = "Fee not found with ID " ~ ($input.id|to_text)
-    }
-  
-    // Fetch Subcategory and its parent Category
+    // Nest the joined records exactly as the per-record lookups did: a key is
+    // present when the fee (or subcategory/source) references it, null when
+    // the referenced row does not exist
     conditional {
-      if ($fee.subcategory_id != null) {
-        db.get subcategories {
-          field_name = "id"
-          field_value = $fee.subcategory_id
-        } as $subcategory
+      if ($fee.subcategory_id != null && (($fields|count) == 0 || (($fields|intersect:["subcategory"])|count) > 0)) {
+        var $subcategory {
+          value = null
+        }
+      
+        conditional {
+          if ($row.subcategory__id != null) {
+            var.update $subcategory {
+              value = {
+                id         : $row.subcategory__id
+                category_id: $row.subcategory__category_id
+                name       : $row.subcategory__name
+                slug       : $row.subcategory__slug
+                description: $row.subcategory__description
+                created_at : $row.subcategory__created_at
+                updated_at : $row.subcategory__updated_at
+              }
+            }
+          }
+        }
       
         conditional {
           if ($subcategory != null && $subcategory.category_id != null) {
-            db.get categories {
-              field_name = "id"
-              field_value = $subcategory.category_id
-            } as $category
+            var $category {
+              value = null
+            }
+          
+            conditional {
+              if ($row.category__id != null) {
+                var.update $category {
+                  value = {
+                    id         : $row.category__id
+                    name       : $row.category__name
+                    slug       : $row.category__slug
+                    description: $row.category__description
+                    created_at : $row.category__created_at
+                    updated_at : $row.category__updated_at
+                  }
+                }
+              }
+            }
           
             // Nest category inside subcategory
             var.update $subcategory {
@@ -142,20 +207,50 @@ query "fees/{id}" verb=GET {
       }
     }
   
-    // Fetch Source and its parent Agency
     conditional {
-      if ($fee.source_id != null) {
-        db.get sources {
-          field_name = "id"
-          field_value = $fee.source_id
-        } as $source
+      if ($fee.source_id != null && (($fields|count) == 0 || (($fields|intersect:["source"])|count) > 0)) {
+        var $source {
+          value = null
+        }
+      
+        conditional {
+          if ($row.source__id != null) {
+            var.update $source {
+              value = {
+                id          : $row.source__id
+                agency_id   : $row.source__agency_id
+                name        : $row.source__name
+                url         : $row.source__url
+                document_ref: $row.source__document_ref
+                notes       : $row.source__notes
+                created_at  : $row.source__created_at
+                updated_at  : $row.source__updated_at
+              }
+            }
+          }
+        }
       
         conditional {
           if ($source != null && $source.agency_id != null) {
-            db.get agencies {
-              field_name = "id"
-              field_value = $source.agency_id
-            } as $agency
+            var $agency {
+              value = null
+            }
+          
+            conditional {
+              if ($row.agency__id != null) {
+                var.update $agency {
+                  value = {
+                    id        : $row.agency__id
+                    name      : $row.agency__name
+                    slug      : $row.agency__slug
+                    website   : $row.agency__website
+                    notes     : $row.agency__notes
+                    created_at: $row.agency__created_at
+                    updated_at: $row.agency__updated_at
+                  }
+                }
+              }
+            }
           
             // Nest agency inside source
             var.update $source {
@@ -170,6 +265,14 @@ query "fees/{id}" verb=GET {
         }
       }
     }
+  
+    conditional {
+      if (($fields|count) > 0) {
+        var.update $fee {
+          value = $fee|pick:$fields
+        }
+      }
+    }
   }
 
   response = $fee
@@ -0,0 +1,161 @@
+// Return fees created, updated or deleted after a cursor, for incremental sync.
+query "fees/changes" verb=GET {
+  api_group = "public"
+
+  input {
+    // Changes strictly after this updated_at (milliseconds since epoch)
+    int since?=0 filters=min:0
+  
+    // Tie-breaker for rows sharing the `since` timestamp (last fee id seen)
+    int after_id?=0 filters=min:0
+  
+    // Deletions after this tombstone id
+    int deleted_after?=0 filters=min:0
+  
+    // Maximum changed fees and deletions returned per call
+    int limit?=100 filters=min:1|max:500
+  
+    // API key for authentication (required)
+    text api_key
+  }
+
+  stack {
+    // Authenticate API key and enforce the 100 requests/hour rate limit
+    function.run "auth/api_key" {
+      input = {api_key: $input.api_key}
+    } as $auth
+  
+    // updated_at is stamped before a write commits, so a slow write can land
+    // with a timestamp older than rows already delivered. Only rows older than
+    // this settle window are returned; newer ones come on a later call, and the
+    // cursor never moves past a timestamp a pending write can still use
+    var $settled_before {
+      value = now - 60000
+    }
+  
+    // Fees changed after the cursor, oldest first; uses the updated_at index.
+    // One row past the limit is read to tell whether there are more
+    db.query fees {
+      join = {
+        subcategory: {
+          table: "subcategories"
+          type : "left"
+          where: $db.fees.subcategory_id == $db.subcategory.id
+        }
+        category   : {
+          table: "categories"
+          type : "left"
+          where: $db.subcategory.category_id == $db.category.id
+        }
+        source     : {
+          table: "sources"
+          type : "left"
+          where: $db.fees.source_id == $db.source.id
+        }
+        agency     : {
+          table: "agencies"
+          type : "left"
+          where: $db.source.agency_id == $db.agency.id
+        }
+      }
+    
+      // The leading >= lets the (updated_at, id) index seek to the cursor; the OR breaks ties
+      where = $db.fees.updated_at >= $input.since && ($db.fees.updated_at > $input.since || $db.fees.id > $input.after_id) && $db.fees.updated_at < $settled_before
+      sort = {fees.updated_at: "asc", fees.id: "asc"}
+      eval = {
+        category_name   : $db.category.name
+        category_slug   : $db.category.slug
+        agency_name     : $db.agency.name
+        agency_slug     : $db.agency.slug
+        subcategory_name: $db.subcategory.name
+        source_name     : $db.source.name
+      }
+    
+      return = {
+        type  : "list"
+        paging: {page: 1, per_page: $input.limit + 1}
+      }
+    } as $changed_result
+  
+    // Deletions after the tombstone cursor, oldest first, with the same settle window
+    db.query fee_tombstones {
+      where = $db.fee_tombstones.id > $input.deleted_after && $db.fee_tombstones.deleted_at < $settled_before
+      sort = {fee_tombstones.id: "asc"}
+      return = {
+        type  : "list"
+        paging: {page: 1, per_page: $input.limit + 1}
+      }
+    } as $tombstone_result
+  
+    var $has_more {
+      value = ($changed_result.items|count) > $input.limit || ($tombstone_result.items|count) > $input.limit
+    }
+  
+    var $changed_items {
+      value = $changed_result.items|array_slice:0:$input.limit
+    }
+  
+    var $tombstone_items {
+      value = $tombstone_result.items|array_slice:0:$input.limit
+    }
+  
+    // Advance the cursor past the last row returned (raw timestamps, before formatting)
+    var $next_cursor {
+      value = {
+        since        : $input.since
+        after_id     : $input.after_id
+        deleted_after: $input.deleted_after
+      }
+    }
+  
+    conditional {
+      if (($changed_items|count) > 0) {
+        var $last_changed {
+          value = $changed_items|last
+        }
+      
+        var.update $next_cursor {
+          value = $next_cursor
+            |set:"since":$last_changed.updated_at
+            |set:"after_id":$last_changed.id
+        }
+      }
+    }
+  
+    conditional {
+      if (($tombstone_items|count) > 0) {
+        var $last_tombstone {
+          value = $tombstone_items|last
+        }
+      
+        var.update $next_cursor {
+          value = $next_cursor|set:"deleted_after":$last_tombstone.id
+        }
+      }
+    }
+  
+    array.map ($changed_items) {
+      by = $this
+        |set:"created_at":($this.created_at|format_timestamp:"c")
+        |set:"updated_at":($this.updated_at|format_timestamp:"c")
+        |unset:"natural_key"
+        |unset:"content_hash"
+        |set:"meta":(($this.meta != null) ? ($this.meta|unset:"state_key") : null)
+    } as $formatted_items
+  
+    array.map ($tombstone_items) {
+      by = $this.fee_id
+    } as $deleted_ids
+  
+    var $response_object {
+      value = {
+        items      : $formatted_items
+        deleted    : $deleted_ids
+        next_cursor: $next_cursor
+        has_more   : $has_more
+      }
+    }
+  }
+
+  response = $response_object
+}
\ No newline at end of file
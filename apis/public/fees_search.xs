@@ -1,114 +1,133 @@
 // GET /fees/search - Search fees by query parameter
-// Searches fees by name and description using the 'q' query parameter. Returns up to 20 results with all relationships included.
+// Searches fee name, service type, payment code and description using the 'q' query parameter. Returns up to 20 results, name matches first, with all relationships included. mode=fuzzy tolerates typos and known synonyms.
 query "fees/search" verb=GET {
   api_group = "public"
 
   input {
-    // Search query (required, minimum 2 characters). Searches in fee name and description.
+    // Search query (required, minimum 2 characters). Searches in fee name, service type, payment code and description.
     text q filters=trim|min:2
   
+    // "exact" (substring match) or "fuzzy" (typo-tolerant, synonym-aware)
+    text mode?="exact" filters=trim|lower
+  
     // API key for authentication (required)
     text api_key
   }
 
   stack {
-    // Authenticate API key
-    var $api_key_value {
-      value = $input.api_key
-    }
+    // Authenticate API key and enforce the 100 requests/hour rate limit
+    function.run "auth/api_key" {
+      input = {api_key: $input.api_key}
+    } as $auth
   
-    // If api_key starts with "Bearer ", extract the actual key
-    conditional {
-      if ($api_key_value != null && (($api_key_value|index:"Bearer ") == 0)) {
-        var.update $api_key_value {
-          value = $api_key_value|replace:"Bearer ":""
-        }
-      
-        var.update $api_key_value {
-          value = $api_key_value|trim
-        }
-      }
-    }
-  
-    // Check if API key was provided
-    precondition ($api_key_value != null && ($api_key_value|strlen) > 0) {
-      error_type = "accessdenied"
-      error = "Missing API Key. Please provide api_key query parameter."
+    // Validate query parameter
+    // Validate search query is at least 2 characters
+    precondition (($input.q|strlen) >= 2) {
+      error_type = "inputerror"
+      error = "Search query 'q' must be at least 2 characters long"
     }
   
-    // Query api_keys table for matching key
-    db.get api_keys {
-      field_name = "key"
-      field_value = $api_key_value
-    } as $key_record
-  
-    // Check if key exists and is active
-    precondition ($key_record != null && $key_record.is_active) {
-      error_type = "accessdenied"
-      error = "Invalid or inactive API Key."
+    precondition ($input.mode == "exact" || $input.mode == "fuzzy") {
+      error_type = "inputerror"
+      error = "Search mode must be 'exact' or 'fuzzy'"
     }
   
-    // ===== RATE LIMITING BLOCK START =====
-    // This entire block can be removed to disable rate limiting
-    // Rate limit: 100 requests per hour per API key
+    function.run "search/trigrams" {
+      input = {value: $input.q}
+    } as $query_index
   
-    // Calculate 1 hour ago timestamp
-    var $one_hour_ago {
-      value = now
-        |transform_timestamp:"-1 hour":"UTC"
+    var $query_text {
+      value = $query_index.normalized
     }
   
-    // Check if reset is needed (last_reset_at is null or >1 hour ago)
-    var $needs_reset {
-      value = ($key_record.last_reset_at == null) || ($key_record.last_reset_at < $one_hour_ago)
+    var $ranked_ids {
+      value = []
     }
   
-    // Reset count if needed
     conditional {
-      if ($needs_reset) {
-        db.edit api_keys {
-          field_name = "id"
-          field_value = $key_record.id
-          data = {request_count: 0, last_reset_at: now}
+      if ($input.mode == "fuzzy") {
+        function.run "fees/fuzzy_search" {
+          input = {q: $input.q, limit: 20}
+        } as $fuzzy_ids
+      
+        var.update $ranked_ids {
+          value = $fuzzy_ids
         }
+      }
+    
+      elseif (($query_index.grams|count) > 0) {
+        // Tier 1: name matches. The GIN index on name_terms finds rows holding
+        // every query trigram; the substring check on name_text only rechecks
+        // those rows, so a name holding the trigrams but not the query falls
+        // through to tier 2
+        db.query fee_search_index {
+          join = {
+            fee: {
+              table: "fees"
+              where: $db.fee_search_index.fee_id == $db.fee.id
+            }
+          }
+        
+          where = $db.fee_search_index.name_terms contains $query_index.grams && $db.fee_search_index.name_text includes $query_text
+          sort = {fee.name: "asc"}
+          output = ["fee_id"]
+          return = {type: "list", paging: {page: 1, per_page: 20}}
+        } as $name_matches
       
-        // Update key_record for rate limit check
-        var.update $key_record {
-          value = $key_record|set:"request_count":0
+        var.update $ranked_ids {
+          value = $name_matches.items|map:$$.fee_id
+        }
+      
+        // Tier 2: matches in service type, payment code or description only
+        conditional {
+          if (($ranked_ids|count) < 20) {
+            db.query fee_search_index {
+              join = {
+                fee: {
+                  table: "fees"
+                  where: $db.fee_search_index.fee_id == $db.fee.id
+                }
+              }
+            
+              where = $db.fee_search_index.search_terms contains $query_index.grams && $db.fee_search_index.search_text includes $query_text && ($db.fee_search_index.name_terms not contains $query_index.grams || $db.fee_search_index.name_text not includes $query_text)
+              sort = {fee.name: "asc"}
+              output = ["fee_id"]
+              return = {
+                type  : "list"
+                paging: {page: 1, per_page: 20 - ($ranked_ids|count)}
+              }
+            } as $other_matches
+          
+            var.update $ranked_ids {
+              value = $ranked_ids|merge:($other_matches.items|map:$$.fee_id)
+            }
+          }
         }
       }
-    }
-  
-    // Check if rate limit exceeded (after potential reset)
-    var $current_count {
-      value = $key_record.request_count|first_notnull:0
-    }
-  
-    precondition ($current_count < 100) {
-      error_type = "accessdenied"
-      error = "Rate limit exceeded. Maximum 100 requests per hour. Please try again later."
-    }
-  
-    // ===== RATE LIMITING BLOCK END =====
-  
-    // Increment request_count and update last_request_at
-    db.edit api_keys {
-      field_name = "id"
-      field_value = $key_record.id
-      data = {
-        request_count  : ($key_record.request_count|first_notnull:0) + 1
-        last_request_at: now
+    
+      else {
+        // Query words shorter than 3 characters have no trigrams; scan search_text
+        db.query fee_search_index {
+          join = {
+            fee: {
+              table: "fees"
+              where: $db.fee_search_index.fee_id == $db.fee.id
+            }
+          }
+        
+          where = $db.fee_search_index.search_text includes $query_text
+          sort = {fee.name: "asc"}
+          output = ["fee_id"]
+          return = {type: "list", paging: {page: 1, per_page: 20}}
+        } as $short_matches
+      
+        var.update $ranked_ids {
+          value = $short_matches.items|map:$$.fee_id
+        }
       }
     }
   
-    // Validate query parameter
-    // Validate search query is at least 2 characters
-    precondition (($input.q|strlen) >= 2) {
-      error_type = "inputerror"
-      error = "Search query 'q' must be at least 2 characters long"
-    }
-  
-    // Search fees with relationships
+    // Load at most 20 ranked fees with their relationships
     db.query fees {
       join = {
         subcategory: {
@@ -133,11 +152,26 @@ query "fees/search" verb=GET {
         }
       }
     
-      where = (($db.fees.name includes $input.q) || ($db.fees.description includes $input.q))
-      sort = {fees.name: "asc"}
-      return = {type: "list", paging: {page: 1, per_page: 20}}
+      where = $db.fees.id in $ranked_ids
+      eval = {
+        category_name   : $db.category.name
+        agency_name     : $db.agency.name
+        subcategory_name: $db.subcategory.name
+        source_name     : $db.source.name
+      }
+    
+      return = {type: "list"}
+    } as $matched_fees
+  
+    var $fees_by_id {
+      value = $matched_fees|index_by:"id"
+    }
+  
+    // Restore relevance order
+    array.map ($ranked_ids) {
+      by = $fees_by_id|get:($this|to_text)|unset:"natural_key"|unset:"content_hash"
     } as $search_results
   }
 
-  response = $search_results.items
+  response = $search_results
 }
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Nigerian Government Fees API - /categories Load Test
+
+Shows how GET /categories latency scales with the number of categories and
+fees for the three plans the endpoint has used:
+
+- per-category: list categories, then one joined fee count per category (1+N queries)
+- fetch-all: list categories, then fetch every fee's category_id through the
+  subcategory join and group and count the rows in the API (2 queries, but
+  every fee row is read and shipped on every request)
+- materialized: list categories, then read the per-category counts stored
+  in the catalog_stats row (2 queries, no fee rows read). Writes keep the
+  counts current with one additive UPDATE per touched category
+  (catalog_stats/apply_delta, the delta column); the full grouping pass
+  (catalog_stats/refresh, the refresh column) only runs nightly
+
+The plans run against an in-memory SQLite copy of the categories,
+subcategories and fees tables, so no API quota is spent. In-process SQLite
+has no per-query round trip, which is what makes 1+N expensive on the
+hosted database, so each statement is also charged --round-trip-ms. Pass
+--api-key to also measure the live endpoint under concurrent load.
+
+Run:
+    python bench_categories.py [--categories 6 50 200 1000] [--fees 5000 100000] [--round-trip-ms 0.5]
+    python bench_categories.py --api-key nga_your_api_key_here --requests 20 --workers 4
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Tuple
+
+from fees_client import BASE_URL, FeesClient, handle_response
+
+SCHEMA = '''
+CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT, description TEXT);
+CREATE TABLE subcategories (id INTEGER PRIMARY KEY, category_id INTEGER);
+CREATE TABLE fees (id INTEGER PRIMARY KEY, subcategory_id INTEGER, name TEXT);
+CREATE INDEX subcategories_category_id ON subcategories (category_id);
+CREATE INDEX fees_subcategory_id ON fees (subcategory_id);
+CREATE TABLE catalog_stats (id INTEGER PRIMARY KEY, category_fee_counts TEXT);
+'''
+
+
+def build_catalog(categories: int, fees: int, seed: int = 42) -> sqlite3.Connection:
+    """Create an in-memory catalog; every fifth category is left without fees."""
+    rng = random.Random(seed)
+    db = sqlite3.connect(':memory:', check_same_thread=False)
+    db.executescript(SCHEMA)
+
+    db.executemany(
+        'INSERT INTO categories (id, name, description) VALUES (?, ?, ?)',
+        [(i, f'Category {i}', None) for i in range(1, categories + 1)]
+    )
+    subcategories = [(i, i) for i in range(1, categories + 1) if i % 5 != 0] or [(1, 1)]
+    db.executemany('INSERT INTO subcategories (id, category_id) VALUES (?, ?)', subcategories)
+    db.executemany(
+        'INSERT INTO fees (id, subcategory_id, name) VALUES (?, ?, ?)',
+        [(i, rng.choice(subcategories)[0], f'Fee {i}') for i in range(1, fees + 1)]
+    )
+    db.commit()
+    refresh_stats(db)
+    return db
+
+
+def refresh_stats(db: sqlite3.Connection):
+    """catalog_stats/refresh: one grouped pass over fees, stored as {category id: count} in row 1."""
+    counts: Dict[str, int] = {}
+    for (category_id,) in db.execute(
+        'SELECT subcategories.category_id FROM fees JOIN subcategories ON fees.subcategory_id = subcategories.id'
+    ):
+        counts[str(category_id)] = counts.get(str(category_id), 0) + 1
+    db.execute('INSERT OR REPLACE INTO catalog_stats (id, category_fee_counts) VALUES (1, ?)', (json.dumps(counts),))
+    db.commit()
+
+
+def apply_delta(db: sqlite3.Connection, category_id: int, delta: int):
+    """catalog_stats/apply_delta: add `delta` to one category's count in place."""
+    path = f'$."{category_id}"'
+    db.execute(
+        'UPDATE catalog_stats SET category_fee_counts = '
+        'json_set(category_fee_counts, ?, COALESCE(json_extract(category_fee_counts, ?), 0) + ?) WHERE id = 1',
+        (path, path, delta)
+    )
+    db.commit()
+
+
+def delete_and_readd(db: sqlite3.Connection):
+    """The stats writes for deleting one fee and importing it again: two single-category deltas."""
+    apply_delta(db, 1, -1)
+    apply_delta(db, 1, 1)
+
+
+def per_category_counts(db: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """The previous plan: one joined count query per category."""
+    result = []
+    for category_id, name, description in db.execute('SELECT id, name, description FROM categories'):
+        fee_count = db.execute(
+            'SELECT COUNT(*) FROM fees JOIN subcategories ON fees.subcategory_id = subcategories.id '
+            'WHERE subcategories.category_id = ?',
+            (category_id,)
+        ).fetchone()[0]
+        result.append({'id': category_id, 'display_name': name, 'description': description, 'fee_count': fee_count})
+    return result
+
+
+def fetch_all_counts(db: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """The previous plan: fetch every fee's category_id, then array.group_by and count in the API."""
+    categories = db.execute('SELECT id, name, description FROM categories').fetchall()
+    fee_categories = db.execute(
+        'SELECT subcategories.category_id FROM fees JOIN subcategories ON fees.subcategory_id = subcategories.id'
+    ).fetchall()
+    groups: Dict[int, List[tuple]] = {}
+    for row in fee_categories:
+        groups.setdefault(row[0], []).append(row)
+    return [
+        {'id': category_id, 'display_name': name, 'description': description,
+         'fee_count': len(groups.get(category_id, []))}
+        for category_id, name, description in categories
+    ]
+
+
+def materialized_counts(db: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """The current plan: the category list plus the catalog_stats row, read by primary key."""
+    categories = db.execute('SELECT id, name, description FROM categories').fetchall()
+    counts = json.loads(db.execute('SELECT category_fee_counts FROM catalog_stats WHERE id = 1').fetchone()[0])
+    return [
+        {'id': category_id, 'display_name': name, 'description': description,
+         'fee_count': counts.get(str(category_id), 0)}
+        for category_id, name, description in categories
+    ]
+
+
+def time_plan(plan, db: sqlite3.Connection, iterations: int, round_trip_ms: float) -> Tuple[float, int]:
+    """Median time of `plan` in milliseconds (plus round trips) and the statements it ran."""
+    statements = []
+    db.set_trace_callback(statements.append)
+    samples = []
+    for _ in range(iterations):
+        statements.clear()
+        started = time.perf_counter()
+        plan(db)
+        samples.append((time.perf_counter() - started) * 1000 + len(statements) * round_trip_ms)
+    db.set_trace_callback(None)
+    return statistics.median(samples), len(statements)
+
+
+def run_local(category_counts: List[int], fee_counts: List[int], iterations: int, round_trip_ms: float):
+    print(f"Local plans, {round_trip_ms}ms per query round trip, median of {iterations} runs "
+          f"(delta runs per write, refresh nightly; neither per request)\n")
+    print(f"{'categories':>10}  {'fees':>7}  {'per-category':>22}  {'fetch-all':>11}  {'materialized':>12}  "
+          f"{'delta':>9}  {'refresh':>9}")
+    for fees in fee_counts:
+        for categories in category_counts:
+            db = build_catalog(categories, fees)
+            assert per_category_counts(db) == fetch_all_counts(db) == materialized_counts(db)
+            per_category, per_category_queries = time_plan(per_category_counts, db, iterations, round_trip_ms)
+            fetch_all, _ = time_plan(fetch_all_counts, db, iterations, round_trip_ms)
+            materialized, _ = time_plan(materialized_counts, db, iterations, round_trip_ms)
+            delta, _ = time_plan(delete_and_readd, db, iterations, round_trip_ms)
+            assert materialized_counts(db) == per_category_counts(db)
+            refresh, _ = time_plan(refresh_stats, db, 1, round_trip_ms)
+            print(
+                f"{categories:>10}  {fees:>7}  {per_category:>9.2f}ms {per_category_queries:>5} queries"
+                f"  {fetch_all:>9.2f}ms  {materialized:>10.2f}ms  {delta / 2:>7.2f}ms  {refresh:>7.2f}ms"
+            )
+            db.close()
+
+
+def run_live(base_url: str, api_key: str, total: int, workers: int):
+    """Hit the live endpoint concurrently (spends `total` requests of the key's hourly budget)."""
+    with FeesClient(base_url, api_key, pool_maxsize=max(workers, 1)) as client:
+        def fetch(_) -> float:
+            started = time.perf_counter()
+            handle_response(client.get('/categories'))
+            return (time.perf_counter() - started) * 1000
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            samples = sorted(pool.map(fetch, range(total)))
+
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"\nLive GET /categories: {total} requests, {workers} workers")
+    print(f"  p50 {statistics.median(samples):.0f}ms  p95 {p95:.0f}ms  max {samples[-1]:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test GET /categories query plans')
+    parser.add_argument('--categories', type=int, nargs='+', default=[6, 50, 200, 1000],
+                        help='Category counts to test (default: 6 50 200 1000)')
+    parser.add_argument('--fees', type=int, nargs='+', default=[5000, 100000],
+                        help='Fee counts in the local catalog (default: 5000 100000)')
+    parser.add_argument('--round-trip-ms', type=float, default=0.5,
+                        help='Cost charged per query for the database round trip (default: 0.5)')
+    parser.add_argument('--iterations', type=int, default=20, help='Runs per plan (default: 20)')
+    parser.add_argument('--api-key', help='Also load test the live endpoint with this key')
+    parser.add_argument('--base-url', default=BASE_URL, help='API base URL')
+    parser.add_argument('--requests', type=int, default=20, help='Live requests to send (default: 20)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent live requests (default: 4)')
+    args = parser.parse_args()
+
+    run_local(args.categories, args.fees, args.iterations, args.round_trip_ms)
+    if args.api_key:
+        run_live(args.base_url, args.api_key, args.requests, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Nigerian Government Fees API - Connection Pooling Benchmark
+
+Compares requests per second for one-off `requests.get` calls (a new
+connection per call) against the pooled, keep-alive FeesClient session.
+Runs against a local stand-in HTTP server so no API quota is spent.
+
+Run: python bench_connection_pooling.py [--requests 500] [--workers 1]
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from fees_client import FeesClient
+
+# Canned /fees payload shaped like the real response
+SAMPLE_RESPONSE = json.dumps({
+    'items': [
+        {
+            'id': 1,
+            'name': 'NIN Enrolment (First Time)',
+            'amount': 0,
+            'currency': 'NGN',
+            'service_type': 'Standard',
+            'category_name': 'Identity & Management',
+            'agency_name': 'National Identity Management Commission',
+            'subcategory_name': 'NIN',
+            'source_name': 'NIMC'
+        }
+    ],
+    'meta': {'total': 1, 'limit': 20, 'offset': 0, 'page': 1}
+}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive capable handler that always returns SAMPLE_RESPONSE"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40ms to every response on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(SAMPLE_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(SAMPLE_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    """Start the stand-in server on a free local port in a background thread"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(label: str, fetch, total: int, workers: int) -> float:
+    """Issue `total` calls to `fetch` across `workers` threads and report req/s"""
+    started = time.perf_counter()
+    if workers <= 1:
+        for _ in range(total):
+            fetch()
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda _: fetch(), range(total)))
+    elapsed = time.perf_counter() - started
+
+    rate = total / elapsed
+    print(f"{label:<28} {total:>6} requests in {elapsed:6.2f}s  ->  {rate:8.1f} req/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pooled vs unpooled HTTP requests')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per run (default: 500)')
+    parser.add_argument('--workers', type=int, default=1, help='Concurrent worker threads (default: 1)')
+    args = parser.parse_args()
+
+    server = start_server()
+    base_url = f'http://127.0.0.1:{server.server_port}/api:public'
+    print(f"Stand-in server: {base_url}")
+    print(f"Workers: {args.workers}\n")
+
+    def unpooled():
+        requests.get(f'{base_url}/fees', params={'api_key': 'nga_bench'}).json()
+
+    with FeesClient(base_url, 'nga_bench', pool_maxsize=max(args.workers, 1)) as client:
+        def pooled():
+            client.get('/fees').json()
+
+        baseline = run('Without pooling (requests.get)', unpooled, args.requests, args.workers)
+        improved = run('With pooling (FeesClient)', pooled, args.requests, args.workers)
+
+    server.shutdown()
+    print(f"\nSpeed-up: {improved / baseline:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Nigerian Government Fees API - GET /fees/{id} Query Plan Comparison
+
+Compares the two ways apis/public/fees_by_id.xs has built its nested
+response:
+
+- sequential: db.get the fee, then its subcategory, category, source and
+  agency one after another (up to 5 queries)
+- joined: one query with the fee's four relationships left-joined, nested
+  in the stack afterwards
+
+Both plans run against an in-memory SQLite copy of the five tables. Before
+timing, every fee is fetched both ways and the responses must be identical,
+including fees with no subcategory or source, references to rows that do
+not exist, and a subcategory or source without a parent. In-process SQLite
+has no per-query round trip, so each statement is also charged
+--round-trip-ms, as in bench_categories.py.
+
+Run: python bench_fee_by_id.py [--fees 2000] [--round-trip-ms 0.5] [--iterations 200]
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+from typing import Dict, Any, Optional, Tuple
+
+SCHEMA = '''
+CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT, slug TEXT, description TEXT,
+    created_at INTEGER, updated_at INTEGER);
+CREATE TABLE subcategories (id INTEGER PRIMARY KEY, category_id INTEGER, name TEXT, slug TEXT,
+    description TEXT, created_at INTEGER, updated_at INTEGER);
+CREATE TABLE agencies (id INTEGER PRIMARY KEY, name TEXT, slug TEXT, website TEXT, notes TEXT,
+    created_at INTEGER, updated_at INTEGER);
+CREATE TABLE sources (id INTEGER PRIMARY KEY, agency_id INTEGER, name TEXT, url TEXT, document_ref TEXT,
+    notes TEXT, created_at INTEGER, updated_at INTEGER);
+CREATE TABLE fees (id INTEGER PRIMARY KEY, subcategory_id INTEGER, source_id INTEGER, name TEXT,
+    amount REAL, currency TEXT, service_type TEXT, payment_code TEXT, description TEXT, meta TEXT,
+    created_at INTEGER, updated_at INTEGER);
+'''
+
+FEE_COLUMNS = ['id', 'subcategory_id', 'source_id', 'name', 'amount', 'currency', 'service_type',
+               'payment_code', 'description', 'meta', 'created_at', 'updated_at']
+SUBCATEGORY_COLUMNS = ['id', 'category_id', 'name', 'slug', 'description', 'created_at', 'updated_at']
+CATEGORY_COLUMNS = ['id', 'name', 'slug', 'description', 'created_at', 'updated_at']
+SOURCE_COLUMNS = ['id', 'agency_id', 'name', 'url', 'document_ref', 'notes', 'created_at', 'updated_at']
+AGENCY_COLUMNS = ['id', 'name', 'slug', 'website', 'notes', 'created_at', 'updated_at']
+
+JOINED_QUERY = 'SELECT {columns} FROM fees ' \
+    'LEFT JOIN subcategories AS subcategory ON fees.subcategory_id = subcategory.id ' \
+    'LEFT JOIN categories AS category ON subcategory.category_id = category.id ' \
+    'LEFT JOIN sources AS source ON fees.source_id = source.id ' \
+    'LEFT JOIN agencies AS agency ON source.agency_id = agency.id ' \
+    'WHERE fees.id = ?'.format(columns=', '.join(
+        [f'fees.{column}' for column in FEE_COLUMNS]
+        + [f'subcategory.{column}' for column in SUBCATEGORY_COLUMNS]
+        + [f'category.{column}' for column in CATEGORY_COLUMNS]
+        + [f'source.{column}' for column in SOURCE_COLUMNS]
+        + [f'agency.{column}' for column in AGENCY_COLUMNS]
+    ))
+
+# Fees whose relationships are incomplete, appended after the regular catalog:
+# (subcategory_id, source_id) with 9999 pointing at a row that does not exist.
+# Subcategory 1 has no category and source 1 has no agency (see build_catalog)
+EDGE_CASES = [(None, None), (None, 2), (2, None), (9999, 2), (2, 9999), (1, 1), (9999, 9999)]
+
+
+def build_catalog(fees: int, seed: int = 42) -> sqlite3.Connection:
+    """Create an in-memory catalog, plus one fee for every EDGE_CASES entry."""
+    rng = random.Random(seed)
+    db = sqlite3.connect(':memory:')
+    db.executescript(SCHEMA)
+    db.executemany('INSERT INTO categories VALUES (?, ?, ?, ?, ?, ?)',
+                   [(i, f'Category {i}', f'category-{i}', None, 1765659098109, 1765659098109) for i in range(1, 7)])
+    db.executemany('INSERT INTO subcategories VALUES (?, ?, ?, ?, ?, ?, ?)',
+                   [(i, None if i == 1 else rng.randint(1, 6), f'Subcategory {i}', f'subcategory-{i}', None,
+                     1765659098109, 1765659098109) for i in range(1, 41)])
+    db.executemany('INSERT INTO agencies VALUES (?, ?, ?, ?, ?, ?, ?)',
+                   [(i, f'Agency {i}', f'agency-{i}', f'https://agency{i}.gov.ng', None,
+                     1765659098109, 1765659098109) for i in range(1, 11)])
+    db.executemany('INSERT INTO sources VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                   [(i, None if i == 1 else rng.randint(1, 10), f'Source {i}', None, f'DOC-{i}', None,
+                     1765659098109, 1765659098109) for i in range(1, 21)])
+
+    links = [(rng.randint(2, 40), rng.randint(2, 20)) for _ in range(fees)] + EDGE_CASES
+    db.executemany(
+        'INSERT INTO fees VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        [(fee_id, subcategory_id, source_id, f'Fee {fee_id}', rng.randint(0, 200) * 500, 'NGN', 'Standard',
+          None, 'Synthetic fee', '{}', 1765659098109, 1765659098109)
+         for fee_id, (subcategory_id, source_id) in enumerate(links, 1)]
+    )
+    db.commit()
+    return db
+
+
+def get_row(db: sqlite3.Connection, table: str, columns, row_id: int) -> Optional[Dict[str, Any]]:
+    row = db.execute(f"SELECT {', '.join(columns)} FROM {table} WHERE id = ?", (row_id,)).fetchone()
+    return dict(zip(columns, row)) if row else None
+
+
+def sequential_lookup(db: sqlite3.Connection, fee_id: int) -> Optional[Dict[str, Any]]:
+    """The previous plan: one db.get per record, nested as it goes."""
+    fee = get_row(db, 'fees', FEE_COLUMNS, fee_id)
+    if fee is None:
+        return None
+
+    if fee['subcategory_id'] is not None:
+        subcategory = get_row(db, 'subcategories', SUBCATEGORY_COLUMNS, fee['subcategory_id'])
+        if subcategory is not None and subcategory['category_id'] is not None:
+            subcategory['category'] = get_row(db, 'categories', CATEGORY_COLUMNS, subcategory['category_id'])
+        fee['subcategory'] = subcategory
+
+    if fee['source_id'] is not None:
+        source = get_row(db, 'sources', SOURCE_COLUMNS, fee['source_id'])
+        if source is not None and source['agency_id'] is not None:
+            source['agency'] = get_row(db, 'agencies', AGENCY_COLUMNS, source['agency_id'])
+        fee['source'] = source
+
+    return fee
+
+
+def joined_lookup(db: sqlite3.Connection, fee_id: int) -> Optional[Dict[str, Any]]:
+    """The current plan: one left-joined query, nested with the same rules."""
+    row = db.execute(JOINED_QUERY, (fee_id,)).fetchone()
+    if row is None:
+        return None
+
+    records = []
+    offset = 0
+    for columns in (FEE_COLUMNS, SUBCATEGORY_COLUMNS, CATEGORY_COLUMNS, SOURCE_COLUMNS, AGENCY_COLUMNS):
+        values = row[offset:offset + len(columns)]
+        records.append(dict(zip(columns, values)) if values[0] is not None else None)
+        offset += len(columns)
+    fee, subcategory, category, source, agency = records
+
+    if fee['subcategory_id'] is not None:
+        if subcategory is not None and subcategory['category_id'] is not None:
+            subcategory['category'] = category
+        fee['subcategory'] = subcategory
+
+    if fee['source_id'] is not None:
+        if source is not None and source['agency_id'] is not None:
+            source['agency'] = agency
+        fee['source'] = source
+
+    return fee
+
+
+def check_shapes(db: sqlite3.Connection) -> int:
+    """Fetch every fee (and one missing id) both ways; return the number compared."""
+    fee_ids = [fee_id for fee_id, in db.execute('SELECT id FROM fees')] + [10 ** 9]
+    for fee_id in fee_ids:
+        before = sequential_lookup(db, fee_id)
+        after = joined_lookup(db, fee_id)
+        if before != after:
+            raise SystemExit(f'Fee {fee_id}: responses differ\n  sequential: {before}\n  joined:     {after}')
+    return len(fee_ids)
+
+
+def time_plan(plan, db: sqlite3.Connection, fee_ids, round_trip_ms: float) -> Tuple[float, float]:
+    """Median milliseconds per lookup (plus round trips) and mean statements per lookup."""
+    statements = []
+    db.set_trace_callback(statements.append)
+    samples, counts = [], []
+    for fee_id in fee_ids:
+        statements.clear()
+        started = time.perf_counter()
+        plan(db, fee_id)
+        samples.append((time.perf_counter() - started) * 1000 + len(statements) * round_trip_ms)
+        counts.append(len(statements))
+    db.set_trace_callback(None)
+    return statistics.median(samples), statistics.mean(counts)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sequential vs joined GET /fees/{id} query plans')
+    parser.add_argument('--fees', type=int, default=2000, help='Fees in the local catalog (default: 2000)')
+    parser.add_argument('--round-trip-ms', type=float, default=0.5,
+                        help='Cost charged per query for the database round trip (default: 0.5)')
+    parser.add_argument('--iterations', type=int, default=200, help='Lookups timed per plan (default: 200)')
+    args = parser.parse_args()
+
+    db = build_catalog(args.fees)
+    compared = check_shapes(db)
+    print(f"Responses identical for all {compared} lookups (including {len(EDGE_CASES)} edge cases and a missing id)\n")
+
+    rng = random.Random(7)
+    fee_ids = [rng.randint(1, args.fees + len(EDGE_CASES)) for _ in range(args.iterations)]
+    print(f"Median per lookup, {args.round_trip_ms}ms per query round trip, {args.iterations} lookups\n")
+    print(f"{'plan':<12}  {'latency':>9}  {'queries':>7}")
+    results = {}
+    for name, plan in (('sequential', sequential_lookup), ('joined', joined_lookup)):
+        latency, queries = time_plan(plan, db, fee_ids, args.round_trip_ms)
+        results[name] = latency
+        print(f"{name:<12}  {latency:>7.3f}ms  {queries:>7.1f}")
+    print(f"\nSpeed-up: {results['sequential'] / results['joined']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Nigerian Government Fees API - fees Index Benchmark
+
+Runs the queries behind GET /fees and GET /fees/changes against two copies of
+the same catalog in SQLite:
+
+- before: the single-column fees indexes (subcategory_id, source_id, name,
+  updated_at), with the category filter compared on the joined category row
+  and the state filter as a case-insensitive meta.state comparison
+- after: the indexes in tables/fees.xs ((subcategory_id, name),
+  (updated_at, id) and meta), with the category resolved to subcategory ids
+  first, the state matched on the lowercased meta.state_key stored with it,
+  as apis/public/fees.xs does, and the /fees/changes cursor written so the
+  index can seek to it
+
+SQLite has no GIN index, so the meta index is stood in for by an index on
+json_extract(meta, '$.state_key'); both serve an exact match on the key and
+neither serves a case-insensitive comparison. The state queried is "fct"
+against a stored "FCT", so a version that only matched some casings would
+fail the check that both versions return the same rows. For every query the EXPLAIN
+QUERY PLAN of both versions is printed, with full table scans and temporary
+sorts flagged, followed by the median latency.
+
+The sort by category name then fee name spans several subcategories, so no
+fees index removes the final sort; the gains come from reading only the
+matching fees. For category + state together SQLite's planner picks the
+subcategory index and checks the state row by row, which can be slower than
+before; Postgres can combine the btree and GIN indexes with a bitmap AND.
+
+Run: python bench_indexes.py [--fees 200000] [--categories 12] [--runs 5]
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import time
+from typing import List, Tuple
+
+TABLES = '''
+CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT, slug TEXT);
+CREATE TABLE subcategories (id INTEGER PRIMARY KEY, category_id INTEGER, name TEXT);
+CREATE TABLE fees (id INTEGER PRIMARY KEY, subcategory_id INTEGER, source_id INTEGER, name TEXT, meta TEXT,
+    updated_at INTEGER);
+CREATE UNIQUE INDEX categories_name ON categories (name);
+CREATE UNIQUE INDEX categories_slug ON categories (slug);
+CREATE INDEX subcategories_category_id ON subcategories (category_id);
+CREATE INDEX fees_source_id ON fees (source_id);
+CREATE INDEX fees_name ON fees (name);
+'''
+
+BEFORE_INDEXES = '''
+CREATE INDEX fees_subcategory_id ON fees (subcategory_id);
+CREATE INDEX fees_updated_at ON fees (updated_at);
+'''
+
+AFTER_INDEXES = '''
+CREATE INDEX fees_subcategory_id_name ON fees (subcategory_id, name);
+CREATE INDEX fees_updated_at_id ON fees (updated_at, id);
+CREATE INDEX fees_meta_state_key ON fees (json_extract(meta, '$.state_key'));
+'''
+
+STATES = ['Lagos', 'FCT', 'Abuja', 'Kano', 'Rivers', 'Oyo', 'Kaduna', 'Enugu', 'Delta', 'Ogun', 'Anambra',
+          'Borno', 'Plateau', 'Edo', 'Kwara', 'Osun', 'Ondo', 'Benue', 'Imo', 'Akwa Ibom', 'Cross River']
+
+PAGE = 'SELECT fees.id, categories.name, fees.name FROM fees ' \
+    'JOIN subcategories ON fees.subcategory_id = subcategories.id ' \
+    'JOIN categories ON subcategories.category_id = categories.id '
+ORDER = ' ORDER BY categories.name, fees.name, fees.id LIMIT 100'
+CHANGES_BEFORE = 'SELECT id, updated_at FROM fees WHERE updated_at > ? OR (updated_at = ? AND id > ?) ' \
+    'ORDER BY updated_at, id LIMIT 100'
+# apis/public/fees_changes.xs: the leading >= lets the index seek to the cursor
+CHANGES_AFTER = 'SELECT id, updated_at FROM fees WHERE updated_at >= ? AND (updated_at > ? OR id > ?) ' \
+    'ORDER BY updated_at, id LIMIT 100'
+
+
+def build_catalog(fees: int, categories: int, after: bool, seed: int = 42) -> sqlite3.Connection:
+    """An in-memory catalog with four subcategories per category; 20% of fees carry meta.state (and state_key)."""
+    rng = random.Random(seed)
+    db = sqlite3.connect(':memory:')
+    db.executescript(TABLES)
+    db.executemany('INSERT INTO categories VALUES (?, ?, ?)',
+                   [(i, f'Category {i:03d}', f'category-{i}') for i in range(1, categories + 1)])
+    subcategories = categories * 4
+    db.executemany('INSERT INTO subcategories VALUES (?, ?, ?)',
+                   [(i, (i - 1) // 4 + 1, f'Subcategory {i}') for i in range(1, subcategories + 1)])
+    db.executemany('INSERT INTO fees VALUES (?, ?, ?, ?, ?, ?)', [
+        (i, rng.randint(1, subcategories), rng.randint(1, 20), f'Fee {rng.randrange(fees):07d}',
+         json.dumps(state_meta(rng.choice(STATES)) if rng.random() < 0.2 else {}),
+         1735689600000 + rng.randrange(30 * 86400) * 1000)
+        for i in range(1, fees + 1)
+    ])
+    db.executescript(AFTER_INDEXES if after else BEFORE_INDEXES)
+    db.execute('ANALYZE')
+    db.commit()
+    return db
+
+
+def state_meta(state: str) -> dict:
+    """meta as functions/fee_import_key.xs stores it, with the lowercased state_key."""
+    return {'state': state, 'state_key': state.lower()}
+
+
+def page_query(clauses: List[Tuple[str, tuple]]) -> Tuple[str, tuple]:
+    """The /fees page query with the given (where clause, params) filters ANDed together."""
+    where = ' AND '.join(clause for clause, _ in clauses)
+    params = tuple(value for _, clause_params in clauses for value in clause_params)
+    return PAGE + (f'WHERE {where}' if where else '') + ORDER, params
+
+
+def queries(db: sqlite3.Connection, after: bool) -> List[Tuple[str, str, tuple]]:
+    """(label, sql, params) for each /fees shape, written the way each version queries."""
+    if after:
+        # The category is resolved to subcategory ids first (one small query)
+        subcategory_ids = tuple(row[0] for row in db.execute(
+            'SELECT subcategories.id FROM subcategories JOIN categories ON subcategories.category_id = categories.id '
+            'WHERE categories.slug = ? COLLATE NOCASE OR categories.name = ? COLLATE NOCASE',
+            ('category-3', 'category-3')
+        ))
+        category = (f"fees.subcategory_id IN ({', '.join('?' * len(subcategory_ids))})", subcategory_ids)
+        state = ("json_extract(fees.meta, '$.state_key') = ?", ('fct',))
+    else:
+        category = ('(categories.slug = ? COLLATE NOCASE OR categories.name = ? COLLATE NOCASE)',
+                    ('category-3', 'category-3'))
+        state = ("lower(json_extract(fees.meta, '$.state')) = lower(?)", ('fct',))
+
+    # /fees/changes resumes from a point 90% of the way through the history
+    since = db.execute('SELECT updated_at FROM fees ORDER BY updated_at LIMIT 1 OFFSET ?',
+                       (db.execute('SELECT COUNT(*) FROM fees').fetchone()[0] * 9 // 10,)).fetchone()[0]
+    return [
+        ('/fees (first page)', *page_query([])),
+        ('/fees?category=...', *page_query([category])),
+        ('/fees?state=fct', *page_query([state])),
+        ('/fees?category=...&state=fct', *page_query([category, state])),
+        ('/fees/changes?since=...', CHANGES_AFTER if after else CHANGES_BEFORE, (since, since, 0))
+    ]
+
+
+def plan(db: sqlite3.Connection, sql: str, params: tuple) -> List[str]:
+    return [row[3] for row in db.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+
+
+def flags(steps: List[str]) -> str:
+    """Short verdict: full scans of fees and temporary sorts are what the indexes remove."""
+    marks = []
+    if any(step.startswith('SCAN fees') for step in steps):
+        marks.append('scans fees')
+    if any('TEMP B-TREE' in step for step in steps):
+        marks.append('sorts')
+    return ', '.join(marks) or 'index only'
+
+
+def median_ms(db: sqlite3.Connection, sql: str, params: tuple, runs: int) -> Tuple[float, list]:
+    samples, rows = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        rows = db.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Explain and time /fees queries before and after the fees indexes')
+    parser.add_argument('--fees', type=int, default=200000, help='Fees in the catalog (default: 200000)')
+    parser.add_argument('--categories', type=int, default=12, help='Categories (default: 12)')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per query (default: 5)')
+    args = parser.parse_args()
+
+    before_db = build_catalog(args.fees, args.categories, after=False)
+    after_db = build_catalog(args.fees, args.categories, after=True)
+    before_queries = queries(before_db, after=False)
+    after_queries = queries(after_db, after=True)
+
+    results = []
+    for (label, before_sql, before_params), (_, after_sql, after_params) in zip(before_queries, after_queries):
+        before_ms, before_rows = median_ms(before_db, before_sql, before_params, args.runs)
+        after_ms, after_rows = median_ms(after_db, after_sql, after_params, args.runs)
+        if before_rows != after_rows:
+            raise SystemExit(f'{label}: before and after return different rows')
+        before_plan = plan(before_db, before_sql, before_params)
+        after_plan = plan(after_db, after_sql, after_params)
+        results.append((label, before_ms, after_ms, before_plan, after_plan))
+
+        print(label)
+        print(f'  before ({flags(before_plan)}):')
+        for step in before_plan:
+            print(f'    {step}')
+        print(f'  after ({flags(after_plan)}):')
+        for step in after_plan:
+            print(f'    {step}')
+        print()
+
+    print(f"{args.fees} fees, median of {args.runs} runs\n")
+    print(f"{'query':<34}  {'before':>9}  {'after':>9}  {'speed-up':>8}")
+    for label, before_ms, after_ms, _, _ in results:
+        print(f"{label:<34}  {before_ms:>7.2f}ms  {after_ms:>7.2f}ms  {before_ms / after_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+"""
+Nigerian Government Fees API - Endpoint Latency Benchmark
+
+Runs a weighted mix of requests against /fees, /fees/{id}, /fees/search,
+/categories and /metadata at one or more concurrency levels, through the
+pooled session of xano_hcktn_endpoint_test.py, and reports per endpoint:
+p50/p90/p99/max latency, throughput and error rate. Requests are generated
+from a seed, so two runs with the same options send the same requests.
+
+Results are written to a JSON file (see RESULTS_VERSION for its layout).
+--baseline compares the new run with an earlier file, and --compare
+compares two existing files; an endpoint whose p50, p90 or p99 grew by more
+than --threshold percent, or whose error rate rose, is flagged as a
+regression and the script exits with status 1.
+
+Against the live API every key is limited to 100 requests per hour, so
+keep --requests x levels under that or expect 403s to count as errors.
+--standin benchmarks the local stand-in server (fees_standin.py) instead,
+with its rate limit off and the --latency-ms/--jitter-ms profile.
+
+Run:
+    python bench_latency.py --standin [--latency-ms 80 --jitter-ms 20] [--concurrency 1 4 16] [--requests 400]
+    python bench_latency.py --api-key nga_your_api_key_here --concurrency 1 --requests 90 [--mix search]
+    python bench_latency.py --standin --baseline latency_results.json --out latency_new.json
+    python bench_latency.py --compare latency_results.json latency_new.json [--threshold 10]
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, NamedTuple, Tuple
+
+import xano_hcktn_endpoint_test as suite
+from fees_client import HOURLY_REQUEST_BUDGET
+
+# Layout of the results file; bump when it changes incompatibly
+RESULTS_VERSION = 1
+
+ENDPOINTS = ['fees', 'fees/{id}', 'fees/search', 'categories', 'metadata']
+
+# Request mixes as endpoint -> weight
+MIXES = {
+    'browse': {'fees': 40, 'fees/{id}': 25, 'fees/search': 15, 'categories': 10, 'metadata': 10},
+    'search': {'fees/search': 70, 'fees': 20, 'fees/{id}': 10},
+    'lookup': {'fees/{id}': 80, 'fees': 20},
+    'uniform': {endpoint: 1 for endpoint in ENDPOINTS}
+}
+
+CATEGORIES = ['identity', 'immigration', 'education', 'electricity', 'business', 'transport']
+SEARCH_TERMS = ['NIN', 'passport', 'JAMB', 'NECO', 'modification', 'registration', 'visa', 'tariff', 'pasport']
+
+# Latency percentiles reported (and compared) per endpoint
+PERCENTILES = [50, 90, 99]
+
+
+class Sample(NamedTuple):
+    endpoint: str
+    latency_ms: float
+    ok: bool
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """A named mix from MIXES, or custom weights like "fees=3,fees/search=1"."""
+    if spec in MIXES:
+        return MIXES[spec]
+    mix = {}
+    for part in spec.split(','):
+        endpoint, _, weight = part.partition('=')
+        endpoint = endpoint.strip().strip('/')
+        if endpoint not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint '{endpoint}' in --mix. Use one of: {', '.join(ENDPOINTS)}")
+        mix[endpoint] = float(weight or 1)
+    return mix
+
+
+def build_requests(mix: Dict[str, float], count: int, max_fee_id: int, seed: int) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(endpoint, path, params) for `count` requests drawn from the mix."""
+    rng = random.Random(seed)
+    endpoints = list(mix)
+    weights = [mix[endpoint] for endpoint in endpoints]
+    planned = []
+    for endpoint in rng.choices(endpoints, weights, k=count):
+        if endpoint == 'fees':
+            params = {'page': rng.randint(1, 4), 'per_page': rng.choice([10, 20, 50])}
+            if rng.random() < 0.5:
+                params['category'] = rng.choice(CATEGORIES)
+            planned.append((endpoint, '/fees', params))
+        elif endpoint == 'fees/{id}':
+            planned.append((endpoint, f'/fees/{rng.randint(1, max_fee_id)}', {}))
+        elif endpoint == 'fees/search':
+            params = {'q': rng.choice(SEARCH_TERMS)}
+            if rng.random() < 0.25:
+                params['mode'] = 'fuzzy'
+            planned.append((endpoint, '/fees/search', params))
+        else:
+            planned.append((endpoint, f'/{endpoint}', {}))
+    return planned
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def timed_request(base_url: str, api_key: str, planned: Tuple[str, str, Dict[str, Any]]) -> Sample:
+    endpoint, path, params = planned
+    started = time.perf_counter()
+    try:
+        response = suite.session.get(f'{base_url}{path}', params={**params, 'api_key': api_key})
+        # A missing fee is a valid answer for /fees/{id}
+        ok = response.status_code < 400 or (endpoint == 'fees/{id}' and response.status_code == 404)
+    except Exception:
+        ok = False
+    return Sample(endpoint, (time.perf_counter() - started) * 1000, ok)
+
+
+def summarize(samples: List[Sample], wall_seconds: float) -> Dict[str, Dict[str, Any]]:
+    """Per-endpoint statistics (plus 'all') for one concurrency level."""
+    groups: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        groups.setdefault(sample.endpoint, []).append(sample)
+    groups['all'] = samples
+
+    stats = {}
+    for endpoint, group in groups.items():
+        latencies = sorted(sample.latency_ms for sample in group)
+        errors = sum(not sample.ok for sample in group)
+        stats[endpoint] = {
+            'requests': len(group),
+            'errors': errors,
+            'error_rate': errors / len(group),
+            'throughput_rps': len(group) / wall_seconds,
+            **{f'p{p}_ms': round(percentile(latencies, p), 3) for p in PERCENTILES},
+            'max_ms': round(latencies[-1], 3)
+        }
+    return stats
+
+
+def run_level(base_url: str, api_key: str, planned, concurrency: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(lambda request: timed_request(base_url, api_key, request), planned))
+    wall_seconds = time.perf_counter() - started
+    return {'concurrency': concurrency, 'wall_seconds': round(wall_seconds, 3),
+            'endpoints': summarize(samples, wall_seconds)}
+
+
+def print_level(level: Dict[str, Any]):
+    print(f"\nConcurrency {level['concurrency']} ({level['wall_seconds']:.2f}s)")
+    print(f"{'endpoint':<13} {'requests':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} {'req/s':>8} {'errors':>7}")
+    for endpoint, stats in level['endpoints'].items():
+        print(f"{endpoint:<13} {stats['requests']:>8} {stats['p50_ms']:>7.1f}ms {stats['p90_ms']:>7.1f}ms "
+              f"{stats['p99_ms']:>7.1f}ms {stats['max_ms']:>7.1f}ms {stats['throughput_rps']:>8.1f} "
+              f"{stats['error_rate']:>7.1%}")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        results = json.load(f)
+    if results.get('version') != RESULTS_VERSION:
+        raise SystemExit(f"{path}: results version {results.get('version')} (expected {RESULTS_VERSION})")
+    return results
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare two results files level by level and endpoint by endpoint.
+
+    Returns:
+        list: One line per regression (a percentile more than `threshold`
+              percent slower, or a higher error rate)
+    """
+    regressions = []
+    baseline_levels = {level['concurrency']: level for level in baseline['levels']}
+    print(f"{'concurrency':>11}  {'endpoint':<13} " + ' '.join(f"{f'p{p}':>18}" for p in PERCENTILES) + '  errors')
+    for level in current['levels']:
+        before_level = baseline_levels.get(level['concurrency'])
+        if before_level is None:
+            continue
+        for endpoint, after in level['endpoints'].items():
+            before = before_level['endpoints'].get(endpoint)
+            if before is None:
+                continue
+            cells, flagged = [], []
+            for p in PERCENTILES:
+                old, new = before[f'p{p}_ms'], after[f'p{p}_ms']
+                change = (new - old) / old * 100 if old else 0.0
+                cells.append(f"{new:>8.1f}ms {change:>+6.1f}%")
+                if change > threshold:
+                    flagged.append(f'p{p} {old:.1f}ms -> {new:.1f}ms ({change:+.1f}%)')
+            if after['error_rate'] > before['error_rate']:
+                flagged.append(f"error rate {before['error_rate']:.1%} -> {after['error_rate']:.1%}")
+            marker = '  REGRESSION' if flagged else ''
+            print(f"{level['concurrency']:>11}  {endpoint:<13} {' '.join(cells)}  {after['error_rate']:>6.1%}{marker}")
+            regressions.extend(f"concurrency {level['concurrency']} {endpoint}: {flag}" for flag in flagged)
+    return regressions
+
+
+def report_comparison(baseline_path: str, current: Dict[str, Any], threshold: float) -> bool:
+    """Print the comparison against a baseline file; returns True if nothing regressed."""
+    baseline = load_results(baseline_path)
+    print(f"\nCompared with {baseline_path} ({baseline['created_at']}, {baseline['target']}), "
+          f"threshold {threshold:g}%\n")
+    regressions = compare(baseline, current, threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return False
+    print("\nNo regressions")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-endpoint latency percentiles, throughput and error rates')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--base-url', default=suite.BASE_URL, help='API base URL (default: the live API)')
+    target.add_argument('--standin', action='store_true', help='Benchmark a local stand-in server (fees_standin.py)')
+    parser.add_argument('--api-key', help='API key (default: generate one)')
+    parser.add_argument('--mix', default='browse',
+                        help=f"Request mix: {', '.join(MIXES)} or weights like fees=3,fees/search=1 (default: browse)")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16],
+                        help='Concurrency levels to run (default: 1 4 16)')
+    parser.add_argument('--requests', type=int, default=400, help='Requests per concurrency level (default: 400)')
+    parser.add_argument('--max-fee-id', type=int, default=80, help='Highest fee id requested (default: 80)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for the request sequence (default: 42)')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Stand-in only: response delay (default: 50)')
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help='Stand-in only: delay jitter (default: 10)')
+    parser.add_argument('--out', default='latency_results.json', help='Results file (default: latency_results.json)')
+    parser.add_argument('--baseline', help='Earlier results file to compare this run with')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='Compare two results files and exit')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent slowdown of a percentile flagged as a regression (default: 10)')
+    args = parser.parse_args()
+
+    if args.compare:
+        ok = report_comparison(args.compare[0], load_results(args.compare[1]), args.threshold)
+        sys.exit(0 if ok else 1)
+
+    mix = parse_mix(args.mix)
+    base_url = args.base_url
+    server = None
+    if args.standin:
+        from fees_standin import FeesStandIn, LatencyProfile, start_server
+        server = start_server(FeesStandIn(rate_limit=None, latency=LatencyProfile(args.latency_ms, args.jitter_ms,
+                                                                                   seed=args.seed)))
+        base_url = server.base_url
+
+    suite.configure_session(max(args.concurrency))
+    api_key = args.api_key
+    if api_key is None:
+        response = suite.session.post(f'{base_url}/api_key/generate', json={}, headers={'Accept': 'application/json'})
+        response.raise_for_status()
+        api_key = response.json()['api_key']
+
+    total = args.requests * len(args.concurrency)
+    if not args.standin and total > HOURLY_REQUEST_BUDGET:
+        print(f"Warning: {total} requests on one key exceeds the {HOURLY_REQUEST_BUDGET} requests/hour limit; "
+              f"the rest will fail with 403")
+
+    target = f'stand-in ({args.latency_ms:g}ms +/- {args.jitter_ms:g}ms)' if args.standin else base_url
+    print(f"Target: {target}")
+    print(f"Mix: {', '.join(f'{endpoint}={weight:g}' for endpoint, weight in mix.items())}, "
+          f"{args.requests} requests per level, seed {args.seed}")
+
+    planned = build_requests(mix, args.requests, args.max_fee_id, args.seed)
+    levels = []
+    for concurrency in args.concurrency:
+        level = run_level(base_url, api_key, planned, concurrency)
+        print_level(level)
+        levels.append(level)
+
+    results = {
+        'version': RESULTS_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'target': target,
+        'mix': mix,
+        'requests_per_level': args.requests,
+        'seed': args.seed,
+        'levels': levels
+    }
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {args.out}")
+
+    if server is not None:
+        server.shutdown()
+    if args.baseline and not report_comparison(args.baseline, results, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
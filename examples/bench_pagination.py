@@ -0,0 +1,142 @@
+"""
+Nigerian Government Fees API - /fees Pagination Benchmark
+
+Compares the two ways GET /fees can page through the catalog:
+
+- offset: page/per_page with totals, i.e. ORDER BY ... LIMIT ... OFFSET plus
+  a COUNT of every matching row on each page
+- cursor: keyset pagination on (category name, fee name, id) via
+  meta.next_cursor with include_total=false
+
+Both run the joined, sorted /fees query against an in-memory SQLite copy of
+the categories, subcategories and fees tables. The offset plan has to
+produce and throw away every row before the page, so deep pages get slower
+in proportion to their depth; the cursor plan seeks straight past the last
+row seen and costs the same on the first page and the last (its cost is
+bounded by the size of the category the cursor is in, not by depth).
+
+Run: python bench_pagination.py [--fees 200000] [--categories 12] [--per-page 100] [--samples 8]
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+from typing import List, Optional, Tuple
+
+SCHEMA = '''
+CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE subcategories (id INTEGER PRIMARY KEY, category_id INTEGER);
+CREATE TABLE fees (id INTEGER PRIMARY KEY, subcategory_id INTEGER, name TEXT);
+CREATE INDEX categories_name ON categories (name);
+CREATE INDEX subcategories_category_id ON subcategories (category_id);
+CREATE INDEX fees_subcategory_id ON fees (subcategory_id);
+CREATE INDEX fees_name ON fees (name);
+'''
+
+SELECT = (
+    'SELECT fees.id, categories.name, fees.name FROM fees '
+    'JOIN subcategories ON fees.subcategory_id = subcategories.id '
+    'JOIN categories ON subcategories.category_id = categories.id '
+)
+ORDER = 'ORDER BY categories.name, fees.name, fees.id LIMIT ?'
+
+OFFSET_PAGE = SELECT + ORDER + ' OFFSET ?'
+OFFSET_TOTAL = (
+    'SELECT COUNT(*) FROM fees '
+    'JOIN subcategories ON fees.subcategory_id = subcategories.id '
+    'JOIN categories ON subcategories.category_id = categories.id'
+)
+# Same predicate as apis/public/fees.xs: the leading >= lets the category
+# index seek to the cursor, the OR resolves ties inside that category
+CURSOR_PAGE = SELECT + (
+    'WHERE categories.name >= ? AND (categories.name > ? OR fees.name > ? '
+    'OR (fees.name = ? AND fees.id > ?)) '
+) + ORDER
+
+Cursor = Tuple[int, str, str]
+
+
+def build_catalog(fees: int, categories: int, seed: int = 42) -> sqlite3.Connection:
+    """Create an in-memory catalog with four subcategories per category."""
+    rng = random.Random(seed)
+    db = sqlite3.connect(':memory:')
+    db.executescript(SCHEMA)
+    db.executemany(
+        'INSERT INTO categories (id, name) VALUES (?, ?)',
+        [(i, f'Category {i:04d}') for i in range(1, categories + 1)]
+    )
+    subcategories = categories * 4
+    db.executemany(
+        'INSERT INTO subcategories (id, category_id) VALUES (?, ?)',
+        [(i, (i - 1) // 4 + 1) for i in range(1, subcategories + 1)]
+    )
+    db.executemany(
+        'INSERT INTO fees (id, subcategory_id, name) VALUES (?, ?, ?)',
+        [(i, rng.randint(1, subcategories), f'Fee {rng.randrange(fees):07d}') for i in range(1, fees + 1)]
+    )
+    db.execute('ANALYZE')
+    db.commit()
+    return db
+
+
+def offset_page(db: sqlite3.Connection, page: int, per_page: int) -> List[tuple]:
+    """The previous plan: skip (page - 1) * per_page rows and count the total."""
+    rows = db.execute(OFFSET_PAGE, (per_page, (page - 1) * per_page)).fetchall()
+    db.execute(OFFSET_TOTAL).fetchone()
+    return rows
+
+
+def cursor_page(db: sqlite3.Connection, after: Optional[Cursor], per_page: int) -> List[tuple]:
+    """The keyset plan: rows strictly after `after`, no total."""
+    if after is None:
+        return db.execute(SELECT + ORDER, (per_page,)).fetchall()
+    fee_id, category, name = after
+    return db.execute(CURSOR_PAGE, (category, category, name, name, fee_id, per_page)).fetchall()
+
+
+def median_ms(func, repeat: int = 3) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark offset vs cursor pagination for GET /fees')
+    parser.add_argument('--fees', type=int, default=200000, help='Fees in the catalog (default: 200000)')
+    parser.add_argument('--categories', type=int, default=12, help='Categories (default: 12)')
+    parser.add_argument('--per-page', type=int, default=100, help='Page size (default: 100)')
+    parser.add_argument('--samples', type=int, default=8, help='Pages timed across the catalog (default: 8)')
+    args = parser.parse_args()
+
+    db = build_catalog(args.fees, args.categories)
+    pages = -(-args.fees // args.per_page)
+    sampled = sorted({1 + round(i * (pages - 1) / max(1, args.samples - 1)) for i in range(args.samples)})
+
+    print(f"{args.fees} fees, {args.per_page} per page ({pages} pages), median of 3 runs\n")
+    print(f"{'page':>8}  {'offset+total':>12}  {'cursor':>9}")
+
+    # Time each sampled page both ways; the cursor for page N is the last row
+    # of page N - 1, looked up untimed
+    cursor_samples = []
+    for page in sampled:
+        after = None
+        if page > 1:
+            after = db.execute(SELECT + ORDER + ' OFFSET ?', (1, (page - 1) * args.per_page - 1)).fetchone()
+        if cursor_page(db, after, args.per_page) != offset_page(db, page, args.per_page):
+            raise SystemExit(f'Page {page} differs between plans')
+        offset = median_ms(lambda: offset_page(db, page, args.per_page))
+        keyset = median_ms(lambda: cursor_page(db, after, args.per_page))
+        cursor_samples.append(keyset)
+        print(f"{page:>8}  {offset:>10.2f}ms  {keyset:>7.2f}ms")
+
+    spread = max(cursor_samples) / min(cursor_samples)
+    print(f"\nCursor page cost, slowest vs fastest sampled page: {spread:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Nigerian Government Fees API - /fees Payload Benchmark
+
+Compares a page of GET /fees as the full record (every column, meta JSON,
+both ISO timestamps and all six joined names) with compact=true (id, name,
+amount, currency) and a custom fields= projection.
+
+For each shape it reports the JSON body size, the gzip size a client
+actually downloads, and the time to serialize and parse a page. The
+server-side work saved by compact mode (the source/agency joins and the
+per-row timestamp reformatting) comes on top of these numbers.
+
+Run: python bench_payload.py [--per-page 100] [--pages 200]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+from typing import Dict, List, Any, Optional
+
+# compact=true in apis/public/fees.xs (functions/fee_fields.xs)
+COMPACT_FIELDS = ['id', 'name', 'amount', 'currency']
+
+SHAPES = [
+    ('full', None),
+    ('fields=id,name,amount,currency,category_slug', COMPACT_FIELDS + ['category_slug']),
+    ('compact=true', COMPACT_FIELDS)
+]
+
+
+def full_fee(fee_id: int, rng: random.Random) -> Dict[str, Any]:
+    """One /fees item with every field, shaped like the documented response."""
+    return {
+        'id': fee_id,
+        'subcategory_id': rng.randint(1, 40),
+        'source_id': rng.randint(1, 12),
+        'name': f'Standard Passport {rng.choice([32, 64])} Pages ({rng.choice([5, 10])}-Year Validity)',
+        'amount': rng.randint(0, 200) * 500,
+        'currency': 'NGN',
+        'service_type': rng.choice(['Standard', 'Modification', 'Renewal']),
+        'payment_code': f'NIS-{fee_id:05d}',
+        'description': 'New or renewal application, payable online through the official portal',
+        'meta': {'state': rng.choice(['Lagos', 'Abuja', 'Kano']), 'validity_years': rng.choice([5, 10])},
+        'created_at': '2024-12-15T10:30:00+00:00',
+        'updated_at': '2025-01-08T14:02:11+00:00',
+        'category_name': 'Immigration',
+        'category_slug': 'immigration',
+        'agency_name': 'Nigeria Immigration Service',
+        'agency_slug': 'nis',
+        'subcategory_name': 'Passport',
+        'source_name': 'Nigerian Immigration Service (NIS)'
+    }
+
+
+def project(fee: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Apply a fields= projection the way the endpoint's pick does."""
+    if fields is None:
+        return fee
+    return {field: fee[field] for field in fields if field in fee}
+
+
+def page_body(items: List[Dict[str, Any]], per_page: int) -> Dict[str, Any]:
+    return {'items': items, 'meta': {'total': None, 'limit': per_page, 'offset': 0, 'page': 1}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare /fees payloads for full, fields= and compact responses')
+    parser.add_argument('--per-page', type=int, default=100, help='Fees per page (default: 100)')
+    parser.add_argument('--pages', type=int, default=200, help='Pages serialized per shape (default: 200)')
+    parser.add_argument('--seed', type=int, default=42, help='Data seed (default: 42)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fees = [full_fee(fee_id, rng) for fee_id in range(1, args.per_page + 1)]
+
+    print(f"One page of {args.per_page} fees, median of {args.pages} serialize/parse runs\n")
+    print(f"{'response':<46}  {'bytes':>8}  {'gzip':>7}  {'dumps':>8}  {'loads':>8}")
+    baseline = None
+    for label, fields in SHAPES:
+        body = page_body([project(fee, fields) for fee in fees], args.per_page)
+        encoded = json.dumps(body).encode()
+        compressed = len(gzip.compress(encoded))
+
+        dumps_ms, loads_ms = [], []
+        for _ in range(args.pages):
+            started = time.perf_counter()
+            text = json.dumps(body)
+            dumps_ms.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            json.loads(text)
+            loads_ms.append((time.perf_counter() - started) * 1000)
+
+        if baseline is None:
+            baseline = len(encoded)
+        print(
+            f"{label:<46}  {len(encoded):>8}  {compressed:>7}  {statistics.median(dumps_ms):>6.3f}ms"
+            f"  {statistics.median(loads_ms):>6.3f}ms  ({len(encoded) / baseline:.0%} of full)"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Nigerian Government Fees API - Request Accounting Benchmark
+
+Compares the two API key usage accounting modes of functions/auth_api_key.xs
+(selected with the API_KEY_ACCOUNTING environment variable):
+
+- exact: every request writes request_count/last_request_at to api_keys
+- batched: every request bumps an in-memory counter, and a background
+  flusher folds the counters into api_keys (tasks/flush_api_key_usage.xs)
+
+Both modes run the same key lookup against an on-disk SQLite copy of the
+api_keys table from concurrent worker threads, so the cost of turning each
+read into a durable write shows up as lost throughput. After a final flush
+both modes must leave identical request counts.
+
+Run: python bench_request_accounting.py [--requests 5000] [--workers 8] [--keys 20]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+
+def create_database(path: str, keys: int) -> List[str]:
+    """Create an api_keys table with `keys` active keys and return the key strings."""
+    db = sqlite3.connect(path)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute(
+        'CREATE TABLE api_keys (id INTEGER PRIMARY KEY, key TEXT UNIQUE, is_active INTEGER,'
+        ' request_count INTEGER, last_request_at REAL)'
+    )
+    key_strings = [f'nga_bench_{i:04d}' for i in range(1, keys + 1)]
+    db.executemany(
+        'INSERT INTO api_keys (id, key, is_active, request_count, last_request_at) VALUES (?, ?, 1, 0, NULL)',
+        [(i, key) for i, key in enumerate(key_strings, 1)]
+    )
+    db.commit()
+    db.close()
+    return key_strings
+
+
+class Accounting:
+    """Per-thread SQLite connections plus the usage buffer for batched mode"""
+
+    def __init__(self, path: str, mode: str, flush_interval: float):
+        self.path = path
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self.writes = 0
+        self._local = threading.local()
+        self._buffer: Counter = Counter()
+        self._last_seen: Dict[int, float] = {}
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = None
+
+    def _db(self) -> sqlite3.Connection:
+        if not hasattr(self._local, 'db'):
+            self._local.db = sqlite3.connect(self.path, timeout=30)
+            self._local.db.execute('PRAGMA synchronous=FULL')
+        return self._local.db
+
+    def handle(self, api_key: str):
+        """Authenticate one request and account for it."""
+        db = self._db()
+        row = db.execute('SELECT id, is_active FROM api_keys WHERE key = ?', (api_key,)).fetchone()
+        if row is None or not row[1]:
+            raise ValueError('Invalid or inactive API Key.')
+
+        if self.mode == 'exact':
+            with self._write_lock, db:
+                db.execute(
+                    'UPDATE api_keys SET request_count = request_count + 1, last_request_at = ? WHERE id = ?',
+                    (time.time(), row[0])
+                )
+                self.writes += 1
+        else:
+            with self._buffer_lock:
+                self._buffer[row[0]] += 1
+                self._last_seen[row[0]] = time.time()
+
+    def flush(self):
+        """Fold buffered counts into api_keys with one write per key."""
+        with self._buffer_lock:
+            pending, self._buffer = self._buffer, Counter()
+            last_seen, self._last_seen = self._last_seen, {}
+        if not pending:
+            return
+
+        db = self._db()
+        with self._write_lock, db:
+            db.executemany(
+                'UPDATE api_keys SET request_count = request_count + ?, last_request_at = ? WHERE id = ?',
+                [(count, last_seen[key_id], key_id) for key_id, count in pending.items()]
+            )
+            self.writes += len(pending)
+
+    def start(self):
+        if self.mode == 'batched':
+            self._flusher = threading.Thread(target=self._run_flusher, daemon=True)
+            self._flusher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+
+    def _run_flusher(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+def run_mode(mode: str, total: int, workers: int, keys: int, flush_interval: float, seed: int) -> Tuple[float, int, Dict[int, int]]:
+    """Run `total` requests in one mode; return (req/s, api_keys writes, final counts)."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'api_keys.sqlite3')
+        key_strings = create_database(path, keys)
+        rng = random.Random(seed)
+        # A few busy keys take most of the traffic, as with real clients
+        weights = [1 / rank for rank in range(1, keys + 1)]
+        traffic = rng.choices(key_strings, weights=weights, k=total)
+
+        accounting = Accounting(path, mode, flush_interval)
+        accounting.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(accounting.handle, traffic))
+        elapsed = time.perf_counter() - started
+        accounting.stop()
+
+        db = sqlite3.connect(path)
+        counts = dict(db.execute('SELECT id, request_count FROM api_keys'))
+        db.close()
+
+    return total / elapsed, accounting.writes, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark exact vs batched request accounting')
+    parser.add_argument('--requests', type=int, default=5000, help='Requests per mode (default: 5000)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent worker threads (default: 8)')
+    parser.add_argument('--keys', type=int, default=20, help='Distinct API keys (default: 20)')
+    parser.add_argument('--flush-interval', type=float, default=0.5,
+                        help='Seconds between batched flushes (default: 0.5)')
+    parser.add_argument('--seed', type=int, default=7, help='Traffic seed (default: 7)')
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.workers} workers, {args.keys} keys\n")
+    results = {}
+    for mode in ('exact', 'batched'):
+        rate, writes, counts = run_mode(mode, args.requests, args.workers, args.keys, args.flush_interval, args.seed)
+        results[mode] = counts
+        print(f"{mode:<8} {rate:10.1f} req/s  {writes:>7} api_keys writes")
+
+    if results['exact'] != results['batched']:
+        raise SystemExit('Request counts differ between modes')
+    print(f"\nBoth modes recorded the same {sum(results['exact'].values())} requests")
+
+
+if __name__ == '__main__':
+    main()
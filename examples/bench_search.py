@@ -0,0 +1,124 @@
+"""
+Nigerian Government Fees API - /fees/search Benchmark
+
+Compares the two ways /fees/search has answered a query on synthetic
+catalogs from the ~120 seed rows up to hundreds of thousands of fees:
+
+- scan: substring test on every fee's name and description, then sort by
+  name (the old `includes` query)
+- indexed: word-trigram postings intersected to a candidate set, rechecked
+  and ranked name-first (fee_search_index, mirrored by FeeMirror.search)
+
+The scan grows with the catalog. The indexed path grows with the number of
+matches instead: selective queries (a payment code, one office's fees) stay
+flat however large the catalog gets, while broad ones ("passport") still
+grow because every match has to be ranked.
+
+The fuzzy column runs mode=fuzzy (FeeMirror.fuzzy_search) with one letter
+dropped from every query word. Typo tolerance costs a few vocabulary
+lookups on top of an exact search, so it scales with the matches too
+rather than with the catalog.
+
+Run: python bench_search.py [--sizes 120 10000 100000 300000] [--repeat 5]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Dict, List, Any
+
+from fees_mirror import FeeMirror
+
+# Vocabulary shaped like the seed catalog. Every block of 120 fees belongs to
+# its own collecting office, so larger catalogs add offices rather than
+# repeating the same rows
+SERVICES = [
+    'NIN Enrolment', 'NIN Modification', 'Date of Birth Correction', 'Standard Passport',
+    'Official Passport', 'UTME Registration', 'Direct Entry Registration', 'SSCE Internal',
+    'SSCE External', 'BECE Registration', 'Tariff Band A', 'Tariff Band B', 'Driver Licence Renewal',
+    'Vehicle Registration', 'Business Name Registration', 'Company Incorporation'
+]
+QUALIFIERS = ['Standard', 'Express', 'Premium', 'Late', 'Replacement', 'Renewal', 'Diaspora', 'Student']
+SYLLABLES = [consonant + vowel for consonant in 'bdfgklmnrstwyz' for vowel in 'aeiou']
+BROAD_QUERIES = ['passport', 'nin modification', 'tariff band']
+
+
+def office_name(office: int) -> str:
+    """Pronounceable, mostly unique office name (e.g. 'Kadutamo')."""
+    rng = random.Random(office)
+    return ''.join(rng.choice(SYLLABLES) for _ in range(4)).capitalize()
+
+
+# Each names one office (120 fees) or one fee, whatever the catalog size
+SELECTIVE_QUERIES = [f'{office_name(0)} office', f'{office_name(0)}-077', f'collected by {office_name(0)}']
+
+
+def synthetic_fees(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate `count` fees in the GET /fees item shape."""
+    rng = random.Random(seed)
+    fees = []
+    for fee_id in range(1, count + 1):
+        service = rng.choice(SERVICES)
+        office = (fee_id - 1) // 120
+        fees.append({
+            'id': fee_id,
+            'name': f'{service} ({rng.choice(QUALIFIERS)})',
+            'description': f'{service} fee collected by {office_name(office)} office',
+            'service_type': rng.choice(QUALIFIERS),
+            'payment_code': f'{office_name(office).upper()}-{(fee_id - 1) % 120:03d}',
+            'amount': rng.randint(0, 200) * 500,
+            'currency': 'NGN',
+            'category_name': service.split()[0]
+        })
+    return fees
+
+
+def scan_search(fees: List[Dict[str, Any]], query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """The old plan: test every row, then sort the matches by name."""
+    needle = query.lower()
+    matches = [
+        fee for fee in fees
+        if needle in (fee.get('name') or '').lower() or needle in (fee.get('description') or '').lower()
+    ]
+    return sorted(matches, key=lambda fee: fee.get('name') or '')[:limit]
+
+
+def misspell(query: str) -> str:
+    """Drop the second letter of every word longer than four characters."""
+    return ' '.join(word[0] + word[2:] if len(word) > 4 else word for word in query.split())
+
+
+def median_ms(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scan vs trigram-indexed fee search')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[120, 10000, 100000, 300000],
+                        help='Catalog sizes (default: 120 10000 100000 300000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query (default: 5)')
+    args = parser.parse_args()
+
+    print(f"Median ms per query, {args.repeat} runs each\n")
+    print(f"{'fees':>8}  {'queries':<9}  {'scan':>9}  {'indexed':>9}  {'speed-up':>8}  {'fuzzy':>9}")
+    for size in args.sizes:
+        fees = synthetic_fees(size)
+        mirror = FeeMirror(fees)
+
+        for label, queries in (('selective', SELECTIVE_QUERIES), ('broad', BROAD_QUERIES)):
+            scan = statistics.median(median_ms(lambda: scan_search(fees, query), args.repeat) for query in queries)
+            indexed = statistics.median(median_ms(lambda: mirror.search(query), args.repeat) for query in queries)
+            fuzzy = statistics.median(
+                median_ms(lambda: mirror.search(misspell(query), fuzzy=True), args.repeat) for query in queries
+            )
+            print(f"{size:>8}  {label:<9}  {scan:>7.2f}ms  {indexed:>7.2f}ms  {scan / indexed:>7.1f}x  {fuzzy:>7.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
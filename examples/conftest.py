@@ -0,0 +1,2 @@
+# xano_hcktn_endpoint_test.py is a script run against a live API (or --standin), not a pytest module
+collect_ignore = ['xano_hcktn_endpoint_test.py']
@@ -0,0 +1,319 @@
+"""
+Nigerian Government Fees API - Async Python Client
+
+asyncio equivalents of the seven endpoint helpers in python-example.py, for
+callers running inside an event loop (async web services, bots, workers).
+All calls share one httpx.AsyncClient connection pool and return the same
+parsed shapes as handle_response. Like FeesClient, GET requests are retried
+with exponential backoff on connection errors and 429/5xx responses,
+honouring Retry-After.
+
+Installation:
+    pip install httpx
+
+Usage:
+    import asyncio
+    from fees_async_client import AsyncFeesClient
+
+    async def main():
+        async with AsyncFeesClient(api_key='nga_your_api_key_here') as client:
+            fees = await client.get_fees(category='identity', per_page=5)
+            details = await client.map(client.get_fee_by_id, [1, 2, 3], concurrency=2)
+
+    asyncio.run(main())
+"""
+
+import asyncio
+from typing import Optional, Dict, List, Any, Awaitable, Callable, Iterable
+
+import httpx
+
+from fees_client import (
+    BASE_URL, MAX_BATCH_IDS, RETRY_METHODS, RETRY_STATUS_CODES, handle_response, projection_params
+)
+
+
+class AsyncFeesClient:
+    """
+    Async client for the Nigerian Government Fees API.
+
+    Args:
+        base_url: API base URL
+        api_key: API key appended to authenticated requests
+        max_connections: Size of the shared connection pool
+        max_keepalive_connections: Idle connections kept open for reuse
+        max_concurrency: Maximum requests in flight across the whole client
+        timeout: Request timeout in seconds
+        max_retries: Retries for connection errors and 429/5xx responses
+        backoff_factor: Exponential backoff factor between retries
+        transport: Optional httpx transport (e.g. httpx.MockTransport in tests)
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        api_key: Optional[str] = None,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        max_concurrency: int = 10,
+        timeout: float = 15.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={'Accept': 'application/json'},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            timeout=timeout,
+            transport=transport
+        )
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        auth: bool = True
+    ) -> httpx.Response:
+        """
+        Send a request through the shared connection pool.
+
+        GET requests that fail to connect or come back 429/5xx are retried up
+        to max_retries times; the wait is Retry-After when the server sends
+        one, otherwise backoff_factor * 2^attempt seconds. The semaphore is
+        released while waiting.
+
+        Args:
+            method: HTTP method
+            path: Endpoint path relative to the base URL (e.g. '/fees')
+            params: Query parameters
+            json: JSON request body
+            auth: Append the client's api_key to the query parameters
+
+        Returns:
+            httpx.Response: The raw response
+        """
+        params = dict(params or {})
+        if auth and self.api_key:
+            params.setdefault('api_key', self.api_key)
+
+        for attempt in range(self.max_retries + 1):
+            retryable = method.upper() in RETRY_METHODS and attempt < self.max_retries
+            delay = self.backoff_factor * 2 ** attempt
+            try:
+                async with self._semaphore:
+                    response = await self._client.request(method, path, params=params or None, json=json)
+            except httpx.TransportError:
+                if not retryable:
+                    raise
+            else:
+                if not retryable or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def map(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        args: Iterable[Any],
+        concurrency: int = 5
+    ) -> List[Any]:
+        """
+        Run `func` over `args` with at most `concurrency` calls in flight.
+
+        Args:
+            func: One of the endpoint coroutines (e.g. client.get_fee_by_id)
+            args: One argument per call
+            concurrency: Concurrency limit for this batch of calls
+
+        Returns:
+            list: Results in the same order as `args`
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(arg: Any) -> Any:
+            async with semaphore:
+                return await func(arg)
+
+        return await asyncio.gather(*(run(arg) for arg in args))
+
+    async def get_fees(
+        self,
+        category: Optional[str] = None,
+        state: Optional[str] = None,
+        search: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[List[str]] = None,
+        compact: bool = False
+    ) -> Dict[str, Any]:
+        """
+        GET /fees
+        Retrieve a paginated list of fees with optional filters.
+
+        Args:
+            cursor: meta.next_cursor from the previous page (page is then ignored)
+            include_total: Count the total matching fees (default: True)
+            fields: Only return these fields (e.g. ['id', 'name', 'amount'])
+            compact: Return only id, name, amount and currency (default: False)
+
+        Returns:
+            dict: Response containing items and meta information
+        """
+        params = {'page': page, 'per_page': per_page}
+        if category:
+            params['category'] = category
+        if state:
+            params['state'] = state
+        if search:
+            params['search'] = search
+        if cursor:
+            params['cursor'] = cursor
+        if not include_total:
+            params['include_total'] = 'false'
+        params.update(projection_params(fields, compact))
+
+        return handle_response(await self.request('GET', '/fees', params=params))
+
+    async def get_fee_by_id(
+        self,
+        fee_id: int,
+        fields: Optional[List[str]] = None,
+        compact: bool = False
+    ) -> Dict[str, Any]:
+        """
+        GET /fees/{id}
+        Retrieve a single fee by ID with all relationships.
+
+        Args:
+            fields: Only return these fields ('subcategory' and 'source' are the nested records)
+            compact: Return only id, name, amount and currency (default: False)
+
+        Returns:
+            dict: Fee object with nested relationships
+        """
+        response = await self.request('GET', f'/fees/{fee_id}', params=projection_params(fields, compact))
+
+        # Handle 404 specifically
+        if response.status_code == 404:
+            error = response.json()
+            raise ValueError(f"Fee not found: {error.get('message', 'Unknown error')}")
+
+        return handle_response(response)
+
+    async def get_fees_by_ids(
+        self,
+        fee_ids: List[int],
+        fields: Optional[List[str]] = None,
+        compact: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        GET /fees/batch
+        Retrieve many fees by ID; batches of 100 are fetched concurrently.
+
+        Args:
+            fee_ids: Fee IDs to fetch
+            fields: Only return these fields (e.g. ['id', 'name', 'amount'])
+            compact: Return only id, name, amount and currency (default: False)
+
+        Returns:
+            list: One entry per requested ID in the same order; IDs without a
+                fee come back as {'id': ..., 'not_found': True}
+        """
+        async def fetch(batch: List[int]) -> List[Dict[str, Any]]:
+            params = {'ids': ','.join(str(fee_id) for fee_id in batch)}
+            params.update(projection_params(fields, compact))
+            return handle_response(await self.request('GET', '/fees/batch', params=params))['items']
+
+        batches = [fee_ids[start:start + MAX_BATCH_IDS] for start in range(0, len(fee_ids), MAX_BATCH_IDS)]
+        pages = await asyncio.gather(*(fetch(batch) for batch in batches))
+        return [item for page in pages for item in page]
+
+    async def search_fees(self, query: str, fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """
+        GET /fees/search
+        Search fees by name and description.
+
+        Args:
+            query: Search query (minimum 2 characters)
+            fuzzy: Tolerate typos and known synonyms (mode=fuzzy)
+
+        Returns:
+            list: Array of fee objects matching the search
+        """
+        if not query or len(query.strip()) < 2:
+            raise ValueError('Search query must be at least 2 characters long')
+
+        params = {'q': query.strip()}
+        if fuzzy:
+            params['mode'] = 'fuzzy'
+        return handle_response(await self.request('GET', '/fees/search', params=params))
+
+    async def get_categories(self) -> List[Dict[str, Any]]:
+        """
+        GET /categories
+        Get all categories with fee counts.
+
+        Returns:
+            list: Array of category objects with fee_count
+        """
+        return handle_response(await self.request('GET', '/categories'))
+
+    async def get_metadata(self) -> Dict[str, Any]:
+        """
+        GET /metadata
+        Get API statistics and metadata.
+
+        Returns:
+            dict: Metadata object with statistics and version information
+        """
+        return handle_response(await self.request('GET', '/metadata'))
+
+    async def get_docs(self) -> Dict[str, Any]:
+        """
+        GET /docs
+        Get documentation links (no authentication required).
+
+        Returns:
+            dict: Documentation links object
+        """
+        return handle_response(await self.request('GET', '/docs', auth=False))
+
+    async def generate_api_key(self, user_email: Optional[str] = None) -> Dict[str, Any]:
+        """
+        POST /api_key/generate
+        Generate a new API key.
+
+        Returns:
+            dict: Response containing the generated API key
+        """
+        body = {}
+        if user_email:
+            body['user_email'] = user_email
+
+        return handle_response(await self.request('POST', '/api_key/generate', json=body, auth=False))
+
+    async def aclose(self):
+        """Close all pooled connections."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> 'AsyncFeesClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,212 @@
+"""
+Nigerian Government Fees API - Client-side Response Cache
+
+Pluggable response caches for FeesClient. The fee catalog changes rarely, so
+repeated lookups (categories, fee details) can be served locally instead of
+spending the 100 requests/hour key budget.
+
+Two backends share the same interface:
+- MemoryCache: in-process LRU with a TTL
+- SQLiteCache: on-disk store that survives restarts
+
+Both keep the catalog version (metadata.last_database_update) the cached
+entries belong to; FeesClient clears the cache when that version moves on.
+
+Usage:
+    from fees_client import FeesClient
+    from fees_cache import MemoryCache
+
+    client = FeesClient(api_key='nga_your_api_key_here', cache=MemoryCache(ttl=600))
+    categories = client.get_json('/categories')
+    print(client.cache.stats.as_dict())
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, NamedTuple
+
+
+class CacheEntry(NamedTuple):
+    """A cached response body with its validator"""
+    value: Any
+    etag: Optional[str]
+    stored_at: float
+
+
+class CacheStats:
+    """Hit/miss/eviction counters shared by every cache backend"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.revalidations = 0
+        self.invalidations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'revalidations': self.revalidations,
+            'invalidations': self.invalidations,
+            'hit_rate': round(self.hit_rate, 4)
+        }
+
+
+class MemoryCache:
+    """
+    In-memory LRU response cache with a time-to-live.
+
+    Args:
+        max_entries: Entries kept before the least recently used is evicted
+        ttl: Seconds an entry is served without contacting the API
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = None
+        self.stats = CacheStats()
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry.stored_at > self.ttl:
+                if entry is not None:
+                    self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.value
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry even if it has expired (used for ETag revalidation)."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, value: Any, etag: Optional[str] = None):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = CacheEntry(value, etag, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    On-disk response cache backed by SQLite, with a TTL and an entry cap.
+
+    Args:
+        path: SQLite database file (':memory:' for a throwaway cache)
+        max_entries: Entries kept before the least recently used is evicted
+        ttl: Seconds an entry is served without contacting the API
+    """
+
+    def __init__(self, path: str = 'fees_cache.sqlite3', max_entries: int = 5000, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, value TEXT NOT NULL, etag TEXT,'
+            ' stored_at REAL NOT NULL, used_at REAL NOT NULL);'
+            'CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at);'
+            'CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value TEXT);'
+        )
+
+    @property
+    def version(self) -> Optional[Any]:
+        """Catalog version the cached entries belong to (persisted)."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM cache_meta WHERE name = 'version'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    @version.setter
+    def version(self, value: Any):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache_meta (name, value) VALUES ('version', ?)",
+                (json.dumps(value),)
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value, or None on a miss."""
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                'SELECT value, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._db.execute('UPDATE responses SET used_at = ? WHERE key = ?', (now, key))
+            self.stats.hits += 1
+            return json.loads(row[0])
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry even if it has expired (used for ETag revalidation)."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value, etag, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+        return CacheEntry(json.loads(row[0]), row[1], row[2]) if row else None
+
+    def set(self, key: str, value: Any, etag: Optional[str] = None):
+        """Store a value, evicting the least recently used entries when full."""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses (key, value, etag, stored_at, used_at) VALUES (?, ?, ?, ?, ?)',
+                (key, json.dumps(value), etag, now, now)
+            )
+            overflow = self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._db.execute(
+                    'DELETE FROM responses WHERE key IN '
+                    '(SELECT key FROM responses ORDER BY used_at LIMIT ?)',
+                    (overflow,)
+                )
+                self.stats.evictions += overflow
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
@@ -0,0 +1,436 @@
+"""
+Nigerian Government Fees API - Pooled HTTP Client
+
+A reusable client that owns a single pooled, keep-alive requests.Session.
+Reusing the session lets every call share already-open TCP+TLS connections
+to the Xano host instead of paying the connection setup cost per request.
+
+Installation:
+    pip install requests
+
+Usage:
+    from fees_client import FeesClient
+
+    with FeesClient(api_key='nga_your_api_key_here') as client:
+        data = handle_response(client.get('/fees', params={'per_page': 5}))
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List, Any, Tuple, Union
+from urllib.parse import urlencode
+
+BASE_URL = 'https://xmlb-8xh6-ww1h.n7e.xano.io/api:public'
+
+# Status codes that are safe to retry with backoff
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Only idempotent methods are retried (POST /api_key/generate is not)
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# Per-key request budget enforced by the rate limiting block in apis/public/*.xs
+HOURLY_REQUEST_BUDGET = 100
+
+# Maximum ids accepted by one GET /fees/batch request
+MAX_BATCH_IDS = 100
+
+
+def handle_response(response: requests.Response) -> Dict[str, Any]:
+    """
+    Helper function to handle API responses and errors.
+
+    Args:
+        response: requests.Response object
+
+    Returns:
+        dict: Parsed JSON response
+
+    Raises:
+        requests.exceptions.HTTPError: For HTTP errors
+        ValueError: For API-level errors
+    """
+    try:
+        data = response.json()
+    except ValueError:
+        # If response is not JSON, raise HTTP error
+        response.raise_for_status()
+        return {}
+
+    # Check for API-level errors
+    if isinstance(data, dict) and 'code' in data and str(data['code']).startswith('ERROR_CODE'):
+        error_msg = data.get('message', 'Unknown API error')
+        raise ValueError(f"{data['code']}: {error_msg}")
+
+    # Check for HTTP errors
+    response.raise_for_status()
+
+    return data
+
+
+def page_count(meta: Dict[str, Any]) -> int:
+    """
+    Work out the number of pages from a paginated response's meta object.
+
+    /fees returns {total, limit, offset, page}; pageTotal is used when present.
+
+    Args:
+        meta: The 'meta' object of a paginated response
+
+    Returns:
+        int: Total number of pages (at least 1)
+    """
+    if meta.get('pageTotal'):
+        return int(meta['pageTotal'])
+
+    total = meta.get('total') or 0
+    limit = meta.get('limit') or 1
+    return max(1, math.ceil(total / limit))
+
+
+def projection_params(fields: Optional[List[str]] = None, compact: bool = False) -> Dict[str, str]:
+    """
+    Build the fields/compact query parameters accepted by /fees and /fees/{id}.
+
+    Args:
+        fields: Field names to return (None returns every field)
+        compact: Return only id, name, amount and currency when fields is not given
+
+    Returns:
+        dict: Query parameters to merge into the request
+    """
+    params = {}
+    if fields:
+        params['fields'] = ','.join(fields)
+    if compact:
+        params['compact'] = 'true'
+    return params
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to keep request rates inside the key budget.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum number of tokens the bucket can hold (burst size)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_hour(cls, requests_per_hour: int = HOURLY_REQUEST_BUDGET, burst: Optional[int] = None) -> 'TokenBucket':
+        """Create a bucket that refills `requests_per_hour` tokens every hour."""
+        return cls(requests_per_hour / 3600.0, burst if burst is not None else requests_per_hour)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take `tokens` if available without waiting."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block until `tokens` are available.
+
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            bool: True if the tokens were taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class FeesClient:
+    """
+    Pooled HTTP client for the Nigerian Government Fees API.
+
+    Args:
+        base_url: API base URL
+        api_key: API key appended to authenticated requests
+        pool_connections: Number of connection pools to cache (one per host)
+        pool_maxsize: Maximum connections kept open per pool
+        timeout: Request timeout in seconds, or a (connect, read) tuple
+        max_retries: Retries for connection errors and 429/5xx responses
+        backoff_factor: Exponential backoff factor between retries
+        keep_alive: Reuse connections between requests (default: True)
+        rate_limiter: Optional TokenBucket every authenticated request takes a token from
+        cache: Optional response cache (see fees_cache.py) used by get_json
+        metadata_poll_interval: Seconds between /metadata polls that check
+            whether the cached catalog is out of date
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        api_key: Optional[str] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        timeout: Union[float, Tuple[float, float]] = (3.05, 15),
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        keep_alive: bool = True,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[Any] = None,
+        metadata_poll_interval: float = 300
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.metadata_poll_interval = metadata_poll_interval
+        self._metadata_polled_at = None
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept'] = 'application/json'
+
+        # requests keeps connections alive by default; opt out explicitly
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        auth: bool = True,
+        headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """
+        Send a request through the pooled session.
+
+        Args:
+            method: HTTP method
+            path: Endpoint path relative to the base URL (e.g. '/fees')
+            params: Query parameters
+            json: JSON request body
+            auth: Append the client's api_key to the query parameters
+            headers: Extra request headers
+
+        Returns:
+            requests.Response: The raw response
+        """
+        params = dict(params or {})
+        if auth and self.api_key:
+            params.setdefault('api_key', self.api_key)
+
+        # Only authenticated calls count against the key's hourly budget
+        if auth and self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        return self.session.request(
+            method,
+            f'{self.base_url}{path}',
+            params=params or None,
+            json=json,
+            headers=headers,
+            timeout=self.timeout
+        )
+
+    def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        auth: bool = True
+    ) -> requests.Response:
+        """Send a GET request through the pooled session."""
+        return self.request('GET', path, params=params, auth=auth)
+
+    def post(
+        self,
+        path: str,
+        json: Optional[Dict[str, Any]] = None,
+        auth: bool = False
+    ) -> requests.Response:
+        """Send a POST request through the pooled session."""
+        return self.request('POST', path, json=json, auth=auth)
+
+    def get_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        auth: bool = True,
+        use_cache: bool = True
+    ) -> Any:
+        """
+        GET an endpoint and return its parsed body, serving it from the cache when possible.
+
+        Fresh entries are returned without a request. Expired entries that
+        carry an ETag are revalidated with If-None-Match, so a 304 reuses the
+        cached body. The cache is cleared whenever a periodic /metadata poll
+        reports a new last_database_update.
+
+        Args:
+            path: Endpoint path relative to the base URL
+            params: Query parameters (part of the cache key; api_key is not)
+            auth: Append the client's api_key to the query parameters
+            use_cache: Bypass the cache for this call when False
+
+        Returns:
+            Parsed JSON body (same shape as handle_response)
+        """
+        if self.cache is None or not use_cache:
+            return handle_response(self.get(path, params=params, auth=auth))
+
+        self._check_catalog_version()
+
+        key = path
+        if params:
+            key = f'{path}?{urlencode(sorted(params.items()))}'
+
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+
+        stale = self.cache.peek(key)
+        headers = {'If-None-Match': stale.etag} if stale is not None and stale.etag else None
+        response = self.request('GET', path, params=params, auth=auth, headers=headers)
+
+        if response.status_code == 304 and stale is not None:
+            self.cache.stats.revalidations += 1
+            self.cache.set(key, stale.value, etag=stale.etag)
+            return stale.value
+
+        data = handle_response(response)
+        self.cache.set(key, data, etag=response.headers.get('ETag'))
+        return data
+
+    def refresh_cache(self) -> bool:
+        """
+        Poll GET /metadata and clear the cache if the catalog has changed.
+
+        Returns:
+            bool: True if the cache was invalidated
+        """
+        if self.cache is None:
+            return False
+
+        metadata = handle_response(self.get('/metadata'))
+        self._metadata_polled_at = time.monotonic()
+        version = metadata.get('last_database_update')
+
+        # Any change means the catalog moved on; comparing for inequality also
+        # copes with a database restored to an older snapshot
+        if version == self.cache.version:
+            return False
+
+        invalidated = self.cache.version is not None or len(self.cache) > 0
+        if invalidated:
+            self.cache.clear()
+            self.cache.stats.invalidations += 1
+        self.cache.version = version
+        return invalidated
+
+    def _check_catalog_version(self):
+        """Run refresh_cache() at most once per metadata_poll_interval."""
+        if (
+            self._metadata_polled_at is None
+            or time.monotonic() - self._metadata_polled_at >= self.metadata_poll_interval
+        ):
+            self.refresh_cache()
+
+    def get_all_pages(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        max_workers: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch every page of a paginated endpoint concurrently.
+
+        Page 1 is fetched first to read meta.total; the remaining pages are
+        then fetched in parallel through a bounded thread pool. Pages are
+        merged in page order, so the server's sort order is preserved.
+
+        Args:
+            path: Paginated endpoint path (e.g. '/fees')
+            params: Query parameters (filters) sent with every page
+            per_page: Page size (default: 100, the server maximum)
+            max_workers: Maximum pages in flight at once (capped at pool_maxsize)
+
+        Returns:
+            list: All items across every page
+        """
+        params = dict(params or {})
+        params['per_page'] = per_page
+
+        first = handle_response(self.get(path, params={**params, 'page': 1}))
+        items = list(first['items'])
+        total_pages = page_count(first['meta'])
+        if total_pages <= 1:
+            return items
+
+        def fetch(page: int) -> List[Dict[str, Any]]:
+            return handle_response(self.get(path, params={**params, 'page': page}))['items']
+
+        workers = max(1, min(max_workers, self.pool_maxsize, total_pages - 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map() yields results in submission order, i.e. page order
+            for page_items in pool.map(fetch, range(2, total_pages + 1)):
+                items.extend(page_items)
+
+        return items
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> 'FeesClient':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,629 @@
+"""
+Nigerian Government Fees API - Offline Snapshot Mirror
+
+Pulls the whole fee catalog once through the paginated /fees endpoint into a
+compact local snapshot, then answers the same filter, sort and paging
+questions as GET /fees (apis/public/fees.xs) from in-memory indexes:
+
+- hash indexes by category slug/name, agency slug/name and meta.state,
+  keyed case-insensitively like the server's ==? comparisons
+- a sorted amount array for range queries
+- a trigram index over name and description for substring search
+- a word-trigram search index over normalized name, service type, payment
+  code and description, ranked like GET /fees/search
+- a word index plus one-deletion spelling variants for the fuzzy search mode
+
+Local reads cost no API quota and take microseconds. After the first full
+sync, `refresh` pulls only the fees changed or deleted since the last sync
+from GET /fees/changes and patches the indexes in place.
+
+Run:
+    python fees_mirror.py sync --api-key nga_your_api_key_here
+    python fees_mirror.py refresh --api-key nga_your_api_key_here
+    python fees_mirror.py query --category identity --search modification
+    python fees_mirror.py query --min-amount 1000 --max-amount 5000
+"""
+
+import argparse
+import bisect
+import gzip
+import heapq
+import json
+import re
+import time
+import unicodedata
+from datetime import datetime
+from typing import Optional, Dict, List, Any, Iterable, Set
+
+from fees_client import BASE_URL, FeesClient, handle_response
+
+DEFAULT_SNAPSHOT = 'fees_mirror.json.gz'
+
+# Long forms mapped to one canonical word (keep in sync with functions/search_words.xs)
+SYNONYMS = [
+    ('national identification number', 'nin'),
+    ('national identity number', 'nin'),
+    ('national identity management commission', 'nimc'),
+    ('joint admissions and matriculation board', 'jamb'),
+    ('unified tertiary matriculation examination', 'utme'),
+    ('national examinations council', 'neco'),
+    ('senior school certificate examination', 'ssce'),
+    ('basic education certificate examination', 'bece'),
+    ('nigeria immigration service', 'nis'),
+    ('eko electricity distribution company', 'ekedc'),
+    ('e passport', 'passport'),
+    ('license', 'licence')
+]
+
+
+def trigrams(text: str) -> Set[str]:
+    """Return the set of lower-cased character trigrams in `text`."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def normalize(text: Optional[str]) -> str:
+    """Normalize text like functions/search_trigrams.xs: strip accents, lower-case, punctuation to spaces."""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii').lower()
+    return ' '.join(re.split(r'[^a-z0-9]+', text)).strip()
+
+
+def word_trigrams(normalized: str) -> Set[str]:
+    """Trigrams of each word of already-normalized text (never spanning a space)."""
+    return {word[i:i + 3] for word in normalized.split() for i in range(len(word) - 2)}
+
+
+def search_words(text: Optional[str]) -> List[str]:
+    """
+    Canonical words for fuzzy matching, like functions/search_words.xs.
+
+    Joins spelled-out initials ("N.I.N" -> "nin") and maps known long forms
+    to their abbreviation.
+    """
+    text = re.sub(r'\b([a-z0-9]) (?=[a-z0-9]\b)', r'\1', normalize(text))
+    text = f' {text} '
+    for phrase, term in SYNONYMS:
+        text = text.replace(f' {phrase} ', f' {term} ')
+    return list(dict.fromkeys(text.split()))
+
+
+# Fuzzy queries use at most this many words (the longest ones), like functions/fuzzy_search_fees.xs
+MAX_FUZZY_WORDS = 6
+
+
+def deletion_variants(word: str) -> Set[str]:
+    """The word plus every one-character deletion (words of 3 characters or fewer get none)."""
+    if len(word) <= 3:
+        return {word}
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def search_text(fee: Dict[str, Any]) -> str:
+    """The normalized text /fees/search matches against, one field per " | "-separated part."""
+    fields = (normalize(fee.get(field)) for field in ('name', 'service_type', 'payment_code', 'description'))
+    return ' | '.join(field for field in fields if field)
+
+
+def fee_state(fee: Dict[str, Any]) -> Optional[str]:
+    """Return meta.state for a fee (meta may be stored as an object or JSON text)."""
+    meta = fee.get('meta')
+    if isinstance(meta, str):
+        try:
+            meta = json.loads(meta)
+        except ValueError:
+            return None
+    return meta.get('state') if isinstance(meta, dict) else None
+
+
+def fold(value: Optional[str]) -> Optional[str]:
+    """Case-insensitive index key for the category, agency and state filters (None stays None)."""
+    return value.casefold() if isinstance(value, str) else value
+
+
+def timestamp_ms(value: Optional[str]) -> int:
+    """Convert an ISO 8601 timestamp from the API to milliseconds since the epoch (0 if missing)."""
+    if not value:
+        return 0
+    return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() * 1000)
+
+
+def order_key(fee: Dict[str, Any]) -> tuple:
+    """Server sort order: category.name asc, fees.name asc (id breaks ties)."""
+    return (fee.get('category_name') or '', fee.get('name') or '', fee['id'])
+
+
+class FeeMirror:
+    """
+    In-memory mirror of the fee catalog with query indexes.
+
+    Args:
+        fees: Fee items as returned by GET /fees
+        synced_at: Unix time the snapshot was taken
+        cursor: GET /fees/changes cursor the snapshot is current up to
+            (derived from the newest updated_at when not given)
+    """
+
+    def __init__(
+        self,
+        fees: Iterable[Dict[str, Any]] = (),
+        synced_at: Optional[float] = None,
+        cursor: Optional[Dict[str, int]] = None
+    ):
+        self.synced_at = synced_at
+        self._fees: Dict[int, Dict[str, Any]] = {fee['id']: fee for fee in fees}
+        self._build_indexes()
+
+        if cursor is None:
+            # Timestamps come back with second precision, so the cursor can sit
+            # slightly behind the real newest change; re-applying those rows is harmless
+            since = max((timestamp_ms(fee.get('updated_at')) for fee in self._fees.values()), default=0)
+            cursor = {'since': since, 'after_id': 0, 'deleted_after': 0}
+        self.cursor = cursor
+
+    # ----- Indexes -----
+
+    def _build_indexes(self):
+        self._by_category: Dict[str, Set[int]] = {}
+        self._by_agency: Dict[str, Set[int]] = {}
+        self._by_state: Dict[str, Set[int]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._search_grams: Dict[str, Set[int]] = {}
+        self._search_text: Dict[int, str] = {}
+        self._search_name: Dict[int, str] = {}
+        self._words: Dict[str, Set[int]] = {}
+        self._fee_words: Dict[int, Set[str]] = {}
+        self._variants: Dict[str, Set[str]] = {}
+
+        for fee in self._fees.values():
+            self._index_fee(fee)
+
+        self._order_keys = sorted(order_key(fee) for fee in self._fees.values())
+        self._ordered_ids = [key[-1] for key in self._order_keys]
+        self._rank_cache: Optional[Dict[int, int]] = None
+
+        self._priced = sorted((fee['amount'], fee['id']) for fee in self._fees.values() if fee.get('amount') is not None)
+        self._amounts = [amount for amount, _ in self._priced]
+        self._amount_ids = [fee_id for _, fee_id in self._priced]
+
+    @property
+    def _rank(self) -> Dict[int, int]:
+        # Rebuilt lazily after apply_changes() shifts positions
+        if self._rank_cache is None:
+            self._rank_cache = {fee_id: position for position, fee_id in enumerate(self._ordered_ids)}
+        return self._rank_cache
+
+    def _index_fee(self, fee: Dict[str, Any]):
+        fee_id = fee['id']
+        for key in (fold(fee.get('category_slug')), fold(fee.get('category_name'))):
+            if key:
+                self._by_category.setdefault(key, set()).add(fee_id)
+        for key in (fold(fee.get('agency_slug')), fold(fee.get('agency_name'))):
+            if key:
+                self._by_agency.setdefault(key, set()).add(fee_id)
+
+        state = fold(fee_state(fee))
+        if state:
+            self._by_state.setdefault(state, set()).add(fee_id)
+
+        for trigram in trigrams(fee.get('name') or '') | trigrams(fee.get('description') or ''):
+            self._trigrams.setdefault(trigram, set()).add(fee_id)
+
+        text = search_text(fee)
+        self._search_text[fee_id] = text
+        self._search_name[fee_id] = normalize(fee.get('name'))
+        for trigram in word_trigrams(text):
+            self._search_grams.setdefault(trigram, set()).add(fee_id)
+
+        words = set(search_words(text))
+        self._fee_words[fee_id] = words
+        for word in words:
+            if word not in self._words:
+                for variant in deletion_variants(word):
+                    self._variants.setdefault(variant, set()).add(word)
+            self._words.setdefault(word, set()).add(fee_id)
+
+    def _unindex_fee(self, fee: Dict[str, Any]):
+        fee_id = fee['id']
+        self._search_name.pop(fee_id, None)
+
+        for word in self._fee_words.pop(fee_id, ()):
+            ids = self._words.get(word)
+            if ids is None:
+                continue
+            ids.discard(fee_id)
+            if not ids:
+                # Last fee using the word: drop it from the spelling vocabulary
+                del self._words[word]
+                for variant in deletion_variants(word):
+                    self._variants[variant].discard(word)
+                    if not self._variants[variant]:
+                        del self._variants[variant]
+
+        postings = [
+            (self._by_category, (fold(fee.get('category_slug')), fold(fee.get('category_name')))),
+            (self._by_agency, (fold(fee.get('agency_slug')), fold(fee.get('agency_name')))),
+            (self._by_state, (fold(fee_state(fee)),)),
+            (self._trigrams, trigrams(fee.get('name') or '') | trigrams(fee.get('description') or '')),
+            (self._search_grams, word_trigrams(self._search_text.pop(fee_id, '')))
+        ]
+        for index, keys in postings:
+            for key in keys:
+                ids = index.get(key) if key else None
+                if ids is not None:
+                    ids.discard(fee_id)
+                    if not ids:
+                        del index[key]
+
+    def _insert_sorted(self, fee: Dict[str, Any]):
+        key = order_key(fee)
+        position = bisect.bisect_left(self._order_keys, key)
+        self._order_keys.insert(position, key)
+        self._ordered_ids.insert(position, fee['id'])
+
+        if fee.get('amount') is not None:
+            pair = (fee['amount'], fee['id'])
+            position = bisect.bisect_left(self._priced, pair)
+            self._priced.insert(position, pair)
+            self._amounts.insert(position, pair[0])
+            self._amount_ids.insert(position, pair[1])
+
+    def _remove_sorted(self, fee: Dict[str, Any]):
+        key = order_key(fee)
+        position = bisect.bisect_left(self._order_keys, key)
+        if position < len(self._order_keys) and self._order_keys[position] == key:
+            del self._order_keys[position]
+            del self._ordered_ids[position]
+
+        if fee.get('amount') is not None:
+            pair = (fee['amount'], fee['id'])
+            position = bisect.bisect_left(self._priced, pair)
+            if position < len(self._priced) and self._priced[position] == pair:
+                del self._priced[position]
+                del self._amounts[position]
+                del self._amount_ids[position]
+
+    def _text_matches(self, search: str) -> Set[int]:
+        """Ids whose name or description includes `search` (case-insensitive)."""
+        needle = search.lower()
+        grams = trigrams(needle)
+        if grams:
+            postings = sorted((self._trigrams.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            # Too short for trigrams: fall back to scanning every fee
+            candidates = set(self._fees)
+
+        return {
+            fee_id for fee_id in candidates
+            if needle in (self._fees[fee_id].get('name') or '').lower()
+            or needle in (self._fees[fee_id].get('description') or '').lower()
+        }
+
+    def _amount_range(self, min_amount: Optional[float], max_amount: Optional[float]) -> Set[int]:
+        start = 0 if min_amount is None else bisect.bisect_left(self._amounts, min_amount)
+        end = len(self._amounts) if max_amount is None else bisect.bisect_right(self._amounts, max_amount)
+        return set(self._amount_ids[start:end])
+
+    # ----- Queries -----
+
+    def get(self, fee_id: int) -> Optional[Dict[str, Any]]:
+        """Return a single fee by id, or None."""
+        return self._fees.get(fee_id)
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        state: Optional[str] = None,
+        search: Optional[str] = None,
+        agency: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        page: int = 1,
+        per_page: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Answer a GET /fees query locally.
+
+        Filters combine with AND and empty values are ignored, as in fees.xs.
+        category and agency match either the slug or the name; category,
+        agency and state ignore case, as the server's ==? does.
+
+        Args:
+            category: Category slug or name
+            state: meta.state value
+            search: Substring of the fee name or description
+            agency: Agency slug or name
+            min_amount: Lowest amount to include
+            max_amount: Highest amount to include
+            page: Page number (minimum: 1)
+            per_page: Results per page (1-100)
+
+        Returns:
+            dict: {'items': [...], 'meta': {total, limit, offset, page}}
+        """
+        page = max(1, page)
+        per_page = min(max(1, per_page), 100)
+
+        selected: Optional[Set[int]] = None
+
+        def narrow(ids: Set[int]):
+            nonlocal selected
+            selected = set(ids) if selected is None else selected & ids
+
+        if category:
+            narrow(self._by_category.get(fold(category), set()))
+        if agency:
+            narrow(self._by_agency.get(fold(agency), set()))
+        if state:
+            narrow(self._by_state.get(fold(state), set()))
+        if min_amount is not None or max_amount is not None:
+            narrow(self._amount_range(min_amount, max_amount))
+        if search:
+            narrow(self._text_matches(search))
+
+        if selected is None:
+            ids = self._ordered_ids
+        else:
+            ids = sorted(selected, key=self._rank.__getitem__)
+        offset = (page - 1) * per_page
+
+        return {
+            'items': [self._fees[fee_id] for fee_id in ids[offset:offset + per_page]],
+            'meta': {
+                'total': len(ids),
+                'limit': per_page,
+                'offset': offset,
+                'page': page
+            }
+        }
+
+    def search(self, query: str, limit: int = 20, fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """
+        Answer a GET /fees/search query locally.
+
+        Matches the normalized query as a substring of the normalized name,
+        service type, payment code and description. Fees whose name
+        matches rank first; each tier is sorted by name.
+
+        Args:
+            query: Search text (minimum 2 characters)
+            limit: Maximum results (the endpoint returns 20)
+            fuzzy: Tolerate typos and synonyms, like mode=fuzzy (see fuzzy_search)
+
+        Returns:
+            list: Matching fees, most relevant first
+        """
+        if not query or len(query.strip()) < 2:
+            raise ValueError('Search query must be at least 2 characters long')
+        if fuzzy:
+            return self.fuzzy_search(query, limit)
+
+        needle = normalize(query)
+        grams = word_trigrams(needle)
+        if grams:
+            postings = sorted((self._search_grams.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = self._search_text.keys()
+
+        def rank(fee_id: int) -> tuple:
+            return (needle not in self._search_name[fee_id], self._fees[fee_id].get('name') or '', fee_id)
+
+        matches = [fee_id for fee_id in candidates if needle in self._search_text[fee_id]]
+        return [self._fees[fee_id] for fee_id in heapq.nsmallest(limit, matches, key=rank)]
+
+    def fuzzy_search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Typo-tolerant search, the local equivalent of GET /fees/search?mode=fuzzy.
+
+        Every query word must match a catalog word exactly, through a synonym,
+        or within one edit (found through shared deletion variants, so no
+        pairwise edit distance is computed). Words of 3 characters or fewer
+        only match exactly, and only the 6 longest words of a longer query
+        are used. Fees with more exact word hits rank first, then fees whose
+        name holds the words, then by name.
+
+        Args:
+            query: Search text, e.g. "pasport", "N.I.N modification"
+            limit: Maximum results
+
+        Returns:
+            list: Matching fees, best match first
+        """
+        words = sorted(search_words(query), key=lambda word: (-len(word), word))[:MAX_FUZZY_WORDS]
+        if not words:
+            return []
+
+        alternatives = []
+        for word in words:
+            if len(word) <= 3:
+                terms = {word} if word in self._words else set()
+            else:
+                terms = set()
+                for variant in deletion_variants(word):
+                    terms |= self._variants.get(variant, set())
+            alternatives.append((word, terms))
+
+        matches: Optional[Set[int]] = None
+        for _, terms in sorted(alternatives, key=lambda item: len(item[1])):
+            ids = set().union(*(self._words[term] for term in terms)) if terms else set()
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        def rank(fee_id: int) -> tuple:
+            name = self._search_name[fee_id]
+            exact = sum(word in self._fee_words[fee_id] for word, _ in alternatives)
+            in_name = sum(word in name for word, _ in alternatives)
+            return (-exact, -in_name, name, fee_id)
+
+        return [self._fees[fee_id] for fee_id in heapq.nsmallest(limit, matches, key=rank)]
+
+    def __len__(self) -> int:
+        return len(self._fees)
+
+    # ----- Incremental updates -----
+
+    def apply_changes(self, changed: Iterable[Dict[str, Any]] = (), deleted: Iterable[int] = ()) -> int:
+        """
+        Upsert changed fees and drop deleted ones, updating every index in place.
+
+        Args:
+            changed: Fee items as returned by GET /fees/changes
+            deleted: Ids of deleted fees
+
+        Returns:
+            int: Number of fees added, replaced or removed
+        """
+        applied = 0
+        for fee in changed:
+            previous = self._fees.get(fee['id'])
+            if previous is not None:
+                self._unindex_fee(previous)
+                self._remove_sorted(previous)
+            self._fees[fee['id']] = fee
+            self._index_fee(fee)
+            self._insert_sorted(fee)
+            applied += 1
+
+        for fee_id in deleted:
+            previous = self._fees.pop(fee_id, None)
+            if previous is not None:
+                self._unindex_fee(previous)
+                self._remove_sorted(previous)
+                applied += 1
+
+        if applied:
+            self._rank_cache = None
+        return applied
+
+    def sync_changes(self, client: FeesClient, limit: int = 100) -> Dict[str, int]:
+        """
+        Bring the mirror up to date from GET /fees/changes.
+
+        Follows next_cursor until has_more is false, so the number of
+        requests grows with the number of changes, not the catalog size.
+
+        Args:
+            client: Authenticated FeesClient
+            limit: Changes requested per call (1-500)
+
+        Returns:
+            dict: {'changed': n, 'deleted': n, 'requests': n}
+        """
+        summary = {'changed': 0, 'deleted': 0, 'requests': 0}
+        while True:
+            data = handle_response(client.get('/fees/changes', params={**self.cursor, 'limit': limit}))
+            summary['requests'] += 1
+            summary['changed'] += len(data['items'])
+            summary['deleted'] += len(data['deleted'])
+
+            self.apply_changes(data['items'], data['deleted'])
+            self.cursor = data['next_cursor']
+            if not data['has_more']:
+                break
+
+        self.synced_at = time.time()
+        return summary
+
+    # ----- Sync and persistence -----
+
+    @classmethod
+    def sync(cls, client: FeesClient, max_workers: int = 4) -> 'FeeMirror':
+        """
+        Pull the full catalog through paginated GET /fees calls.
+
+        Args:
+            client: Authenticated FeesClient
+            max_workers: Pages fetched concurrently after the first
+
+        Returns:
+            FeeMirror: A mirror of every fee
+        """
+        fees = client.get_all_pages('/fees', per_page=100, max_workers=max_workers)
+        return cls(fees, synced_at=time.time())
+
+    def save(self, path: str = DEFAULT_SNAPSHOT):
+        """Write the snapshot as compact gzipped JSON."""
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(
+                {'synced_at': self.synced_at, 'cursor': self.cursor, 'fees': list(self._fees.values())},
+                f,
+                separators=(',', ':')
+            )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_SNAPSHOT) -> 'FeeMirror':
+        """Load a snapshot written by save()."""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        return cls(snapshot['fees'], synced_at=snapshot.get('synced_at'), cursor=snapshot.get('cursor'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline mirror of the fee catalog')
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT, help='Snapshot file path')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sync_parser = commands.add_parser('sync', help='Pull the full catalog from the API')
+    sync_parser.add_argument('--api-key', required=True, help='API key')
+    sync_parser.add_argument('--base-url', default=BASE_URL, help='API base URL')
+    sync_parser.add_argument('--workers', type=int, default=4, help='Concurrent page fetches')
+
+    refresh_parser = commands.add_parser('refresh', help='Apply changes since the last sync')
+    refresh_parser.add_argument('--api-key', required=True, help='API key')
+    refresh_parser.add_argument('--base-url', default=BASE_URL, help='API base URL')
+
+    query_parser = commands.add_parser('query', help='Query the local snapshot')
+    query_parser.add_argument('--category')
+    query_parser.add_argument('--agency')
+    query_parser.add_argument('--state')
+    query_parser.add_argument('--search')
+    query_parser.add_argument('--min-amount', type=float)
+    query_parser.add_argument('--max-amount', type=float)
+    query_parser.add_argument('--page', type=int, default=1)
+    query_parser.add_argument('--per-page', type=int, default=20)
+
+    args = parser.parse_args()
+
+    if args.command == 'sync':
+        with FeesClient(args.base_url, args.api_key) as client:
+            started = time.perf_counter()
+            mirror = FeeMirror.sync(client, max_workers=args.workers)
+        mirror.save(args.snapshot)
+        print(f"Synced {len(mirror)} fees in {time.perf_counter() - started:.2f}s -> {args.snapshot}")
+        return
+
+    if args.command == 'refresh':
+        mirror = FeeMirror.load(args.snapshot)
+        with FeesClient(args.base_url, args.api_key) as client:
+            started = time.perf_counter()
+            summary = mirror.sync_changes(client)
+        mirror.save(args.snapshot)
+        print(
+            f"Applied {summary['changed']} changed and {summary['deleted']} deleted fees "
+            f"in {summary['requests']} requests ({time.perf_counter() - started:.2f}s) -> {args.snapshot}"
+        )
+        return
+
+    mirror = FeeMirror.load(args.snapshot)
+    started = time.perf_counter()
+    result = mirror.query(
+        category=args.category,
+        agency=args.agency,
+        state=args.state,
+        search=args.search,
+        min_amount=args.min_amount,
+        max_amount=args.max_amount,
+        page=args.page,
+        per_page=args.per_page
+    )
+    elapsed_us = (time.perf_counter() - started) * 1e6
+
+    for fee in result['items']:
+        print(f"  [{fee['id']}] {fee['name']} - {fee.get('amount')} {fee.get('currency')} ({fee.get('category_name')})")
+    print(f"{result['meta']['total']} matching fees, page {result['meta']['page']} ({elapsed_us:.0f}µs)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,892 @@
+"""
+Nigerian Government Fees API - Local Stand-in Server
+
+Serves the public API group (apis/public/*.xs) from the data/seed CSVs, so
+the test suite, benchmarks and client examples can run offline or in CI
+without spending API quota. The seed is loaded through seed_import.py into
+an in-memory SQLite catalog, and every endpoint takes the same inputs and
+returns the same response shapes, paging meta and errors as its .xs file:
+
+- docs, api_key/generate, fees, fees/{id}, fees/search (exact and fuzzy),
+  fees/batch, fees/changes, categories and metadata
+- errors as {code, message}: 400 ERROR_CODE_INPUT_ERROR (including missing
+  required inputs), 403 ERROR_CODE_ACCESS_DENIED, 404 ERROR_CODE_NOT_FOUND
+- the auth/api_key rate limit: a fixed window per key, opened by its first
+  request and counted under one lock, 100 requests per hour by default
+
+Each response is held back by --latency-ms plus up to +/- --jitter-ms
+(overridable per endpoint with --endpoint-latency), drawn from a seeded
+random generator, so client-side pooling, caching and concurrency can be
+measured against a reproducible latency profile.
+
+Run: python fees_standin.py [--port 8080] [--latency-ms 80] [--jitter-ms 20] [--api-key nga_local_test_key]
+Then use http://127.0.0.1:8080/api:public as the base URL.
+
+In-process:
+    server = start_server(FeesStandIn(latency=LatencyProfile(50, 10, seed=1)))
+    api_key = server.standin.generate_key()
+    # ... requests against server.base_url ...
+    server.shutdown()
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import json
+import random
+import re
+import secrets
+import sqlite3
+import string
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, List, Any, Callable, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from fees_mirror import FeeMirror
+from seed_import import SQLiteLoader, run_import
+from seed_validate import SEED_DIR
+
+API_PREFIX = '/api:public/'
+
+GITHUB_BASE = 'https://github.com/AbdulmalikAlayande/xano-ai-hackathon'
+
+POSTMAN_COLLECTION = 'https://www.postman.com/nigerian-government-public-utilities-fees-api/' \
+    'nigerian-government-public-utilities-fees-api/request/59lkmbo/nigerian-government-fees-api' \
+    '?action=share&creator=27138464&ctx=documentation&active-environment=27138464-797a6ea6-1b25-4670-9850-669bb0a8ed79'
+
+# HTTP status for each Xano error code; accessdenied is served as 403, which
+# the endpoint test suite accepts alongside the 401 in API_DOCUMENTATION.md
+ERROR_STATUS = {
+    'ERROR_CODE_INPUT_ERROR': 400,
+    'ERROR_CODE_ACCESS_DENIED': 403,
+    'ERROR_CODE_NOT_FOUND': 404,
+    'ERROR_CODE_FATAL': 500
+}
+
+RATE_LIMIT_MESSAGE = 'Rate limit exceeded. Maximum 100 requests per hour. Please try again later.'
+
+# /fees/changes holds back rows written in the last minute (see apis/public/fees_changes.xs)
+CHANGES_SETTLE_MS = 60000
+
+FEE_COLUMNS = ['id', 'subcategory_id', 'source_id', 'name', 'amount', 'currency', 'service_type',
+               'payment_code', 'description', 'meta', 'created_at', 'updated_at']
+SUBCATEGORY_COLUMNS = ['id', 'category_id', 'name', 'slug', 'description', 'created_at', 'updated_at']
+CATEGORY_COLUMNS = ['id', 'name', 'slug', 'description', 'created_at', 'updated_at']
+SOURCE_COLUMNS = ['id', 'agency_id', 'name', 'url', 'document_ref', 'notes', 'created_at', 'updated_at']
+AGENCY_COLUMNS = ['id', 'name', 'slug', 'website', 'notes', 'created_at', 'updated_at']
+
+# The eval'd relationship names on /fees, /fees/batch and /fees/changes items
+NAME_COLUMNS = {
+    'category_name': 'category.name',
+    'category_slug': 'category.slug',
+    'agency_name': 'agency.name',
+    'agency_slug': 'agency.slug',
+    'subcategory_name': 'subcategory.name',
+    'source_name': 'source.name'
+}
+
+JOINS = [
+    ('subcategories AS subcategory', 'fees.subcategory_id = subcategory.id'),
+    ('categories AS category', 'subcategory.category_id = category.id'),
+    ('sources AS source', 'fees.source_id = source.id'),
+    ('agencies AS agency', 'source.agency_id = agency.id')
+]
+
+# The `allowed` lists passed to fees/fields by each endpoint
+LIST_FIELDS = FEE_COLUMNS + list(NAME_COLUMNS)
+DETAIL_FIELDS = FEE_COLUMNS + ['subcategory', 'source']
+COMPACT_FIELDS = ['id', 'name', 'amount', 'currency']
+
+
+class ApiError(Exception):
+    """An error response in Xano's {code, message} shape."""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = ERROR_STATUS[code]
+
+
+def input_error(message: str) -> ApiError:
+    return ApiError('ERROR_CODE_INPUT_ERROR', message)
+
+
+def access_denied(message: str) -> ApiError:
+    return ApiError('ERROR_CODE_ACCESS_DENIED', message)
+
+
+def read_input(params: Dict[str, Any], name: str, kind: str = 'text', default: Any = ...,
+               trim: bool = False, minimum: Optional[int] = None, maximum: Optional[int] = None) -> Any:
+    """
+    Read one input the way an endpoint's input block declares it.
+
+    Args:
+        params: Query string (and JSON body) parameters
+        name: Input name
+        kind: 'text', 'int', 'bool' or 'email'
+        default: Value when the input is absent; ... makes it required
+        trim: Apply the trim filter
+        minimum: min filter (smallest value, or shortest length for text)
+        maximum: max filter (largest value)
+
+    Raises:
+        ApiError: ERROR_CODE_INPUT_ERROR for a missing required input or a
+            value that fails its type or filters
+    """
+    raw = params.get(name)
+    if raw is None:
+        if default is ...:
+            raise input_error(f'Missing param: {name}')
+        return default
+
+    value = str(raw).strip() if trim else str(raw)
+    if kind == 'int':
+        try:
+            value = int(value)
+        except ValueError:
+            raise input_error(f'Invalid value for param: {name}. Expected an integer.')
+    elif kind == 'bool':
+        if value.lower() not in ('true', 'false', '1', '0', ''):
+            raise input_error(f'Invalid value for param: {name}. Expected a boolean.')
+        value = value.lower() in ('true', '1')
+    elif kind == 'email' and value and not re.match(r'^[^@\s]+@[^@\s]+\.[^@\s]+$', value):
+        raise input_error(f'Invalid value for param: {name}. Expected an email address.')
+
+    size = len(value) if kind == 'text' else value
+    if minimum is not None and size < minimum:
+        raise input_error(f'Value for param {name} must be at least {minimum}'
+                          + (' characters long.' if kind == 'text' else '.'))
+    if maximum is not None and size > maximum:
+        raise input_error(f'Value for param {name} must be at most {maximum}.')
+    return value
+
+
+def fee_fields(fields: Optional[str], compact: bool, allowed: List[str]) -> List[str]:
+    """The fields= projection, as functions/fee_fields.xs parses it ([] returns every field)."""
+    requested = [field.strip().lower() for field in (fields or '').split(',')]
+    selected = list(dict.fromkeys(field for field in requested if field))
+    unknown = [field for field in selected if field not in allowed]
+    if unknown:
+        raise input_error(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    if not selected and compact:
+        return list(COMPACT_FIELDS)
+    return selected
+
+
+def pick(record: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    return {key: value for key, value in record.items() if key in fields}
+
+
+def iso_timestamp(value: Optional[int]) -> Optional[str]:
+    """format_timestamp:"c" - ISO 8601 with the UTC offset."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value / 1000, timezone.utc).isoformat(timespec='seconds')
+
+
+def with_iso_timestamps(fee: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(fee, created_at=iso_timestamp(fee['created_at']), updated_at=iso_timestamp(fee['updated_at']))
+
+
+def encode_cursor(fee: Dict[str, Any]) -> str:
+    """meta.next_cursor: {c, n, id} of the last fee on the page, as urlsafe base64 JSON."""
+    position = json.dumps({'c': fee['category_name'], 'n': fee['name'], 'id': fee['id']}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Dict[str, Any]]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        return None
+    return position if isinstance(position, dict) and position.get('id') is not None else None
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class Catalog:
+    """
+    The seed catalog in an in-memory SQLite database, read by the endpoints
+    under one lock, plus a FeeMirror index for /fees/search.
+
+    Args:
+        seed_dir: Directory with the seed CSVs (or a generated catalog)
+        scale: Copies of the fee rows to load (see seed_import.py)
+    """
+
+    def __init__(self, seed_dir: str = SEED_DIR, scale: int = 1):
+        loader = SQLiteLoader(':memory:', round_trip_ms=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.summaries = run_import(loader, 1000, seed_dir, scale)
+        self.db = sqlite3.connect(':memory:', check_same_thread=False)
+        loader.db.backup(self.db)
+        loader.close()
+        self.lock = threading.Lock()
+
+        # The seed schema only timestamps fees; stamp the other tables with the
+        # load time, and cut fee timestamps to whole milliseconds so the
+        # /fees/changes cursor compares equal to them
+        loaded_at = now_ms()
+        for table in ('agencies', 'categories', 'sources', 'subcategories'):
+            self.db.execute(f'ALTER TABLE {table} ADD COLUMN created_at INTEGER')
+            self.db.execute(f'ALTER TABLE {table} ADD COLUMN updated_at INTEGER')
+            self.db.execute(f'UPDATE {table} SET created_at = ?, updated_at = ?', (loaded_at, loaded_at))
+        self.db.executescript('''
+            UPDATE fees SET created_at = CAST(created_at AS INTEGER), updated_at = CAST(updated_at AS INTEGER);
+            CREATE TABLE fee_tombstones (id INTEGER PRIMARY KEY, fee_id INTEGER, deleted_at INTEGER);
+            CREATE INDEX fees_subcategory_id_name ON fees (subcategory_id, name);
+            CREATE INDEX fees_updated_at_id ON fees (updated_at, id);
+        ''')
+        self.db.commit()
+
+        # catalog_stats, computed once: the stand-in catalog is read-only
+        count = lambda table: self.db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        last_update = self.db.execute('SELECT MAX(updated_at) FROM fees').fetchone()[0]
+        self.stats = {
+            'total_fees': count('fees'),
+            'total_categories': count('categories'),
+            'total_agencies': count('agencies'),
+            'total_subcategories': count('subcategories'),
+            'total_sources': count('sources'),
+            # Inner join: only fees with a valid subcategory link count
+            'category_fee_counts': {str(category_id): fee_count for category_id, fee_count in self.db.execute(
+                'SELECT subcategory.category_id, COUNT(*) FROM fees '
+                'JOIN subcategories AS subcategory ON fees.subcategory_id = subcategory.id '
+                'GROUP BY subcategory.category_id'
+            )},
+            'last_database_update': int(last_update) if last_update is not None else loaded_at
+        }
+
+        search_names = ['category_name', 'agency_name', 'subcategory_name', 'source_name']
+        self.search_index = FeeMirror(self.fees(search_names, left=True), cursor={})
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def fees(self, names: List[str], left: bool = False, where: str = '', params: tuple = (),
+             order: str = '', limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Fees joined to their subcategory, category, source and agency with
+        the given relationship names eval'd onto each row.
+
+        Args:
+            names: Keys of NAME_COLUMNS to add; the source and agency joins
+                are skipped when no name needs them
+            left: Left joins (keep fees with a missing relationship) instead of inner joins
+            where: SQL condition on the joined row
+            params: Parameters for `where`
+            order: ORDER BY expression
+            limit: Maximum rows
+            offset: Rows to skip
+        """
+        joins = JOINS if any(name.split('_')[0] in ('agency', 'source') for name in names) else JOINS[:2]
+        join = 'LEFT JOIN' if left else 'JOIN'
+        sql = 'SELECT ' + ', '.join([f'fees.{column}' for column in FEE_COLUMNS]
+                                    + [NAME_COLUMNS[name] for name in names]) + ' FROM fees ' \
+            + ' '.join(f'{join} {table} ON {condition}' for table, condition in joins) \
+            + (f' WHERE {where}' if where else '') + (f' ORDER BY {order}' if order else '') \
+            + (f' LIMIT {int(limit)} OFFSET {int(offset)}' if limit is not None else '')
+        return [self._fee(row, names) for row in self.query(sql, params)]
+
+    @staticmethod
+    def _fee(row: tuple, names: List[str]) -> Dict[str, Any]:
+        fee = dict(zip(FEE_COLUMNS + names, row))
+        fee['meta'] = json.loads(fee['meta']) if fee['meta'] else None
+        if fee['meta']:
+            # state_key only serves the state filter; the endpoints strip it from meta
+            fee['meta'].pop('state_key', None)
+        for column in ('created_at', 'updated_at'):
+            if fee[column] is not None:
+                fee[column] = int(fee[column])
+        return fee
+
+    def search(self, q: str, fuzzy: bool = False) -> List[Dict[str, Any]]:
+        return self.search_index.search(q, limit=20, fuzzy=fuzzy)
+
+
+class Clock:
+    """Wall clock that can be moved forward, to reach the end of a rate limit window without waiting."""
+
+    def __init__(self):
+        self.offset = 0.0
+
+    def __call__(self) -> float:
+        return time.time() + self.offset
+
+    def advance(self, seconds: float):
+        self.offset += seconds
+
+
+class RateLimiter:
+    """
+    Fixed-window request limit per API key, like redis.ratelimit in
+    functions/auth_api_key.xs: a key's first request opens a window of
+    `window_seconds`, every request increments the window's counter under
+    one lock (so concurrent requests cannot both see 99), and requests past
+    `limit` are refused until the window expires. limit=None disables it.
+
+    Args:
+        limit: Requests allowed per window (None for no limit)
+        window_seconds: Window length
+        clock: Returns the current time in seconds; replace it to move time forward in tests
+    """
+
+    def __init__(self, limit: Optional[int] = 100, window_seconds: float = 3600,
+                 clock: Callable[[], float] = time.time):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self._windows: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key_id: int) -> Tuple[bool, float]:
+        """Count one request; returns (allowed, start of the key's current window)."""
+        with self._lock:
+            now = self.clock()
+            window = self._windows.get(key_id)
+            if window is None or now >= window[0] + self.window_seconds:
+                window = self._windows[key_id] = [now, 0]
+            window[1] += 1
+            return self.limit is None or window[1] <= self.limit, window[0]
+
+    def window(self, key_id: int) -> Optional[Dict[str, float]]:
+        """{started_at, count, resets_at} of the key's current window, or None before its first request."""
+        with self._lock:
+            window = self._windows.get(key_id)
+            if window is None:
+                return None
+            return {'started_at': window[0], 'count': window[1], 'resets_at': window[0] + self.window_seconds}
+
+
+class LatencyProfile:
+    """
+    Delay added to every response: latency_ms plus a uniform jitter of up
+    to +/- jitter_ms, from a random generator seeded for reproducible runs.
+
+    Args:
+        latency_ms: Base delay
+        jitter_ms: Maximum deviation from the base delay
+        endpoints: Per-endpoint (latency_ms, jitter_ms) overrides, keyed like 'fees/search' or 'fees/{id}'
+        seed: Random seed (None for an unseeded generator)
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 endpoints: Optional[Dict[str, Tuple[float, float]]] = None, seed: Optional[int] = None):
+        self.default = (latency_ms, jitter_ms)
+        self.endpoints = endpoints or {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def parse_override(spec: str) -> Tuple[str, Tuple[float, float]]:
+        """Parse an --endpoint-latency value: ENDPOINT=MS or ENDPOINT=MS:JITTER_MS."""
+        endpoint, _, timing = spec.partition('=')
+        latency, _, jitter = timing.partition(':')
+        return endpoint.strip('/'), (float(latency), float(jitter or 0))
+
+    def delay(self, endpoint: str) -> float:
+        """Seconds to hold back one response from `endpoint`."""
+        latency_ms, jitter_ms = self.endpoints.get(endpoint, self.default)
+        if jitter_ms:
+            with self._lock:
+                latency_ms += self._rng.uniform(-jitter_ms, jitter_ms)
+        return max(0.0, latency_ms) / 1000
+
+
+class FeesStandIn:
+    """
+    The public endpoints, answered from a Catalog.
+
+    Args:
+        catalog: Catalog to serve (loads data/seed when not given)
+        api_keys: Keys accepted in addition to the ones api_key/generate creates
+        rate_limit: Requests per key per window (None disables the limit)
+        window_seconds: Rate limit window length
+        latency: Response delay profile
+        clock: Time source for the rate limit window (seconds)
+    """
+
+    ROUTES = [
+        ('GET', 'docs', 'docs'),
+        ('POST', 'api_key/generate', 'api_key_generate'),
+        ('GET', 'fees', 'fees'),
+        ('GET', 'fees/search', 'fees_search'),
+        ('GET', 'fees/batch', 'fees_batch'),
+        ('GET', 'fees/changes', 'fees_changes'),
+        ('GET', 'fees/{id}', 'fee_by_id'),
+        ('GET', 'categories', 'categories'),
+        ('GET', 'metadata', 'metadata')
+    ]
+
+    def __init__(self, catalog: Optional[Catalog] = None, api_keys: List[str] = (), rate_limit: Optional[int] = 100,
+                 window_seconds: float = 3600, latency: Optional[LatencyProfile] = None,
+                 clock: Callable[[], float] = time.time):
+        self.catalog = catalog or Catalog()
+        self.limiter = RateLimiter(rate_limit, window_seconds, clock)
+        self.latency = latency or LatencyProfile()
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._keys_lock = threading.Lock()
+        for key in api_keys:
+            self.add_key(key)
+
+    # ----- API keys -----
+
+    def add_key(self, key: str, user_email: Optional[str] = None) -> str:
+        """Register an active key (a row in api_keys)."""
+        with self._keys_lock:
+            created_at = now_ms()
+            self._keys[key] = {
+                'id': len(self._keys) + 1,
+                'key': key,
+                'user_email': user_email,
+                'created_at': created_at,
+                'is_active': True,
+                'request_count': 0,
+                'last_request_at': None,
+                'last_reset_at': None,
+                'window_request_count': None
+            }
+        return key
+
+    def generate_key(self, user_email: Optional[str] = None) -> str:
+        """A new nga_ key with 32 mixed-case alphanumeric characters, like api_key/generate."""
+        alphabet = string.ascii_letters + string.digits
+        while True:
+            suffix = ''.join(secrets.choice(alphabet) for _ in range(32))
+            if any(c.islower() for c in suffix) and any(c.isupper() for c in suffix) \
+                    and any(c.isdigit() for c in suffix):
+                return self.add_key('nga_' + suffix, user_email)
+
+    def key_record(self, key: str) -> Optional[Dict[str, Any]]:
+        """A copy of the key's api_keys row (request_count, last_request_at, ...)."""
+        with self._keys_lock:
+            record = self._keys.get(key)
+            return dict(record) if record else None
+
+    def authenticate(self, api_key: Optional[str]) -> Dict[str, Any]:
+        """functions/auth_api_key.xs: strip "Bearer ", look the key up, count it against the limit."""
+        if api_key is not None and api_key.startswith('Bearer '):
+            api_key = api_key.replace('Bearer ', '').strip()
+        if not api_key:
+            raise access_denied('Missing API Key. Please provide api_key query parameter.')
+
+        record = self._keys.get(api_key)
+        if record is None or not record['is_active']:
+            raise access_denied('Invalid or inactive API Key.')
+
+        # The window lives in the limiter; last_reset_at and
+        # window_request_count only move in auth_api_key's Redis-outage
+        # fallback, which the stand-in has no equivalent of
+        allowed, _ = self.limiter.hit(record['id'])
+        if not allowed:
+            raise access_denied(RATE_LIMIT_MESSAGE)
+
+        with self._keys_lock:
+            record['request_count'] += 1
+            record['last_request_at'] = now_ms()
+        return record
+
+    # ----- Dispatch -----
+
+    def route(self, method: str, path: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """(handler name, path inputs) for a request path below /api:public/, or (None, {})."""
+        endpoint = path[len(API_PREFIX):].strip('/') if path.startswith(API_PREFIX) else None
+        for route_method, pattern, handler in self.ROUTES:
+            if route_method != method or endpoint is None:
+                continue
+            if pattern == endpoint:
+                return handler, {}
+            if pattern == 'fees/{id}' and re.fullmatch(r'fees/[^/]+', endpoint):
+                return handler, {'id': endpoint.split('/')[1]}
+        return None, {}
+
+    def handle(self, method: str, path: str, params: Dict[str, Any]) -> Tuple[int, Any]:
+        """Answer one request: returns (HTTP status, JSON body)."""
+        handler, path_params = self.route(method, path)
+        if handler is None:
+            return 404, {'code': 'ERROR_CODE_NOT_FOUND', 'message': 'Unable to locate request.'}
+
+        endpoint = next(pattern for _, pattern, name in self.ROUTES if name == handler)
+        time.sleep(self.latency.delay(endpoint))
+        try:
+            return 200, getattr(self, handler)({**params, **path_params})
+        except ApiError as e:
+            return e.status, {'code': e.code, 'message': e.message}
+        except Exception as e:
+            return 500, {'code': 'ERROR_CODE_FATAL', 'message': str(e)}
+
+    # ----- Endpoints -----
+
+    def docs(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET /docs (apis/public/docs.xs)"""
+        return {
+            'repository': GITHUB_BASE,
+            'main_documentation': {
+                'api_reference': GITHUB_BASE + '/blob/main/API_DOCUMENTATION.md',
+                'quick_start': GITHUB_BASE + '/blob/main/QUICK_START.md',
+                'data_sources': GITHUB_BASE + '/blob/main/DATA_SOURCES.md',
+                'readme': GITHUB_BASE + '/blob/main/README.md'
+            },
+            'code_examples': {
+                'javascript': GITHUB_BASE + '/blob/main/examples/javascript-example.js',
+                'python': GITHUB_BASE + '/blob/main/examples/python-example.py',
+                'curl': GITHUB_BASE + '/blob/main/examples/curl-examples.sh'
+            },
+            'raw_links': {
+                'api_reference': GITHUB_BASE + '/raw/main/API_DOCUMENTATION.md',
+                'quick_start': GITHUB_BASE + '/raw/main/QUICK_START.md',
+                'data_sources': GITHUB_BASE + '/raw/main/DATA_SOURCES.md',
+                'readme': GITHUB_BASE + '/raw/main/README.md',
+                'javascript': GITHUB_BASE + '/raw/main/examples/javascript-example.js',
+                'python': GITHUB_BASE + '/raw/main/examples/python-example.py',
+                'curl': GITHUB_BASE + '/raw/main/examples/curl-examples.sh'
+            },
+            'postman_collection': POSTMAN_COLLECTION
+        }
+
+    def api_key_generate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /api_key/generate (apis/public/api_key_generate.xs)"""
+        user_email = read_input(params, 'user_email', 'email', default=None)
+        return {
+            'success': True,
+            'api_key': self.generate_key(user_email),
+            'message': 'API key generated successfully. Please save this key as it provides access to the API.'
+        }
+
+    def fees(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET /fees (apis/public/fees.xs)"""
+        category = read_input(params, 'category', default=None, trim=True)
+        state = read_input(params, 'state', default=None, trim=True)
+        search = read_input(params, 'search', default=None, trim=True)
+        page = read_input(params, 'page', 'int', default=1, minimum=1)
+        per_page = read_input(params, 'per_page', 'int', default=20, minimum=1, maximum=100)
+        cursor = read_input(params, 'cursor', default=None, trim=True)
+        include_total = read_input(params, 'include_total', 'bool', default=True)
+        fields = read_input(params, 'fields', default=None, trim=True)
+        compact = read_input(params, 'compact', 'bool', default=False)
+        self.authenticate(read_input(params, 'api_key'))
+
+        if category and not self.catalog.query('SELECT 1 FROM categories WHERE slug = ? OR name = ?',
+                                               (category, category)):
+            raise input_error('Category not found')
+
+        after = None
+        if cursor:
+            after = decode_cursor(cursor)
+            if after is None:
+                raise input_error('Invalid cursor. Pass meta.next_cursor from a previous /fees response.')
+            page = 1
+
+        selected = fee_fields(fields, compact, LIST_FIELDS)
+        join_sources = not selected or any(field in selected for field in ('agency_name', 'agency_slug', 'source_name'))
+        format_timestamps = not selected or 'created_at' in selected or 'updated_at' in selected
+
+        clauses, values = [], []
+        if search:
+            clauses.append('(instr(lower(fees.name), lower(?)) > 0 OR instr(lower(fees.description), lower(?)) > 0)')
+            values += [search, search]
+        if category:
+            # Resolved to subcategory ids first, as fees.xs does
+            subcategory_ids = [row[0] for row in self.catalog.query(
+                'SELECT subcategories.id FROM subcategories JOIN categories ON subcategories.category_id = categories.id '
+                'WHERE lower(categories.slug) = lower(?) OR lower(categories.name) = lower(?)', (category, category)
+            )]
+            clauses.append(f"fees.subcategory_id IN ({', '.join('?' * len(subcategory_ids)) or 'NULL'})")
+            values += subcategory_ids
+        if state:
+            clauses.append("json_extract(fees.meta, '$.state_key') = ?")
+            values.append(state.lower())
+        if after:
+            clauses.append('category.name >= ? AND (category.name > ? OR fees.name > ? '
+                           'OR (fees.name = ? AND fees.id > ?))')
+            values += [after.get('c'), after.get('c'), after.get('n'), after.get('n'), after['id']]
+
+        names = list(NAME_COLUMNS) if join_sources else ['category_name', 'category_slug', 'subcategory_name']
+        where = ' AND '.join(clauses)
+        offset = (page - 1) * per_page
+        # One extra row tells whether there is a next page
+        rows = self.catalog.fees(names, where=where, params=tuple(values),
+                                 order='category.name, fees.name, fees.id', limit=per_page + 1, offset=offset)
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+
+        total = None
+        if include_total:
+            total = self.catalog.query(
+                'SELECT COUNT(*) FROM (' + 'SELECT fees.id FROM fees ' + ' '.join(
+                    f'JOIN {table} ON {condition}' for table, condition in (JOINS if join_sources else JOINS[:2])
+                ) + (f' WHERE {where}' if where else '') + ')', tuple(values)
+            )[0][0]
+
+        items = [with_iso_timestamps(fee) for fee in rows] if format_timestamps else rows
+        if selected:
+            items = [pick(fee, selected) for fee in items]
+
+        next_cursor = encode_cursor(rows[-1]) if has_next and rows else None
+        return {
+            'items': items,
+            'meta': {
+                'total': total,
+                'limit': per_page,
+                'offset': offset,
+                'page': page,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
+            }
+        }
+
+    def fee_by_id(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET /fees/{id} (apis/public/fees_by_id.xs)"""
+        fee_id = read_input(params, 'id', 'int', minimum=1)
+        fields = read_input(params, 'fields', default=None, trim=True)
+        compact = read_input(params, 'compact', 'bool', default=False)
+        self.authenticate(read_input(params, 'api_key'))
+        selected = fee_fields(fields, compact, DETAIL_FIELDS)
+
+        # The relationship joins only feed the nested subcategory and source
+        join_relationships = not selected or bool({'subcategory', 'source'} & set(selected))
+        tables = [('fees', FEE_COLUMNS)]
+        if join_relationships:
+            tables += [('subcategory', SUBCATEGORY_COLUMNS), ('category', CATEGORY_COLUMNS),
+                       ('source', SOURCE_COLUMNS), ('agency', AGENCY_COLUMNS)]
+        rows = self.catalog.query(
+            'SELECT ' + ', '.join(f'{alias}.{column}' for alias, columns in tables for column in columns)
+            + ' FROM fees ' + ' '.join(f'LEFT JOIN {table} ON {condition}'
+                                       for table, condition in (JOINS if join_relationships else []))
+            + ' WHERE fees.id = ?', (fee_id,)
+        )
+        if not rows:
+            raise ApiError('ERROR_CODE_NOT_FOUND', f'Fee not found with ID {fee_id}')
+
+        records, offset = [], 0
+        for _, columns in tables:
+            values = rows[0][offset:offset + len(columns)]
+            records.append(dict(zip(columns, values)) if values[0] is not None else None)
+            offset += len(columns)
+        fee, subcategory, category, source, agency = records + [None] * (5 - len(records))
+        fee = Catalog._fee(tuple(fee[column] for column in FEE_COLUMNS), [])
+
+        # A key is present when the fee (or subcategory/source) references it,
+        # null when the referenced row does not exist
+        if fee['subcategory_id'] is not None and (not selected or 'subcategory' in selected):
+            if subcategory is not None and subcategory['category_id'] is not None:
+                subcategory['category'] = category
+            fee['subcategory'] = subcategory
+        if fee['source_id'] is not None and (not selected or 'source' in selected):
+            if source is not None and source['agency_id'] is not None:
+                source['agency'] = agency
+            fee['source'] = source
+        return pick(fee, selected) if selected else fee
+
+    def fees_search(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """GET /fees/search (apis/public/fees_search.xs)"""
+        q = read_input(params, 'q', trim=True, minimum=2)
+        mode = read_input(params, 'mode', default='exact', trim=True).lower()
+        self.authenticate(read_input(params, 'api_key'))
+
+        if mode not in ('exact', 'fuzzy'):
+            raise input_error("Search mode must be 'exact' or 'fuzzy'")
+        return self.catalog.search(q, fuzzy=mode == 'fuzzy')
+
+    def fees_batch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET /fees/batch (apis/public/fees_batch.xs)"""
+        ids_param = read_input(params, 'ids', trim=True)
+        fields = read_input(params, 'fields', default=None, trim=True)
+        compact = read_input(params, 'compact', 'bool', default=False)
+        self.authenticate(read_input(params, 'api_key'))
+
+        ids = [int(value) if re.fullmatch(r'-?\d+', value.strip()) else None
+               for value in ids_param.split(',') if value.strip()]
+        if not 0 < len(ids) <= 100:
+            raise input_error("Parameter 'ids' must list between 1 and 100 fee IDs")
+        if any(fee_id is None or fee_id < 1 for fee_id in ids):
+            raise input_error("Parameter 'ids' must be a comma-separated list of positive integers")
+        selected = fee_fields(fields, compact, LIST_FIELDS)
+
+        unique_ids = list(dict.fromkeys(ids))
+        fees = self.catalog.fees(list(NAME_COLUMNS), left=True,
+                                 where=f"fees.id IN ({', '.join('?' * len(unique_ids))})", params=tuple(unique_ids))
+        fees_by_id = {fee['id']: with_iso_timestamps(fee) for fee in fees}
+
+        items = [fees_by_id.get(fee_id, {'id': fee_id, 'not_found': True}) for fee_id in ids]
+        if selected:
+            items = [item if item.get('not_found') else pick(item, selected) for item in items]
+        missing_ids = [fee_id for fee_id in ids if fee_id not in fees_by_id]
+        return {
+            'items': items,
+            'meta': {
+                'requested': len(ids),
+                'found': len(ids) - len(missing_ids),
+                'not_found': list(dict.fromkeys(missing_ids))
+            }
+        }
+
+    def fees_changes(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET /fees/changes (apis/public/fees_changes.xs)"""
+        since = read_input(params, 'since', 'int', default=0, minimum=0)
+        after_id = read_input(params, 'after_id', 'int', default=0, minimum=0)
+        deleted_after = read_input(params, 'deleted_after', 'int', default=0, minimum=0)
+        limit = read_input(params, 'limit', 'int', default=100, minimum=1, maximum=500)
+        self.authenticate(read_input(params, 'api_key'))
+
+        # Rows from the last CHANGES_SETTLE_MS are held back, and one row past
+        # the limit is read for has_more
+        settled_before = now_ms() - CHANGES_SETTLE_MS
+        changed = self.catalog.fees(
+            list(NAME_COLUMNS), left=True,
+            where='fees.updated_at >= ? AND (fees.updated_at > ? OR fees.id > ?) AND fees.updated_at < ?',
+            params=(since, since, after_id, settled_before), order='fees.updated_at, fees.id', limit=limit + 1
+        )
+        tombstones = self.catalog.query(
+            f'SELECT id, fee_id FROM fee_tombstones WHERE id > ? AND deleted_at < ? ORDER BY id LIMIT {int(limit) + 1}',
+            (deleted_after, settled_before)
+        )
+        has_more = len(changed) > limit or len(tombstones) > limit
+        changed, tombstones = changed[:limit], tombstones[:limit]
+
+        next_cursor = {'since': since, 'after_id': after_id, 'deleted_after': deleted_after}
+        if changed:
+            next_cursor.update(since=changed[-1]['updated_at'], after_id=changed[-1]['id'])
+        if tombstones:
+            next_cursor['deleted_after'] = tombstones[-1][0]
+        return {
+            'items': [with_iso_timestamps(fee) for fee in changed],
+            'deleted': [fee_id for _, fee_id in tombstones],
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        }
+
+    def categories(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """GET /categories (apis/public/categories.xs)"""
+        self.authenticate(read_input(params, 'api_key'))
+        counts = self.catalog.stats['category_fee_counts']
+        return [
+            {'id': category_id, 'display_name': name, 'description': description,
+             'fee_count': counts.get(str(category_id), 0)}
+            for category_id, name, description in self.catalog.query('SELECT id, name, description FROM categories ORDER BY id')
+        ]
+
+    def metadata(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET /metadata (apis/public/metadata.xs)"""
+        self.authenticate(read_input(params, 'api_key'))
+        stats = self.catalog.stats
+        return {
+            'api_version': '1.0.0',
+            'statistics': {key: value for key, value in stats.items() if key.startswith('total_')},
+            'last_database_update': stats['last_database_update'],
+            'generated_at': now_ms(),
+            'documentation': {
+                'repository': GITHUB_BASE,
+                'api_reference': GITHUB_BASE + '/blob/main/API_DOCUMENTATION.md',
+                'quick_start': GITHUB_BASE + '/blob/main/QUICK_START.md',
+                'data_sources': GITHUB_BASE + '/blob/main/DATA_SOURCES.md',
+                'readme': GITHUB_BASE + '/blob/main/README.md',
+                'examples': {
+                    'javascript': GITHUB_BASE + '/blob/main/examples/javascript-example.js',
+                    'python': GITHUB_BASE + '/blob/main/examples/python-example.py',
+                    'curl': GITHUB_BASE + '/blob/main/examples/curl-examples.sh'
+                }
+            }
+        }
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Keep-alive capable handler that passes each request to the server's FeesStandIn"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40ms to every response on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str):
+        url = urlsplit(self.path)
+        params: Dict[str, Any] = {name: values[0] for name, values in parse_qs(url.query, keep_blank_values=True).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                body = None
+            if isinstance(body, dict):
+                params.update((name, value) for name, value in body.items() if value is not None)
+
+        status, payload = self.server.standin.handle(method, url.path, params)
+        encoded = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(standin: Optional[FeesStandIn] = None, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the stand-in in a background thread (port 0 picks a free port).
+
+    The server's `standin` attribute is the FeesStandIn it serves and
+    `base_url` its /api:public base URL; call shutdown() to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    server.standin = standin or FeesStandIn()
+    server.base_url = f'http://{host}:{server.server_address[1]}/api:public'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the public API locally from the seed CSVs')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port (default: 8080)')
+    parser.add_argument('--seed-dir', default=SEED_DIR, help='Directory with the seed CSVs')
+    parser.add_argument('--scale', type=int, default=1, help='Copies of the fee rows to load (default: 1)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay added to every response (default: 0)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Maximum +/- deviation from the delay (default: 0)')
+    parser.add_argument('--endpoint-latency', action='append', default=[], metavar='ENDPOINT=MS[:JITTER_MS]',
+                        help='Delay for one endpoint, e.g. fees/search=250:50 (repeatable)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for the jitter (default: unseeded)')
+    parser.add_argument('--api-key', action='append', default=[], help='Key to accept besides generated ones (repeatable)')
+    parser.add_argument('--rate-limit', type=int, default=100, help='Requests per key per window, 0 for none (default: 100)')
+    parser.add_argument('--window-seconds', type=float, default=3600, help='Rate limit window (default: 3600)')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    catalog = Catalog(args.seed_dir, args.scale)
+    latency = LatencyProfile(args.latency_ms, args.jitter_ms,
+                             dict(LatencyProfile.parse_override(spec) for spec in args.endpoint_latency), args.seed)
+    standin = FeesStandIn(catalog, args.api_key, args.rate_limit or None, args.window_seconds, latency)
+    rejected = sum(len(summary['rejected']) for summary in catalog.summaries)
+    print(f"Loaded {catalog.stats['total_fees']} fees in {catalog.stats['total_categories']} categories "
+          f"from {args.seed_dir} in {time.perf_counter() - started:.2f}s ({rejected} seed rows rejected)")
+
+    server = start_server(standin, args.host, args.port)
+    limit = f'{args.rate_limit} requests per {args.window_seconds:g}s' if args.rate_limit else 'no rate limit'
+    print(f"Serving {server.base_url} ({args.latency_ms:g}ms +/- {args.jitter_ms:g}ms, {limit})")
+    for key in args.api_key:
+        print(f"  API key: {key}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
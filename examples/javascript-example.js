@@ -43,6 +43,8 @@ async function getFees(options = {}) {
     if (options.category) params.append('category', options.category);
     if (options.state) params.append('state', options.state);
     if (options.search) params.append('search', options.search);
+    if (options.cursor) params.append('cursor', options.cursor);
+    if (options.includeTotal === false) params.append('include_total', 'false');
     
     const response = await fetch(`${BASE_URL}/fees?${params}`);
     const data = await handleResponse(response);
@@ -199,21 +201,22 @@ async function getMetadata() {
 async function getAllFees(options = {}) {
   try {
     let allFees = [];
-    let page = 1;
+    let cursor = null;
     let hasMore = true;
     
     while (hasMore) {
       const result = await getFees({
         ...options,
-        page: page,
+        cursor: cursor,
+        includeTotal: false,
         perPage: 100 // Maximum per page
       });
       
       allFees = allFees.concat(result.items);
       
-      // Check if there are more pages
-      hasMore = page < result.meta.pageTotal;
-      page++;
+      // Continue from the last fee returned until the server reports no more
+      cursor = result.meta.next_cursor;
+      hasMore = Boolean(cursor);
       
       // Add a small delay to avoid rate limiting (when implemented)
       if (hasMore) {
@@ -4,6 +4,9 @@ Nigerian Government Fees API - Python Examples
 This file contains complete examples for all 7 API endpoints using the requests library.
 Replace 'nga_your_api_key_here' with your actual API key.
 
+All examples share one pooled, keep-alive session (see fees_client.py), so
+repeated calls reuse open connections instead of reconnecting every time.
+
 Installation:
     pip install requests
 """
@@ -12,40 +15,22 @@ import requests
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 
+from fees_cache import MemoryCache
+from fees_client import MAX_BATCH_IDS, FeesClient, TokenBucket, handle_response, page_count, projection_params
+from fees_mirror import FeeMirror
+
 BASE_URL = 'https://xmlb-8xh6-ww1h.n7e.xano.io/api:public'
 API_KEY = 'nga_your_api_key_here'  # Replace with your actual API key
 
-
-def handle_response(response: requests.Response) -> Dict[str, Any]:
-    """
-    Helper function to handle API responses and errors.
-    
-    Args:
-        response: requests.Response object
-        
-    Returns:
-        dict: Parsed JSON response
-        
-    Raises:
-        requests.exceptions.HTTPError: For HTTP errors
-        ValueError: For API-level errors
-    """
-    try:
-        data = response.json()
-    except ValueError:
-        # If response is not JSON, raise HTTP error
-        response.raise_for_status()
-        return {}
-    
-    # Check for API-level errors
-    if 'code' in data and data['code'].startswith('ERROR_CODE'):
-        error_msg = data.get('message', 'Unknown API error')
-        raise ValueError(f"{data['code']}: {error_msg}")
-    
-    # Check for HTTP errors
-    response.raise_for_status()
-    
-    return data
+# Shared pooled client used by every example below; the token bucket keeps
+# authenticated calls within the 100 requests/hour budget of each key, and the
+# response cache answers repeated lookups without spending that budget
+client = FeesClient(
+    BASE_URL,
+    API_KEY,
+    rate_limiter=TokenBucket.per_hour(),
+    cache=MemoryCache(ttl=600)
+)
 
 
 def get_fees(
@@ -53,7 +38,11 @@ def get_fees(
     state: Optional[str] = None,
     search: Optional[str] = None,
     page: int = 1,
-    per_page: int = 20
+    per_page: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[List[str]] = None,
+    compact: bool = False
 ) -> Dict[str, Any]:
     """
     Example 1: GET /fees
@@ -63,16 +52,19 @@ def get_fees(
         category: Filter by category name or slug
         state: Filter by state
         search: Search term to match against fee name and description
-        page: Page number (default: 1)
+        page: Page number (default: 1, ignored when cursor is set)
         per_page: Number of results per page (default: 20, max: 100)
+        cursor: meta.next_cursor from the previous page (keyset pagination)
+        include_total: Count the total matching fees (default: True)
+        fields: Only return these fields (e.g. ['id', 'name', 'amount'])
+        compact: Return only id, name, amount and currency (default: False)
         
     Returns:
         dict: Response containing items and meta information
     """
     params = {
         'page': page,
-        'per_page': per_page,
-        'api_key': API_KEY
+        'per_page': per_page
     }
     
     # Add optional filters
@@ -82,13 +74,21 @@ def get_fees(
         params['state'] = state
     if search:
         params['search'] = search
+    if cursor:
+        params['cursor'] = cursor
+    if not include_total:
+        params['include_total'] = 'false'
+    params.update(projection_params(fields, compact))
     
     try:
-        response = requests.get(f'{BASE_URL}/fees', params=params)
+        response = client.get('/fees', params=params)
         data = handle_response(response)
         
-        print(f"Retrieved {len(data['items'])} fees (Page {data['meta']['page']} of {data['meta'].get('pageTotal', 1)})")
-        print(f"Total: {data['meta']['total']} fees")
+        if data['meta'].get('total') is not None:
+            print(f"Retrieved {len(data['items'])} fees (Page {data['meta']['page']} of {page_count(data['meta'])})")
+            print(f"Total: {data['meta']['total']} fees")
+        else:
+            print(f"Retrieved {len(data['items'])} fees (more: {data['meta'].get('has_more', False)})")
         
         return data
     except requests.exceptions.RequestException as e:
@@ -100,35 +100,37 @@ def get_fees(
 # get_fees()  # Get first page with default settings
 # get_fees(category='identity', page=1, per_page=10)
 # get_fees(search='NIN', page=1)
+# get_fees(cursor=get_fees(per_page=10)['meta']['next_cursor'], per_page=10)
+# get_fees(per_page=100, compact=True)  # id, name, amount, currency only
 
 
-def get_fee_by_id(fee_id: int) -> Dict[str, Any]:
+def get_fee_by_id(
+    fee_id: int,
+    fields: Optional[List[str]] = None,
+    compact: bool = False
+) -> Dict[str, Any]:
     """
     Example 2: GET /fees/{id}
     Retrieve a single fee by ID with all relationships.
     
     Args:
         fee_id: The fee ID
+        fields: Only return these fields ('subcategory' and 'source' are the nested records)
+        compact: Return only id, name, amount and currency (default: False)
         
     Returns:
         dict: Fee object with nested relationships
+        
+    Raises:
+        ValueError: If no fee exists with this ID (ERROR_CODE_NOT_FOUND)
     """
-    params = {
-        'api_key': API_KEY
-    }
-    
     try:
-        response = requests.get(f'{BASE_URL}/fees/{fee_id}', params=params)
-        
-        # Handle 404 specifically
-        if response.status_code == 404:
-            error = response.json()
-            raise ValueError(f"Fee not found: {error.get('message', 'Unknown error')}")
-        
-        data = handle_response(response)
+        # Served from the response cache until it expires or the catalog changes
+        data = client.get_json(f'/fees/{fee_id}', params=projection_params(fields, compact))
         
-        print(f"Fee: {data['name']}")
-        print(f"Amount: {data['amount']} {data['currency']}")
+        print(f"Fee: {data.get('name', 'N/A')}")
+        if 'amount' in data:
+            print(f"Amount: {data['amount']} {data.get('currency', '')}")
         
         if 'subcategory' in data and data['subcategory']:
             subcat = data['subcategory']
@@ -149,15 +151,64 @@ def get_fee_by_id(fee_id: int) -> Dict[str, Any]:
 
 # Usage example:
 # get_fee_by_id(1)
+# get_fee_by_id(1, fields=['id', 'name', 'amount', 'source'])
+
+
+def get_fees_by_ids(
+    fee_ids: List[int],
+    fields: Optional[List[str]] = None,
+    compact: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Example 2b: GET /fees/batch
+    Retrieve many fees by ID, up to 100 per request, in one joined query each.
+    
+    Every batch counts as a single request against the key's hourly budget,
+    so pricing a 30-item basket costs one request instead of 30.
+    
+    Args:
+        fee_ids: Fee IDs to fetch (split into batches of 100)
+        fields: Only return these fields (e.g. ['id', 'name', 'amount'])
+        compact: Return only id, name, amount and currency (default: False)
+        
+    Returns:
+        list: One entry per requested ID in the same order; IDs without a
+            fee come back as {'id': ..., 'not_found': True}
+    """
+    results = []
+    
+    try:
+        for start in range(0, len(fee_ids), MAX_BATCH_IDS):
+            batch = fee_ids[start:start + MAX_BATCH_IDS]
+            params = {'ids': ','.join(str(fee_id) for fee_id in batch)}
+            params.update(projection_params(fields, compact))
+            
+            data = handle_response(client.get('/fees/batch', params=params))
+            results.extend(data['items'])
+            
+            if data['meta']['not_found']:
+                print(f"Not found: {data['meta']['not_found']}")
+        
+        print(f"Retrieved {sum(1 for item in results if not item.get('not_found'))} of {len(fee_ids)} fees")
+        return results
+    except requests.exceptions.RequestException as e:
+        print(f'Error fetching fees: {e}')
+        raise
+
 
+# Usage example:
+# basket = get_fees_by_ids([20, 1, 5], compact=True)
+# total = sum(fee['amount'] or 0 for fee in basket if not fee.get('not_found'))
 
-def search_fees(query: str) -> List[Dict[str, Any]]:
+
+def search_fees(query: str, fuzzy: bool = False) -> List[Dict[str, Any]]:
     """
     Example 3: GET /fees/search
     Search fees by name and description.
     
     Args:
         query: Search query (minimum 2 characters)
+        fuzzy: Tolerate typos and known synonyms (mode=fuzzy)
         
     Returns:
         list: Array of fee objects matching the search
@@ -167,12 +218,13 @@ def search_fees(query: str) -> List[Dict[str, Any]]:
         raise ValueError('Search query must be at least 2 characters long')
     
     params = {
-        'q': query.strip(),
-        'api_key': API_KEY
+        'q': query.strip()
     }
+    if fuzzy:
+        params['mode'] = 'fuzzy'
     
     try:
-        response = requests.get(f'{BASE_URL}/fees/search', params=params)
+        response = client.get('/fees/search', params=params)
         data = handle_response(response)
         
         print(f"Found {len(data)} fees matching \"{query}\"")
@@ -187,6 +239,7 @@ def search_fees(query: str) -> List[Dict[str, Any]]:
 # search_fees('NIN')
 # search_fees('passport')
 # search_fees('JAMB')
+# search_fees('pasport', fuzzy=True)
 
 
 def get_categories() -> List[Dict[str, Any]]:
@@ -197,13 +250,9 @@ def get_categories() -> List[Dict[str, Any]]:
     Returns:
         list: Array of category objects with fee_count
     """
-    params = {
-        'api_key': API_KEY
-    }
-    
     try:
-        response = requests.get(f'{BASE_URL}/categories', params=params)
-        data = handle_response(response)
+        # Served from the response cache until it expires or the catalog changes
+        data = client.get_json('/categories')
         
         print(f"Found {len(data)} categories:")
         for category in data:
@@ -227,12 +276,8 @@ def get_metadata() -> Dict[str, Any]:
     Returns:
         dict: Metadata object with statistics and version information
     """
-    params = {
-        'api_key': API_KEY
-    }
-    
     try:
-        response = requests.get(f'{BASE_URL}/metadata', params=params)
+        response = client.get('/metadata')
         data = handle_response(response)
         
         print('API Metadata:')
@@ -255,43 +300,78 @@ def get_metadata() -> Dict[str, Any]:
 # get_metadata()
 
 
-def get_all_fees(options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Advanced Example: Inspect the client-side response cache.
+    
+    Returns:
+        dict: Hit/miss/eviction counters for the shared client's cache
+    """
+    stats = client.cache.stats.as_dict()
+    
+    print('Response Cache:')
+    print(f"  Entries: {len(client.cache)}")
+    print(f"  Hits: {stats['hits']}  Misses: {stats['misses']}  Hit Rate: {stats['hit_rate']:.0%}")
+    print(f"  Evictions: {stats['evictions']}  Invalidations: {stats['invalidations']}")
+    
+    return stats
+
+
+# Usage example:
+# get_categories(); get_categories(); get_cache_stats()
+
+
+def get_all_fees(
+    options: Optional[Dict[str, Any]] = None,
+    parallel: bool = False,
+    max_workers: int = 4
+) -> List[Dict[str, Any]]:
     """
     Advanced Example: Get all fees with pagination.
     
+    By default the pages are walked with meta.next_cursor and no total
+    count, so every page costs the server the same however deep it is. In
+    parallel mode page 1 is fetched first to read meta.total, then the
+    remaining pages are fetched concurrently through a bounded thread pool.
+    Either way every request takes a token from the client's rate limiter,
+    so a full dump stays inside the 100 requests/hour key budget.
+    
     Args:
         options: Optional dictionary with category, state, search filters
+        parallel: Fetch pages 2..N concurrently (default: False)
+        max_workers: Maximum pages in flight at once in parallel mode
         
     Returns:
-        list: All fees matching the filters
+        list: All fees matching the filters, in the server's sort order
     """
     if options is None:
         options = {}
     
+    if parallel:
+        filters = {key: options[key] for key in ('category', 'state', 'search') if options.get(key)}
+        all_fees = client.get_all_pages('/fees', params=filters, per_page=100, max_workers=max_workers)
+        print(f"Retrieved all {len(all_fees)} fees")
+        return all_fees
+    
     all_fees = []
-    page = 1
-    has_more = True
+    cursor = None
     
-    while has_more:
+    while True:
         result = get_fees(
             category=options.get('category'),
             state=options.get('state'),
             search=options.get('search'),
-            page=page,
-            per_page=100  # Maximum per page
+            per_page=100,  # Maximum per page
+            cursor=cursor,
+            include_total=False
         )
         
         all_fees.extend(result['items'])
         
-        # Check if there are more pages
-        total_pages = result['meta'].get('pageTotal', 1)
-        has_more = page < total_pages
-        page += 1
-        
-        # Add a small delay to avoid rate limiting (when implemented)
-        if has_more:
-            import time
-            time.sleep(0.1)
+        # Continue from the last fee returned until the server reports no more
+        cursor = result['meta'].get('next_cursor')
+        if not cursor:
+            break
     
     print(f"Retrieved all {len(all_fees)} fees")
     return all_fees
@@ -299,6 +379,36 @@ def get_all_fees(options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any
 
 # Usage example:
 # get_all_fees({'category': 'identity'})
+# get_all_fees(parallel=True, max_workers=4)
+
+
+def sync_fee_mirror(mirror: Optional[FeeMirror] = None) -> FeeMirror:
+    """
+    Advanced Example: Keep a local copy of the catalog up to date.
+    
+    The first call downloads every fee; later calls fetch only the fees
+    changed or deleted since the previous sync from GET /fees/changes.
+    
+    Args:
+        mirror: Mirror returned by an earlier call (None for a full download)
+        
+    Returns:
+        FeeMirror: The up-to-date mirror
+    """
+    if mirror is None:
+        mirror = FeeMirror.sync(client)
+        print(f"Downloaded {len(mirror)} fees")
+        return mirror
+    
+    summary = mirror.sync_changes(client)
+    print(f"Applied {summary['changed']} changes and {summary['deleted']} deletions "
+          f"in {summary['requests']} request(s); {len(mirror)} fees cached")
+    return mirror
+
+
+# Usage example:
+# mirror = sync_fee_mirror()
+# mirror = sync_fee_mirror(mirror)  # later: only the changes are fetched
 
 
 def get_fees_by_category(category_slug: str) -> Dict[str, Any]:
@@ -391,7 +501,7 @@ def get_docs():
         dict: Documentation links object
     """
     try:
-        response = requests.get(f'{BASE_URL}/docs')
+        response = client.get('/docs', auth=False)
         response.raise_for_status()
         data = response.json()
         
@@ -426,11 +536,7 @@ def generate_api_key(user_email=None):
         if user_email:
             body['user_email'] = user_email
         
-        response = requests.post(
-            f'{BASE_URL}/api_key/generate',
-            json=body,
-            headers={'Accept': 'application/json'}
-        )
+        response = client.post('/api_key/generate', json=body)
         response.raise_for_status()
         data = response.json()
         
@@ -0,0 +1,327 @@
+"""
+Nigerian Government Fees API - Synthetic Catalog Generator
+
+Writes a fee catalog of any size in the CSV schema seed_validate.py and
+seed_import.py read, for scale testing the fees.xs joins, fees_search.xs
+scans and categories.xs counts against more than the ~120 real seed fees:
+
+- agencies.csv, categories.csv, sources.csv (one fee schedule per agency)
+  and subcategories.csv, with parents named in agency_slug / category_slug
+  columns instead of the placeholder maps in functions/import_*.xs
+- one <category>_fees.csv per category, each fee naming its subcategory_slug
+  and source_name; fees are spread unevenly over subcategories (a few large,
+  many small), a share of them carry meta.state, and a few have N/A amounts,
+  USD amounts or commas in the description
+
+The same --seed always produces byte-identical files. Fees are written row by
+row as they are generated, so memory is bounded by the reference tables
+(hundreds of rows), not by --fees; 1m fees take roughly the same memory as 10k.
+
+The output directory can be passed as --seed-dir to seed_validate.py,
+seed_import.py and fees_standin.py.
+
+Run: python seed_generate.py --out catalog-100k [--fees 100k] [--subcategories 400] [--agencies 200] [--states 200] [--seed 42]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import re
+import resource
+import sys
+import time
+from itertools import accumulate, count as count_from, islice
+from typing import Dict, List, NamedTuple
+
+# Category -> (subcategory topics, fee services); topics are repeated per state to reach --subcategories
+THEMES = {
+    'Identity & Civil Registration': (
+        ['NIN Enrolment', 'Birth Registration', 'Death Registration', 'Marriage Certificate', 'Change of Name',
+         'Age Declaration'],
+        ['Enrolment', 'Modification of Name', 'Modification of Date of Birth', 'Reprint', 'Verification',
+         'Certified True Copy']),
+    'Immigration & Travel': (
+        ['Standard Passport', 'Official Passport', 'Residence Permit', 'Visa on Arrival', 'ECOWAS Travel Certificate'],
+        ['Application', 'Renewal', 'Replacement of Lost Passport', 'Data Page Correction', 'Expedited Processing']),
+    'Education & Examinations': (
+        ['UTME Registration', 'SSCE Internal', 'SSCE External', 'Polytechnic Admission', 'College of Education',
+         'University Tuition', 'Transcript Services'],
+        ['Registration', 'Late Registration', 'Result Verification', 'Change of Institution', 'Acceptance Fee',
+         'Transcript Request', 'Certificate Collection']),
+    'Electricity & Utilities': (
+        ['Prepaid Metering', 'Band A Tariff', 'Band B Tariff', 'Water Connection', 'Sewerage Services'],
+        ['Meter Installation', 'Reconnection', 'Tariff per kWh', 'New Connection', 'Meter Bypass Penalty']),
+    'Business & Corporate Affairs': (
+        ['Business Name Registration', 'Company Incorporation', 'Incorporated Trustees', 'Annual Returns',
+         'Trademark Registration'],
+        ['Name Availability Search', 'Registration', 'Late Filing Penalty', 'Change of Directors',
+         'Certified Copy of Documents']),
+    'Transport & Vehicle Licensing': (
+        ['Driver\'s Licence', 'Vehicle Registration', 'Roadworthiness Certificate', 'Number Plates',
+         'Commercial Vehicle Permit'],
+        ['Issuance', 'Renewal', 'Replacement', 'Change of Ownership', 'Inspection']),
+    'Land & Property': (
+        ['Certificate of Occupancy', 'Building Approval', 'Land Survey', 'Governor\'s Consent', 'Ground Rent'],
+        ['Application', 'Processing', 'Registration', 'Search Fee', 'Penalty for Late Payment']),
+    'Health Services': (
+        ['Health Insurance', 'Medical Certificate of Fitness', 'Premises Registration', 'Drug Registration'],
+        ['Registration', 'Annual Premium', 'Inspection', 'Renewal', 'Certificate Issuance']),
+    'Taxation & Revenue': (
+        ['Personal Income Tax', 'Tax Clearance Certificate', 'Withholding Tax', 'Stamp Duties', 'Development Levy'],
+        ['Assessment', 'Clearance Certificate', 'Late Filing Penalty', 'Stamping', 'Annual Levy']),
+    'Courts & Justice': (
+        ['High Court Filing', 'Magistrate Court Filing', 'Affidavits', 'Police Character Certificate'],
+        ['Filing Fee', 'Service of Process', 'Certified True Copy', 'Sworn Affidavit', 'Processing']),
+    'Agriculture & Environment': (
+        ['Farm Produce Export Permit', 'Fishing Licence', 'Environmental Impact Assessment', 'Waste Management'],
+        ['Permit', 'Licence', 'Annual Renewal', 'Inspection', 'Sanitation Levy']),
+    'Ports, Aviation & Marine': (
+        ['Port Charges', 'Pilot Licence', 'Cargo Clearance', 'Vessel Registration'],
+        ['Registration', 'Licence', 'Clearance', 'Inspection', 'Annual Renewal']),
+}
+
+STATES = ['Abia', 'Adamawa', 'Akwa Ibom', 'Anambra', 'Bauchi', 'Bayelsa', 'Benue', 'Borno', 'Cross River',
+          'Delta', 'Ebonyi', 'Edo', 'Ekiti', 'Enugu', 'FCT', 'Gombe', 'Imo', 'Jigawa', 'Kaduna', 'Kano', 'Katsina',
+          'Kebbi', 'Kogi', 'Kwara', 'Lagos', 'Nasarawa', 'Niger', 'Ogun', 'Ondo', 'Osun', 'Oyo', 'Plateau', 'Rivers',
+          'Sokoto', 'Taraba', 'Yobe', 'Zamfara']
+
+# Senatorial-district style suffixes that take the state list into the hundreds
+DISTRICTS = ['', ' Central', ' North', ' South', ' East', ' West']
+
+AGENCY_BODIES = ['Internal Revenue Service', 'Ministry of Lands', 'Water Corporation', 'Urban Planning Authority',
+                 'Vehicle Inspection Service', 'Health Insurance Agency', 'Ministry of Education', 'High Court',
+                 'Environmental Protection Agency', 'Ministry of Agriculture']
+
+FEDERAL_AGENCIES = ['National Identity Management Commission', 'Nigeria Immigration Service',
+                    'Joint Admissions and Matriculation Board', 'National Examinations Council',
+                    'Nigerian Electricity Regulatory Commission', 'Corporate Affairs Commission',
+                    'Federal Road Safety Corps', 'Federal Inland Revenue Service', 'Nigerian Ports Authority',
+                    'Nigerian Civil Aviation Authority', 'National Health Insurance Authority',
+                    'Nigeria Police Force']
+
+VARIANTS = ['Individual', 'Corporate', 'Express', 'Diaspora', 'Student', 'Senior Citizen', 'Standard', 'Premium']
+SERVICE_TYPES = ['Standard', 'Express', 'Modification', 'Renewal', 'Replacement', 'Penalty']
+DESCRIPTIONS = ['Payable before processing begins', 'Non-refundable, payable online or at designated banks',
+                'Charged per application', 'Valid for one year from the date of issue', '']
+
+FEE_HEADER = ['subcategory_slug', 'name', 'amount', 'currency', 'service_type', 'payment_code', 'description',
+              'meta', 'source_name']
+
+SCALE_SUFFIXES = {'k': 1000, 'm': 1000000}
+
+
+class Subcategory(NamedTuple):
+    slug: str
+    category: int
+    services: List[str]
+    source: str
+    code: str
+
+
+def slugify(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def parse_count(value: str) -> int:
+    """'10000', '100k' or '1m' -> int."""
+    value = value.strip().lower()
+    try:
+        if value[-1:] in SCALE_SUFFIXES:
+            return int(float(value[:-1]) * SCALE_SUFFIXES[value[-1]])
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected a count like 10000, 100k or 1m, got {value!r}')
+
+
+def state_names(count: int) -> List[str]:
+    """The 37 states, then each with a district suffix, then numbered, until there are `count`."""
+    names = [state + district for district in DISTRICTS for state in STATES]
+    extra = (f'{state} Zone {n}' for n in count_from(2) for state in STATES)
+    return (names + list(islice(extra, max(0, count - len(names)))))[:count]
+
+
+def initials(name: str) -> str:
+    return ''.join(word[0] for word in re.findall(r'[A-Za-z]+', name) if word[0].isupper())
+
+
+def write_csv(path: str, header: List[str], rows) -> int:
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+class CatalogGenerator:
+    """
+    Generate a synthetic seed catalog deterministically from `seed`.
+
+    Args:
+        fees: Fee rows to write
+        subcategories: Subcategories, spread round-robin over the categories
+        agencies: Agencies, each with one source (its fee schedule)
+        states: Distinct meta.state values
+        categories: Categories (at most one per theme, then numbered)
+        seed: Random seed; the same seed writes the same files
+        state_share: Fraction of fees that carry meta.state
+    """
+
+    def __init__(self, fees: int = 10000, subcategories: int = 400, agencies: int = 200, states: int = 200,
+                 categories: int = len(THEMES), seed: int = 42, state_share: float = 0.6):
+        self.fees = fees
+        self.subcategory_count = max(1, subcategories)
+        self.agency_count = max(1, agencies)
+        self.states = state_names(max(1, states))
+        self.category_count = max(1, categories)
+        self.state_share = state_share
+        self.rng = random.Random(seed)
+        self.themes = list(THEMES.items())
+
+    def agencies(self) -> List[Dict[str, str]]:
+        names = FEDERAL_AGENCIES + [f'{state} State {body}' for body in AGENCY_BODIES for state in STATES]
+        extra = (f'{name} ({n})' for n in count_from(2) for name in list(names))
+        names += islice(extra, max(0, self.agency_count - len(names)))
+        return [{'name': name, 'slug': slugify(name), 'website': f'https://{slugify(name)}.gov.ng'}
+                for name in names[:self.agency_count]]
+
+    def categories(self) -> List[Dict[str, str]]:
+        rows = []
+        for i in range(self.category_count):
+            name, _ = self.themes[i % len(self.themes)]
+            if i >= len(self.themes):
+                name = f'{name} {i // len(self.themes) + 1}'
+            rows.append({'name': name, 'slug': slugify(name)})
+        return rows
+
+    def generate(self, out_dir: str) -> Dict[str, int]:
+        """Write the catalog into out_dir; returns rows written per file."""
+        os.makedirs(out_dir, exist_ok=True)
+        rng = self.rng
+        counts: Dict[str, int] = {}
+
+        agencies = self.agencies()
+        counts['agencies.csv'] = write_csv(os.path.join(out_dir, 'agencies.csv'), ['name', 'slug', 'website', 'notes'], (
+            [agency['name'], agency['slug'], agency['website'], 'Synthetic agency for scale testing']
+            for agency in agencies))
+
+        categories = self.categories()
+        counts['categories.csv'] = write_csv(os.path.join(out_dir, 'categories.csv'), ['name', 'slug', 'description'], (
+            [category['name'], category['slug'], f"Synthetic {category['name'].lower()} fees"]
+            for category in categories))
+
+        sources = [f"{agency['name']} Schedule of Fees" for agency in agencies]
+        counts['sources.csv'] = write_csv(
+            os.path.join(out_dir, 'sources.csv'), ['name', 'url', 'document_ref', 'notes', 'agency_slug'], (
+                [source, f"{agency['website']}/fees", f"{initials(agency['name']) or 'AG'}/FEES/{2020 + i % 6}",
+                 'Synthetic fee schedule', agency['slug']]
+                for i, (source, agency) in enumerate(zip(sources, agencies))))
+
+        subcategories: List[Subcategory] = []
+        subcategory_rows = []
+        for i in range(self.subcategory_count):
+            category = i % len(categories)
+            topics, services = self.themes[category % len(self.themes)][1]
+            topic = topics[(i // len(categories)) % len(topics)]
+            # Each topic first appears nationally, then once per state
+            repeat = i // (len(categories) * len(topics))
+            if repeat:
+                topic = f'{topic} - {self.states[(repeat - 1) % len(self.states)]}'
+                if repeat > len(self.states):
+                    topic = f'{topic} {(repeat - 1) // len(self.states) + 1}'
+            slug = slugify(f"{categories[category]['slug']} {topic}")
+            source = rng.randrange(len(sources))
+            subcategories.append(Subcategory(slug, category, services, sources[source],
+                                             initials(agencies[source]['name']) or 'AG'))
+            subcategory_rows.append([topic, slug, f'{topic} fees', categories[category]['slug']])
+        counts['subcategories.csv'] = write_csv(
+            os.path.join(out_dir, 'subcategories.csv'), ['name', 'slug', 'description', 'category_slug'],
+            subcategory_rows)
+        del subcategory_rows
+
+        # Zipf-like weights: a handful of subcategories hold most fees, as in the real data
+        cumulative = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(subcategories))))
+        order = list(range(len(subcategories)))
+        rng.shuffle(order)
+
+        files = []
+        writers = []
+        try:
+            for category in categories:
+                filename = f"{category['slug']}_fees.csv"
+                handle = open(os.path.join(out_dir, filename), 'w', newline='', encoding='utf-8')
+                files.append(handle)
+                writers.append(csv.writer(handle))
+                writers[-1].writerow(FEE_HEADER)
+                counts[filename] = 0
+
+            # Per-subcategory counters keep names unique on the (subcategory, name, service type) import key
+            serials = [0] * len(subcategories)
+            for n in range(self.fees):
+                index = order[rng.choices(range(len(order)), cum_weights=cumulative)[0]]
+                subcategory = subcategories[index]
+                serials[index] += 1
+                writers[subcategory.category].writerow(self.fee_row(subcategory, serials[index], n))
+                counts[f"{categories[subcategory.category]['slug']}_fees.csv"] += 1
+        finally:
+            for handle in files:
+                handle.close()
+        return counts
+
+    def fee_row(self, subcategory: Subcategory, serial: int, n: int) -> List[str]:
+        rng = self.rng
+        service = rng.choice(subcategory.services)
+        name = f'{service} - {rng.choice(VARIANTS)} (Item {serial})'
+        roll = rng.random()
+        if roll < 0.02:
+            amount, currency = 'N/A', 'NGN'
+        elif roll < 0.07:
+            amount, currency = str(rng.choice([10, 20, 25, 50, 75, 100, 130, 150, 250])), 'USD'
+        else:
+            amount, currency = str(int(round(10 ** rng.uniform(2, 6.3) / 50)) * 50), 'NGN'
+        description = rng.choice(DESCRIPTIONS)
+        if description and rng.random() < 0.1:
+            description += ', excluding bank charges'
+        meta = {}
+        if rng.random() < self.state_share:
+            meta['state'] = rng.choice(self.states)
+        if rng.random() < 0.2:
+            meta['processing_days'] = rng.choice([1, 3, 7, 14, 30])
+        return [subcategory.slug, name, amount, currency, rng.choice(SERVICE_TYPES),
+                f'{subcategory.code}-{n + 1:07d}', description, json.dumps(meta), subcategory.source]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic fee catalog in the data/seed CSV schema')
+    parser.add_argument('--out', required=True, help='Output directory for the CSVs')
+    parser.add_argument('--fees', type=parse_count, default=10000, help='Fees to write: 10000, 100k, 1m (default: 10k)')
+    parser.add_argument('--subcategories', type=int, default=400, help='Subcategories (default: 400)')
+    parser.add_argument('--agencies', type=int, default=200, help='Agencies, one source each (default: 200)')
+    parser.add_argument('--states', type=int, default=200, help='Distinct meta.state values (default: 200)')
+    parser.add_argument('--categories', type=int, default=len(THEMES),
+                        help=f'Categories (default: {len(THEMES)})')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    args = parser.parse_args()
+
+    generator = CatalogGenerator(args.fees, args.subcategories, args.agencies, args.states, args.categories,
+                                 args.seed)
+    started = time.perf_counter()
+    counts = generator.generate(args.out)
+    elapsed = time.perf_counter() - started
+
+    for filename, rows in counts.items():
+        size = os.path.getsize(os.path.join(args.out, filename))
+        print(f'{filename:<48} {rows:>9} rows {size / 1e6:>8.1f} MB')
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1e6 if sys.platform == 'darwin' else 1e3)
+    print(f'\n{args.fees} fees in {elapsed:.1f}s ({args.fees / max(elapsed, 1e-9):,.0f} rows/sec), '
+          f'peak memory {peak:.0f} MB')
+    print(f'Validate with: python seed_validate.py --seed-dir {args.out}')
+
+
+if __name__ == '__main__':
+    main()
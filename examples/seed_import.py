@@ -0,0 +1,363 @@
+"""
+Nigerian Government Fees API - Bulk Seed Importer
+
+Streams the CSVs in data/seed/ through seed_validate.py and loads them
+table by table in dependency order (agencies, categories, sources,
+subcategories, fees). Placeholder and name references are resolved once per
+table, and rows are written in batches instead of one db.add per row:
+
+- remote: POST each batch to the import API's /seed/bulk endpoint
+  (apis/import/seed_bulk.xs), which resolves foreign keys with one query per
+  referenced table and writes the batch with db.bulk.add
+- local: load an on-disk SQLite copy of the schema with one executemany per
+  batch; --per-row loads it one INSERT and commit per row instead, the way
+  import_fees.xs writes, for comparison
+
+Rows the validator rejects, or whose subcategory, source, agency or
+category cannot be resolved in the database, are reported as rejected
+rather than aborting the import. Fees are upserted on
+their natural key (subcategory, name, service type): re-running the import
+inserts only new fees, rewrites only fees whose content hash changed, and
+skips the rest. --scale repeats the fee rows (with numbered names) to seed
+large catalogs, e.g. --scale 1100 for ~100k fees. Every run prints rows/sec
+per table.
+
+Usage:
+    python seed_import.py --sqlite seed.sqlite3 [--scale 1100] [--batch-size 1000] [--per-row]
+    python seed_import.py --base-url https://your-workspace.xano.io/api:import [--batch-size 500]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from itertools import islice
+from typing import Optional, Dict, List, Any, Iterable, Iterator
+
+from fees_client import FeesClient, handle_response
+from seed_validate import SeedValidator, SEED_DIR, TABLES
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS agencies (id INTEGER PRIMARY KEY, name TEXT, slug TEXT UNIQUE, website TEXT, notes TEXT);
+CREATE TABLE IF NOT EXISTS categories (id INTEGER PRIMARY KEY, name TEXT, slug TEXT UNIQUE, description TEXT);
+CREATE TABLE IF NOT EXISTS sources (id INTEGER PRIMARY KEY, agency_id INTEGER, name TEXT UNIQUE, url TEXT,
+    document_ref TEXT, notes TEXT);
+CREATE TABLE IF NOT EXISTS subcategories (id INTEGER PRIMARY KEY, category_id INTEGER, name TEXT, slug TEXT UNIQUE,
+    description TEXT);
+CREATE TABLE IF NOT EXISTS fees (id INTEGER PRIMARY KEY, subcategory_id INTEGER, source_id INTEGER, name TEXT,
+    amount REAL, currency TEXT, service_type TEXT, payment_code TEXT, description TEXT, meta TEXT,
+    natural_key TEXT UNIQUE, content_hash TEXT, created_at REAL, updated_at REAL);
+CREATE INDEX IF NOT EXISTS fees_subcategory_id ON fees (subcategory_id);
+'''
+
+
+def seed_rows(validator: SeedValidator, table: str, scale: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one table's validated rows in the /seed/bulk shape (parents referenced by slug/name).
+
+    Args:
+        validator: Reads, checks and normalizes the seed CSVs (see seed_validate.py)
+        table: One of TABLES
+        scale: Number of copies of the fee rows (copies after the first get numbered names)
+    """
+    if table != 'fees':
+        yield from validator.rows(table)
+        return
+    for copy in range(scale):
+        for row in validator.rows(table):
+            yield row if copy == 0 else dict(row, name=f"{row['name']} #{copy + 1}")
+
+
+def stored_meta(meta: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """meta as functions/fee_import_key.xs stores it: meta.state gets a lowercased meta.state_key."""
+    if meta and meta.get('state') is not None:
+        return dict(meta, state_key=meta['state'].lower())
+    return meta
+
+
+def import_key(fee: Dict[str, Any]) -> tuple:
+    """
+    (natural_key, content_hash) of a resolved fee, as functions/fee_import_key.xs computes them.
+
+    Re-imports match rows on natural_key and rewrite them only when
+    content_hash changes.
+    """
+    natural_key = '|'.join([str(fee['subcategory_id']), fee['name'].lower(), (fee['service_type'] or '').lower()])
+    content_hash = hashlib.sha256(json.dumps(fee, separators=(',', ':')).encode()).hexdigest()
+    return natural_key, content_hash
+
+
+def batched(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class SQLiteLoader:
+    """
+    Load seed batches into a local SQLite copy of the schema.
+
+    Parent keys are resolved from slug/name -> id maps read once per table,
+    so a batch costs one executemany. With per_row=True each row is its own
+    INSERT and commit instead. Every statement is charged round_trip_ms to
+    stand in for the database round trip a hosted backend pays.
+    """
+
+    def __init__(self, path: str, per_row: bool = False, round_trip_ms: float = 0.5):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        self.per_row = per_row
+        self.round_trip_ms = round_trip_ms
+        self.statements = 0
+        self._ids: Dict[str, Dict[str, int]] = {}
+
+    def _lookup(self, table: str, key: str) -> Dict[str, int]:
+        """slug/name -> id for a parent table, read with one query and cached."""
+        if table not in self._ids:
+            self.statements += 1
+            self._ids[table] = {value: row_id for row_id, value in self.db.execute(f'SELECT id, {key} FROM {table}')}
+        return self._ids[table]
+
+    def _resolve(self, table: str, row: Dict[str, Any]) -> Optional[tuple]:
+        """Turn a /seed/bulk row into column values, or None if a parent is missing."""
+        if table == 'agencies':
+            return row['name'], row['slug'], row.get('website'), row.get('notes')
+        if table == 'categories':
+            return row['name'], row['slug'], row.get('description')
+        if table == 'sources':
+            agency_id = self._lookup('agencies', 'slug').get(row['agency_slug'])
+            if agency_id is None:
+                return None
+            return agency_id, row['name'], row.get('url'), row.get('document_ref'), row.get('notes')
+        if table == 'subcategories':
+            category_id = self._lookup('categories', 'slug').get(row['category_slug'])
+            if category_id is None:
+                return None
+            return category_id, row['name'], row['slug'], row.get('description')
+
+        subcategory_id = self._lookup('subcategories', 'slug').get(row['subcategory_slug'])
+        source_id = self._lookup('sources', 'name').get(row['source_name'])
+        if subcategory_id is None or source_id is None:
+            return None
+        fee = {
+            'subcategory_id': subcategory_id,
+            'source_id': source_id,
+            'name': row['name'],
+            'amount': row.get('amount'),
+            'currency': row.get('currency'),
+            'service_type': row.get('service_type'),
+            'payment_code': row.get('payment_code'),
+            'description': row.get('description'),
+            'meta': stored_meta(row.get('meta'))
+        }
+        natural_key, content_hash = import_key(fee)
+        return (subcategory_id, source_id, row['name'], row.get('amount'), row.get('currency'), row.get('service_type'),
+                row.get('payment_code'), row.get('description'), json.dumps(fee['meta']), natural_key, content_hash)
+
+    def _load_fees(self, values: List[tuple]) -> Dict[str, int]:
+        """
+        Upsert resolved fees on natural_key: insert new ones, rewrite (and
+        touch updated_at on) ones whose content_hash changed, skip the rest.
+        """
+        existing: Dict[str, tuple] = {}
+        keys = list({value[9] for value in values})
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            self.statements += 1
+            existing.update((natural_key, (fee_id, content_hash)) for natural_key, fee_id, content_hash in self.db.execute(
+                f"SELECT natural_key, id, content_hash FROM fees WHERE natural_key IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ))
+
+        now = time.time() * 1000
+        inserts, updates = [], []
+        for value in values:
+            current = existing.get(value[9])
+            if current is None:
+                inserts.append(value + (now, now))
+                existing[value[9]] = (None, value[10])
+            elif current[1] != value[10]:
+                updates.append(value[:9] + (value[10], now, current[0]))
+                existing[value[9]] = (current[0], value[10])
+
+        insert = 'INSERT INTO fees (subcategory_id, source_id, name, amount, currency, service_type, payment_code, ' \
+                 'description, meta, natural_key, content_hash, created_at, updated_at) ' \
+                 'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+        update = 'UPDATE fees SET subcategory_id = ?, source_id = ?, name = ?, amount = ?, currency = ?, ' \
+                 'service_type = ?, payment_code = ?, description = ?, meta = ?, content_hash = ?, updated_at = ? ' \
+                 'WHERE id = ?'
+        for statement, rows in ((insert, inserts), (update, updates)):
+            if self.per_row:
+                for row in rows:
+                    with self.db:
+                        self.db.execute(statement, row)
+                    self.statements += 1
+            elif rows:
+                with self.db:
+                    self.db.executemany(statement, rows)
+                self.statements += 1
+        return {'imported': len(inserts), 'updated': len(updates)}
+
+    def load(self, table: str, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Write one batch; returns {imported, updated, rejected} like /seed/bulk."""
+        values, rejected = [], []
+        for row in batch:
+            resolved = self._resolve(table, row)
+            if resolved is None:
+                rejected.append(row)
+            else:
+                values.append(resolved)
+
+        if table == 'fees':
+            return dict(self._load_fees(values), rejected=rejected)
+
+        columns = {
+            'agencies': 'name, slug, website, notes',
+            'categories': 'name, slug, description',
+            'sources': 'agency_id, name, url, document_ref, notes',
+            'subcategories': 'category_id, name, slug, description'
+        }[table]
+        placeholders = ', '.join('?' * len(columns.split(',')))
+        # Reference tables are keyed by slug/name, so re-runs skip existing rows
+        statement = f'INSERT OR IGNORE INTO {table} ({columns}) VALUES ({placeholders})'
+
+        before = self.db.total_changes
+        if self.per_row:
+            for value in values:
+                with self.db:
+                    self.db.execute(statement, value)
+                self.statements += 1
+        elif values:
+            with self.db:
+                self.db.executemany(statement, values)
+            self.statements += 1
+
+        # A parent table changed: later tables must see its new ids
+        self._ids.pop(table, None)
+        return {'imported': self.db.total_changes - before, 'updated': 0, 'rejected': rejected}
+
+    def refresh_stats(self):
+        """The local copy keeps no catalog_stats row; nothing to refresh."""
+
+    def close(self):
+        self.db.close()
+
+
+class HTTPLoader:
+    """Send seed batches to POST /seed/bulk on the import API group."""
+
+    def __init__(self, base_url: str):
+        self.client = FeesClient(base_url=base_url, timeout=(3.05, 120))
+        self.statements = 0
+        self.round_trip_ms = 0.0
+
+    def load(self, table: str, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        self.statements += 1
+        return handle_response(self.client.post('/seed/bulk', json={
+            'table': table,
+            'rows': batch
+        }))
+
+    def refresh_stats(self):
+        """Recount catalog_stats once the import is done (a /seed/bulk call with no rows)."""
+        self.statements += 1
+        return handle_response(self.client.post('/seed/bulk', json={
+            'table': 'fees',
+            'rows': [],
+            'refresh_stats': True
+        }))
+
+    def close(self):
+        self.client.close()
+
+
+def run_import(loader, batch_size: int, seed_dir: str = SEED_DIR, scale: int = 1) -> List[Dict[str, Any]]:
+    """
+    Load every table in dependency order and print rows/sec per table.
+
+    Returns:
+        list: One summary per table {table, rows, imported, updated, rejected, seconds}
+              where rejected lists the reason for each rejected row
+    """
+    summaries = []
+    invalid: List[str] = []
+    validator = SeedValidator(seed_dir, on_reject=lambda rejection: invalid.append(str(rejection)))
+    print(f"{'table':<14} {'rows':>8} {'imported':>9} {'updated':>8} {'rejected':>9} {'seconds':>9} {'rows/sec':>10}")
+    for table in TABLES:
+        rows = imported = updated = 0
+        unresolved: List[str] = []
+        invalid.clear()
+        statements_before = loader.statements
+        started = time.perf_counter()
+        for batch in batched(seed_rows(validator, table, scale), batch_size):
+            result = loader.load(table, batch)
+            rows += len(batch)
+            imported += result['imported']
+            updated += result['updated']
+            unresolved.extend(f"{row['name']}: parent not found in the database" for row in result['rejected'])
+        rows += len(invalid)
+        rejected = invalid + unresolved
+
+        seconds = time.perf_counter() - started + (loader.statements - statements_before) * loader.round_trip_ms / 1000
+        rate = rows / seconds if seconds > 0 else float('inf')
+        print(f"{table:<14} {rows:>8} {imported:>9} {updated:>8} {len(rejected):>9} {seconds:>9.2f} {rate:>10.0f}")
+        summaries.append({'table': table, 'rows': rows, 'imported': imported, 'updated': updated,
+                          'rejected': rejected, 'seconds': seconds})
+
+    # Once, after every table, so catalog_stats is reconciled even when a
+    # table (fees included) had no rows to send
+    loader.refresh_stats()
+
+    total_rows = sum(summary['rows'] for summary in summaries)
+    total_seconds = sum(summary['seconds'] for summary in summaries)
+    print(f"{'total':<14} {total_rows:>8} {sum(summary['imported'] for summary in summaries):>9} "
+          f"{sum(summary['updated'] for summary in summaries):>8} "
+          f"{sum(len(summary['rejected']) for summary in summaries):>9} {total_seconds:>9.2f} "
+          f"{total_rows / total_seconds if total_seconds else 0:>10.0f}")
+
+    for summary in summaries:
+        if summary['rejected']:
+            reasons = list(dict.fromkeys(summary['rejected']))
+            print(f"\nRejected {summary['table']}:")
+            for reason in reasons[:5]:
+                print(f'  {reason}')
+            if len(reasons) > 5:
+                print(f'  ... and {len(reasons) - 5} more')
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-load the data/seed CSVs')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--sqlite', help='Load into this local SQLite file')
+    target.add_argument('--base-url', help='Import API base URL (POST /seed/bulk)')
+    parser.add_argument('--seed-dir', default=SEED_DIR, help='Directory with the seed CSVs')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per batch (default: 1000, max: 1000)')
+    parser.add_argument('--scale', type=int, default=1, help='Copies of the fee rows to load (default: 1)')
+    parser.add_argument('--per-row', action='store_true', help='Local only: one INSERT and commit per row')
+    parser.add_argument('--round-trip-ms', type=float, default=0.5,
+                        help='Local only: cost charged per statement for the database round trip (default: 0.5)')
+    args = parser.parse_args()
+
+    batch_size = min(max(1, args.batch_size), 1000)
+    if args.sqlite:
+        loader = SQLiteLoader(args.sqlite, per_row=args.per_row, round_trip_ms=args.round_trip_ms)
+        mode = 'one statement per row' if args.per_row else f'batches of {batch_size}'
+        print(f"Loading {args.sqlite} ({mode}, {args.round_trip_ms}ms per statement round trip)\n")
+    else:
+        loader = HTTPLoader(args.base_url)
+        print(f"Loading {args.base_url}/seed/bulk (batches of {batch_size})\n")
+
+    try:
+        run_import(loader, batch_size, args.seed_dir, args.scale)
+    finally:
+        loader.close()
+
+
+if __name__ == '__main__':
+    main()
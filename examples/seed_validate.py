@@ -0,0 +1,461 @@
+"""
+Nigerian Government Fees API - Seed Data Validator
+
+Checks and normalizes the CSVs in data/seed/ before they are imported, one
+row at a time (time proportional to the data, memory bounded by the small
+reference tables, never by the fee files):
+
+- every column is checked against the table's schema in tables/*.xs: types
+  (int, decimal, json), required fields and the trim/lower/upper filters
+- id, created_at and updated_at are filled in by the database, so their
+  CSV values (including the extra timestamp columns in nin_fess.csv) are
+  ignored
+- files with CR line endings (agencies.csv, categories.csv) and stray
+  spaces before quoted fields (neco_fees.csv) are read correctly
+- an unquoted comma in a trailing description/notes column (categories.csv,
+  subcategories.csv) is joined back into that column; --strict rejects it
+- amounts written with a currency symbol ($50 in nin_fess.csv) are loaded
+  as the number, and N/A as null, matching import_fees.xs
+- placeholder ids (SUB_ID_NECO_SSCE_INT, SRC_ID_NIS, ...) are resolved with
+  the maps in functions/import_fees.xs, and sources/subcategories get their
+  agency/category from functions/import_sources.xs and
+  functions/import_subcategories.xs, the same way the import does
+- agencies, categories, sources and subcategories that POST /seed_database
+  creates from the rows in functions/import_<table>.xs but that are missing
+  from the table's CSV (the ekedc and unilag agencies, the unilag
+  subcategory) are added after the CSV rows, so both imports load the same
+  fees
+- sources.csv, subcategories.csv and fee files may instead name their parent
+  directly in agency_slug, category_slug, subcategory_slug and source_name
+  columns (the /seed/bulk shape), as seed_generate.py writes them; any other
+  *_fees.csv in the seed directory is read after the files import_fees.xs
+  merges
+- rows that cannot be fixed are rejected with their file and line number,
+  including fees whose subcategory or source is not in the seed data
+
+Clean rows come out keyed by slug/name, the shape POST /seed/bulk and
+seed_import.py take, and --out writes them as columnar JSON Lines batches:
+{"table": ..., "count": n, "columns": {"name": [...], "amount": [...], ...}}
+
+Usage:
+    python seed_validate.py [--seed-dir ../data/seed] [--out batches.jsonl] [--batch-size 1000] [--strict]
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from itertools import islice
+from typing import Optional, Dict, List, Any, Iterator, Callable, NamedTuple, Tuple
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SEED_DIR = os.path.join(REPO_DIR, 'data', 'seed')
+
+TABLES = ['agencies', 'categories', 'sources', 'subcategories', 'fees']
+
+SEED_FILES = {
+    'agencies': ['agencies.csv'],
+    'categories': ['categories.csv'],
+    'sources': ['sources.csv'],
+    'subcategories': ['subcategories.csv'],
+    # In the order import_fees.xs merges them
+    'fees': ['nin_fess.csv', 'passport_fees.csv', 'jamb_fees.csv', 'neco_fees.csv',
+             'electricity_fees.csv', 'university_fees.csv']
+}
+
+# Filled in by the database; CSV values are ignored
+GENERATED_COLUMNS = {'id', 'created_at', 'updated_at'}
+
+# Free-text columns an unquoted comma can be joined back into when they end the row
+REPAIRABLE_COLUMNS = {'description', 'notes'}
+
+TIMESTAMP = re.compile(r'^(\d+|\d{4}-\d{2}-\d{2}([ T][\d:.]+)?(Z|[+-]\d{2}:?\d{2})?)$')
+
+# Amounts that mean "no fee applies" and load as null, as in import_fees.xs
+NOT_APPLICABLE = {'N/A', 'NA', '-'}
+
+# Symbols some amounts carry ($50); the currency column already says which
+CURRENCY_SYMBOLS = '$₦£€'
+
+# Columns naming a row's parent by its key, in place of an id or placeholder column
+REFERENCE_COLUMNS = {
+    'sources': {'agency_id': 'agency_slug'},
+    'subcategories': {'category_id': 'category_slug'},
+    'fees': {'subcategory_id': 'subcategory_slug', 'source_id': 'source_name'}
+}
+
+# Each table's unique key, used for duplicate checks and parent lookups
+TABLE_KEYS = {'agencies': 'slug', 'categories': 'slug', 'sources': 'name', 'subcategories': 'slug'}
+
+
+class Field(NamedTuple):
+    type: str
+    required: bool
+    filters: List[str]
+    table: Optional[str]
+
+
+class Rejection(NamedTuple):
+    file: str
+    line: int
+    reason: str
+
+    def __str__(self):
+        return f'{self.file}:{self.line}: {self.reason}'
+
+
+def parse_table_schema(path: str) -> Dict[str, Field]:
+    """
+    Read the schema block of a tables/*.xs file.
+
+    Returns:
+        dict: column name -> Field(type, required, filters, referenced table)
+    """
+    fields: Dict[str, Field] = {}
+    in_schema = False
+    current = None
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            stripped = line.strip()
+            if stripped.startswith('schema {'):
+                in_schema = True
+                continue
+            if not in_schema or not stripped or stripped.startswith('//'):
+                continue
+            if line.startswith('  }'):
+                break
+            reference = re.match(r'table = "([^"]+)"', stripped)
+            if reference and current:
+                fields[current] = fields[current]._replace(table=reference.group(1))
+                continue
+            match = re.match(r'(\w+(?:\[\])?) (\w+)(\?)?(?:=\S+)?(?: filters=(\S+))?', stripped)
+            if match:
+                field_type, current, optional, filters = match.groups()
+                fields[current] = Field(field_type, optional is None, filters.split('|') if filters else [], None)
+    return fields
+
+
+def parse_xs_map(path: str, variable: str) -> Dict[str, str]:
+    """Read a flat {KEY: "value"} object assigned to `var $variable` in an xs function."""
+    with open(path, encoding='utf-8') as handle:
+        source = handle.read()
+    block = re.search(r'var \$' + variable + r' \{\s*value = \{(.*?)\}', source, re.S)
+    if block is None:
+        raise ValueError(f'${variable} not found in {path}')
+    return dict(re.findall(r'(\w+)\s*:\s*"([^"]*)"', block.group(1)))
+
+
+def parse_xs_records(path: str, variable: str) -> List[Tuple[int, Dict[str, str]]]:
+    """(line, {key: value}) for each {key: "value", key: 123, ...} row assigned to `var $variable` in an xs function."""
+    with open(path, encoding='utf-8') as handle:
+        source = handle.read()
+    block = re.search(r'var \$' + variable + r' \{\s*value = \[(.*?)\n\s*\]', source, re.S)
+    if block is None:
+        raise ValueError(f'${variable} not found in {path}')
+    return [
+        (source.count('\n', 0, row.start()) + 1,
+         {name: quoted if bare == '' else bare.strip() for name, quoted, bare in
+          re.findall(r'(\w+)\s*:\s*(?:"([^"]*)"|([^,}"]+))', row.group())})
+        for row in re.compile(r'\{[^{}\n]*\}').finditer(source, block.start(1), block.end(1))
+    ]
+
+
+def parse_xs_rows(path: str, key: str, value: str) -> Dict[str, str]:
+    """Map `key` to `value` across the {key: "...", ..., value: "..."} data rows of an xs function."""
+    with open(path, encoding='utf-8') as handle:
+        source = handle.read()
+    pairs = {}
+    for row in re.findall(r'\{[^{}\n]*\}', source):
+        found_key = re.search(r'\b' + key + r': "([^"]*)"', row)
+        found_value = re.search(r'\b' + value + r': "([^"]*)"', row)
+        if found_key and found_value:
+            pairs[found_key.group(1)] = found_value.group(1)
+    return pairs
+
+
+class SeedValidator:
+    """
+    Validate and normalize the seed CSVs table by table.
+
+    Parent tables must be validated before the tables that reference them;
+    rows() does that on demand. Only the reference tables' keys are kept in
+    memory, so fee files of any size stream through in constant space.
+
+    Args:
+        seed_dir: Directory holding the seed CSVs
+        strict: Reject rows with an unquoted comma instead of repairing them
+        on_reject: Called with each Rejection as it happens
+        on_warning: Called with each warning (repairs, ignored columns, id mismatches)
+    """
+
+    def __init__(self, seed_dir: str = SEED_DIR, strict: bool = False,
+                 on_reject: Optional[Callable[[Rejection], None]] = None,
+                 on_warning: Optional[Callable[[Rejection], None]] = None):
+        self.seed_dir = seed_dir
+        self.strict = strict
+        self.on_reject = on_reject or (lambda rejection: None)
+        self.on_warning = on_warning or (lambda warning: None)
+        self.schemas = {table: parse_table_schema(os.path.join(REPO_DIR, 'tables', f'{table}.xs')) for table in TABLES}
+
+        functions_dir = os.path.join(REPO_DIR, 'functions')
+        import_fees = os.path.join(functions_dir, 'import_fees.xs')
+        self.subcategory_placeholders = parse_xs_map(import_fees, 'subcat_id_map')
+        self.source_placeholders = parse_xs_map(import_fees, 'source_id_map')
+        self.source_agencies = parse_xs_rows(os.path.join(functions_dir, 'import_sources.xs'), 'name', 'agency_key')
+        self.subcategory_categories = parse_xs_rows(
+            os.path.join(functions_dir, 'import_subcategories.xs'), 'slug', 'category_slug')
+
+        # Accepted keys per reference table (key -> line first seen)
+        self.keys: Dict[str, Dict[str, str]] = {}
+        # Category slugs in file order, for checking subcategories.csv's numeric category_id
+        self.category_order: List[str] = []
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def rows(self, table: str) -> Iterator[Dict[str, Any]]:
+        """Yield the table's clean rows in /seed/bulk shape, validating its parents first."""
+        for parent in TABLES[:TABLES.index(table)]:
+            if parent not in self.keys:
+                for _ in self.rows(parent):
+                    pass
+
+        if table in TABLE_KEYS:
+            self.keys[table] = {}
+        for filename in self.seed_files(table):
+            yield from self._file_rows(table, filename)
+        if table in TABLE_KEYS:
+            yield from self._function_rows(table)
+
+    def seed_files(self, table: str) -> List[str]:
+        """The table's CSVs: SEED_FILES, and for fees any other *_fees.csv in the seed directory."""
+        if table != 'fees':
+            return SEED_FILES[table]
+        known = [name for name in SEED_FILES['fees'] if os.path.exists(os.path.join(self.seed_dir, name))]
+        extra = sorted(name for name in os.listdir(self.seed_dir)
+                       if name.endswith('_fees.csv') and name not in SEED_FILES['fees'])
+        return known + extra
+
+    def _file_rows(self, table: str, filename: str) -> Iterator[Dict[str, Any]]:
+        schema = self.schemas[table]
+        stats = self.stats.setdefault(filename, {'rows': 0, 'accepted': 0, 'repaired': 0, 'rejected': 0})
+        # newline='' lets csv split the CR-terminated files; skipinitialspace
+        # drops the space before quoted fields
+        with open(os.path.join(self.seed_dir, filename), newline='', encoding='utf-8') as handle:
+            reader = csv.reader(handle, skipinitialspace=True)
+            header = [column.strip() for column in next(reader, [])]
+            references = REFERENCE_COLUMNS.get(table, {})
+            for column in header:
+                if column not in schema and column not in references.values():
+                    self.on_warning(Rejection(filename, 1, f'column {column} is not in tables/{table}.xs; ignored'))
+            missing = [name for name, field in schema.items()
+                       if field.required and name not in GENERATED_COLUMNS and name not in header
+                       and references.get(name) not in header
+                       and not (table in ('sources', 'subcategories') and field.table)]
+            if missing:
+                self.on_reject(Rejection(filename, 1, f"missing required column(s): {', '.join(missing)}"))
+                return
+
+            # Columns up to the last one the import uses; trailing timestamps may be absent
+            width = max(i for i, column in enumerate(header) if column not in GENERATED_COLUMNS) + 1
+
+            for cells in reader:
+                if not any(cell.strip() for cell in cells):
+                    continue
+                stats['rows'] += 1
+                line = reader.line_num
+                try:
+                    row, repaired = self._normalize(table, filename, line, header, width, cells)
+                except ValueError as error:
+                    stats['rejected'] += 1
+                    self.on_reject(Rejection(filename, line, str(error)))
+                    continue
+                stats['accepted'] += 1
+                stats['repaired'] += repaired
+                yield row
+
+    def _function_rows(self, table: str) -> Iterator[Dict[str, Any]]:
+        """Rows of functions/import_<table>.xs whose key the table's CSV does not have."""
+        filename = f'import_{table}.xs'
+        records = parse_xs_records(os.path.join(REPO_DIR, 'functions', filename), f'{table}_data')
+        for line, record in records:
+            if record.get(TABLE_KEYS[table]) in self.keys[table]:
+                continue
+            stats = self.stats.setdefault(filename, {'rows': 0, 'accepted': 0, 'repaired': 0, 'rejected': 0})
+            stats['rows'] += 1
+            header = list(record)
+            try:
+                row, _ = self._normalize(table, filename, line, header, len(header), list(record.values()))
+            except ValueError as error:
+                stats['rejected'] += 1
+                self.on_reject(Rejection(filename, line, str(error)))
+                continue
+            stats['accepted'] += 1
+            self.on_warning(Rejection(filename, line, f'{TABLE_KEYS[table]} {row[TABLE_KEYS[table]]!r} '
+                                                          f'is not in {SEED_FILES[table][0]}; added from {filename}'))
+            yield row
+
+    def _normalize(self, table: str, filename: str, line: int, header: List[str], width: int,
+                   cells: List[str]) -> tuple:
+        """One CSV record -> (clean row, repaired flag); raises ValueError to reject it."""
+        schema = self.schemas[table]
+        cells = [cell.strip() for cell in cells]
+        repaired = False
+
+        # Anything past the used columns must be blank or a timestamp the database replaces anyway
+        overflow = [cell for cell in cells[width:] if cell and not TIMESTAMP.match(cell)]
+        if overflow:
+            if header[width - 1] not in REPAIRABLE_COLUMNS or self.strict:
+                raise ValueError(f'{width + len(overflow)} cells, expected {width} (unquoted comma?)')
+            cells = cells[:width - 1] + [', '.join([cells[width - 1]] + overflow)]
+            repaired = True
+            self.on_warning(Rejection(filename, line, f'joined an unquoted comma back into {header[width - 1]}'))
+
+        raw = {column: cells[i] if i < len(cells) else '' for i, column in enumerate(header[:width])}
+        row: Dict[str, Any] = {}
+        for column, value in raw.items():
+            field = schema.get(column)
+            if field is None or column in GENERATED_COLUMNS or field.table:
+                continue
+            if field.type == 'decimal' and value[:1] in CURRENCY_SYMBOLS and value[1:]:
+                self.on_warning(Rejection(filename, line, f'stripped the currency symbol from {column} {value!r}'))
+                value = value[1:].replace(',', '')
+                repaired = True
+            row[column] = self._convert(column, field, value)
+            if field.required and row[column] is None:
+                raise ValueError(f'{column} is required')
+
+        self._resolve_parents(table, filename, line, raw, row)
+
+        key = TABLE_KEYS.get(table)
+        if key:
+            first_line = self.keys[table].get(row[key])
+            if first_line is not None:
+                raise ValueError(f'duplicate {key} {row[key]!r} (first on {first_line})')
+            self.keys[table][row[key]] = f'line {line}'
+            if table == 'categories':
+                self.category_order.append(row['slug'])
+        return row, repaired
+
+    @staticmethod
+    def _convert(column: str, field: Field, value: str) -> Any:
+        """Apply the column's type and filters; '' becomes null."""
+        if value == '':
+            return None
+        if field.type == 'int':
+            try:
+                return int(value)
+            except ValueError:
+                raise ValueError(f'{column} must be an integer, got {value!r}')
+        if field.type == 'decimal':
+            if value.upper() in NOT_APPLICABLE and not field.required:
+                return None
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f'{column} must be a number, got {value!r}')
+        if field.type == 'json':
+            try:
+                return json.loads(value)
+            except ValueError:
+                raise ValueError(f'{column} is not valid JSON: {value!r}')
+        for name in field.filters:
+            value = {'trim': str.strip, 'lower': str.lower, 'upper': str.upper}.get(name, lambda v: v)(value)
+        return value
+
+    def _resolve_parents(self, table: str, filename: str, line: int, raw: Dict[str, str], row: Dict[str, Any]):
+        """Replace id/placeholder references with the parent's slug or name."""
+        if table == 'sources':
+            agency = raw.get('agency_slug') or self.source_agencies.get(row['name'])
+            if agency is None:
+                raise ValueError(f"no agency_key for source {row['name']!r} in import_sources.xs")
+            if agency not in self.keys['agencies']:
+                raise ValueError(f'agency {agency!r} is not in agencies.csv')
+            row['agency_slug'] = agency
+
+        elif table == 'subcategories':
+            category = raw.get('category_slug') or self.subcategory_categories.get(row['slug'])
+            position = raw.get('category_id', '')
+            by_position = None
+            if position.isdigit() and 0 < int(position) <= len(self.category_order):
+                by_position = self.category_order[int(position) - 1]
+            if category is None:
+                category = by_position
+            elif position and by_position != category:
+                self.on_warning(Rejection(filename, line, f'category_id {position} is {by_position!r} in '
+                                                          f'categories.csv; using {category!r} from '
+                                                          f'import_subcategories.xs'))
+            if category is None or category not in self.keys['categories']:
+                raise ValueError(f"no category for subcategory {row['slug']!r}")
+            row['category_slug'] = category
+
+        elif table == 'fees':
+            subcategory = raw.get('subcategory_slug') or self.subcategory_placeholders.get(raw.get('subcategory_id', ''))
+            if subcategory is None:
+                raise ValueError(f"unknown subcategory placeholder {raw.get('subcategory_id')!r}")
+            if subcategory not in self.keys['subcategories']:
+                raise ValueError(f'subcategory {subcategory!r} is not in subcategories.csv')
+            source = raw.get('source_name') or self.source_placeholders.get(raw.get('source_id', ''))
+            if source is None:
+                raise ValueError(f"unknown source placeholder {raw.get('source_id')!r}")
+            if source not in self.keys['sources']:
+                raise ValueError(f'source {source!r} is not in sources.csv (or was rejected)')
+            row['subcategory_slug'] = subcategory
+            row['source_name'] = source
+
+
+def columnar_batches(table: str, rows: Iterator[Dict[str, Any]], size: int) -> Iterator[Dict[str, Any]]:
+    """Group rows into {table, count, columns: {column: [values]}} batches of up to `size` rows."""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        columns = list(dict.fromkeys(column for row in batch for column in row))
+        yield {
+            'table': table,
+            'count': len(batch),
+            'columns': {column: [row.get(column) for row in batch] for column in columns}
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate and normalize the data/seed CSVs')
+    parser.add_argument('--seed-dir', default=SEED_DIR, help='Directory with the seed CSVs')
+    parser.add_argument('--out', help='Write clean rows here as columnar JSON Lines batches')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per output batch (default: 1000)')
+    parser.add_argument('--strict', action='store_true', help='Reject rows with unquoted commas instead of repairing')
+    args = parser.parse_args()
+
+    rejections: List[Rejection] = []
+
+    def report(kind: str, entry: Rejection):
+        print(f'{kind:<7} {entry}')
+        if kind == 'reject':
+            rejections.append(entry)
+
+    validator = SeedValidator(args.seed_dir, strict=args.strict,
+                              on_reject=lambda entry: report('reject', entry),
+                              on_warning=lambda entry: report('warning', entry))
+
+    out = open(args.out, 'w', encoding='utf-8') if args.out else None
+    try:
+        for table in TABLES:
+            for batch in columnar_batches(table, validator.rows(table), max(1, args.batch_size)):
+                if out:
+                    out.write(json.dumps(batch) + '\n')
+    finally:
+        if out:
+            out.close()
+
+    width = max([22] + [len(filename) for filename in validator.stats])
+    print(f"\n{'file':<{width}} {'rows':>6} {'accepted':>9} {'repaired':>9} {'rejected':>9}")
+    for filename, stats in validator.stats.items():
+        print(f"{filename:<{width}} {stats['rows']:>6} {stats['accepted']:>9} {stats['repaired']:>9} {stats['rejected']:>9}")
+    if args.out:
+        print(f'\nClean batches written to {args.out}')
+    sys.exit(1 if rejections else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Tests for fees_async_client.py.
+
+Transport-level behaviour (concurrency limits, retries, error mapping,
+closing) runs against httpx.MockTransport; paging runs end to end against the
+local stand-in server (fees_standin.py) serving data/seed/.
+
+Run: python -m pytest -q examples/test_fees_async_client.py
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from fees_async_client import AsyncFeesClient
+from fees_standin import FeesStandIn, start_server
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def json_response(status: int, body, headers=None) -> httpx.Response:
+    return httpx.Response(status, content=json.dumps(body), headers={'Content-Type': 'application/json',
+                                                                      **(headers or {})})
+
+
+def mock_client(handler, **kwargs) -> AsyncFeesClient:
+    return AsyncFeesClient(base_url='http://fees.test/api:public', api_key='nga_test',
+                           transport=httpx.MockTransport(handler), backoff_factor=0, **kwargs)
+
+
+@pytest.fixture(scope='module')
+def standin():
+    server = start_server(FeesStandIn(rate_limit=None))
+    server.api_key = server.standin.generate_key()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_map_keeps_order_and_respects_per_call_concurrency():
+    in_flight = {'now': 0, 'peak': 0}
+
+    async def handler(request):
+        in_flight['now'] += 1
+        in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+        await asyncio.sleep(0.01)
+        in_flight['now'] -= 1
+        fee_id = int(request.url.path.rsplit('/', 1)[1])
+        return json_response(200, {'id': fee_id, 'name': f'Fee {fee_id}'})
+
+    async def scenario():
+        async with mock_client(handler) as client:
+            return await client.map(client.get_fee_by_id, range(1, 21), concurrency=3)
+
+    fees = run(scenario())
+    assert [fee['id'] for fee in fees] == list(range(1, 21))
+    assert in_flight['peak'] == 3
+
+
+def test_client_wide_semaphore_caps_concurrent_calls():
+    in_flight = {'now': 0, 'peak': 0}
+
+    async def handler(request):
+        in_flight['now'] += 1
+        in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+        await asyncio.sleep(0.01)
+        in_flight['now'] -= 1
+        return json_response(200, {'total_fees': 1})
+
+    async def scenario():
+        async with mock_client(handler, max_concurrency=2) as client:
+            await asyncio.gather(*(client.get_metadata() for _ in range(10)))
+
+    run(scenario())
+    assert in_flight['peak'] == 2
+
+
+def test_api_key_sent_only_on_authenticated_calls():
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, request.url.params.get('api_key')))
+        return json_response(200, {})
+
+    async def scenario():
+        async with mock_client(handler) as client:
+            await client.get_categories()
+            await client.get_docs()
+
+    run(scenario())
+    assert seen == [('/api:public/categories', 'nga_test'), ('/api:public/docs', None)]
+
+
+def test_get_retries_5xx_and_429_then_succeeds():
+    statuses = [503, 429, 200]
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        status = statuses[len(calls) - 1]
+        return json_response(status, {'total_fees': 120} if status == 200 else {'message': 'busy'},
+                             headers={'Retry-After': '0'} if status == 429 else None)
+
+    async def scenario():
+        async with mock_client(handler) as client:
+            return await client.get_metadata()
+
+    assert run(scenario()) == {'total_fees': 120}
+    assert len(calls) == 3
+
+
+def test_get_retries_connection_errors_up_to_max_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError('connection refused', request=request)
+
+    async def scenario():
+        async with mock_client(handler, max_retries=2) as client:
+            await client.get_categories()
+
+    with pytest.raises(httpx.ConnectError):
+        run(scenario())
+    assert len(calls) == 3
+
+
+def test_post_is_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return json_response(503, {'message': 'unavailable'})
+
+    async def scenario():
+        async with mock_client(handler) as client:
+            await client.generate_api_key('dev@example.com')
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(scenario())
+    assert len(calls) == 1
+
+
+def test_error_bodies_map_to_value_errors():
+    def handler(request):
+        if request.url.path.endswith('/fees/999'):
+            return json_response(404, {'code': 'ERROR_CODE_NOT_FOUND', 'message': 'Fee not found'})
+        return json_response(403, {'code': 'ERROR_CODE_ACCESS_DENIED', 'message': 'Invalid API key'})
+
+    async def scenario(call):
+        async with mock_client(handler) as client:
+            await call(client)
+
+    with pytest.raises(ValueError, match='Fee not found'):
+        run(scenario(lambda client: client.get_fee_by_id(999)))
+    with pytest.raises(ValueError, match='ERROR_CODE_ACCESS_DENIED: Invalid API key'):
+        run(scenario(lambda client: client.get_fees()))
+    with pytest.raises(ValueError, match='at least 2 characters'):
+        run(scenario(lambda client: client.search_fees(' a ')))
+
+
+def test_close_rejects_further_requests():
+    async def scenario():
+        client = mock_client(lambda request: json_response(200, {}))
+        async with client:
+            await client.get_docs()
+        assert client._client.is_closed
+        with pytest.raises(RuntimeError):
+            await client.get_docs()
+
+    run(scenario())
+
+
+def test_cursor_paging_against_standin(standin):
+    async def scenario():
+        async with AsyncFeesClient(base_url=standin.base_url, api_key=standin.api_key) as client:
+            first = await client.get_fees(per_page=100)
+            ids, cursor = [], None
+            while True:
+                page = await client.get_fees(per_page=7, cursor=cursor, include_total=False)
+                ids.extend(fee['id'] for fee in page['items'])
+                cursor = page['meta']['next_cursor']
+                if not cursor:
+                    return first, ids
+
+    first, ids = run(scenario())
+    assert ids == [fee['id'] for fee in first['items']]
+    assert len(ids) == len(set(ids)) == first['meta']['total']
+
+
+def test_batch_lookup_splits_and_keeps_order_against_standin(standin):
+    async def scenario():
+        async with AsyncFeesClient(base_url=standin.base_url, api_key=standin.api_key) as client:
+            return await client.get_fees_by_ids(list(range(150, 0, -1)), compact=True)
+
+    items = run(scenario())
+    assert [item['id'] for item in items] == list(range(150, 0, -1))
+    assert any(item.get('not_found') for item in items)
+    assert all(set(item) == {'id', 'name', 'amount', 'currency'} for item in items if not item.get('not_found'))
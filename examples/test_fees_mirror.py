@@ -0,0 +1,57 @@
+"""
+Tests for the local search in fees_mirror.py, which mirrors the ranking of
+GET /fees/search (apis/public/fees_search.xs).
+
+Run: python -m pytest -q examples/test_fees_mirror.py
+"""
+
+from fees_mirror import FeeMirror, search_text
+
+
+def fee(fee_id, name, description=None, service_type=None, payment_code=None):
+    return {'id': fee_id, 'name': name, 'description': description, 'service_type': service_type,
+            'payment_code': payment_code, 'amount': 1000.0, 'category_name': 'Identity'}
+
+
+def names(results):
+    return [result['name'] for result in results]
+
+
+def test_name_tier_needs_the_query_in_the_name():
+    # "Renewal of ID card" holds every trigram of "card renewal" but only its
+    # description holds the phrase, so it ranks after the real name match
+    mirror = FeeMirror([
+        fee(1, 'Renewal of ID card', description='Card renewal for lost cards'),
+        fee(2, 'Voter card renewal')
+    ], cursor={})
+
+    assert names(mirror.search('card renewal')) == ['Voter card renewal', 'Renewal of ID card']
+
+
+def test_search_text_does_not_span_fields():
+    passport = fee(1, 'International passport', service_type='Fee schedule')
+    mirror = FeeMirror([passport], cursor={})
+
+    assert search_text(passport) == 'international passport | fee schedule'
+    assert mirror.search('passport fee') == []
+    assert names(mirror.search('fee schedule')) == ['International passport']
+
+
+def test_fuzzy_short_words_match_exactly():
+    # "nin" is one deletion from "nine" but words of 3 characters or fewer
+    # skip the variant lookup; "nine" itself still tolerates a typo
+    mirror = FeeMirror([
+        fee(1, 'NIN enrolment'),
+        fee(2, 'Nine month permit')
+    ], cursor={})
+
+    assert names(mirror.fuzzy_search('nin')) == ['NIN enrolment']
+    assert names(mirror.fuzzy_search('nime')) == ['Nine month permit']
+
+
+def test_fuzzy_long_query_uses_its_six_longest_words():
+    mirror = FeeMirror([fee(1, 'International passport renewal', description='Standard booklet fee')], cursor={})
+
+    # Seven words: "for" is not in the catalog but, as the shortest, it is dropped
+    query = 'international passport renewal standard booklet fee for'
+    assert names(mirror.fuzzy_search(query)) == ['International passport renewal']
@@ -0,0 +1,54 @@
+"""
+Tests for seed_import.py: the CSV import must load the same fees as
+POST /seed_database (apis/import/seed_database.xs), which imports the rows
+written out in functions/import_*.xs.
+
+Run: python -m pytest -q examples/test_seed_import.py
+"""
+
+import os
+import re
+
+from seed_import import SQLiteLoader, run_import
+from seed_validate import REPO_DIR, parse_xs_map, parse_xs_records
+
+FUNCTIONS_DIR = os.path.join(REPO_DIR, 'functions')
+
+
+def seed_database_fees() -> set:
+    """Natural keys (subcategory, name, service type) of the fees import_fees.xs writes."""
+    import_fees = os.path.join(FUNCTIONS_DIR, 'import_fees.xs')
+    subcategory_slugs = parse_xs_map(import_fees, 'subcat_id_map')
+    source_names = parse_xs_map(import_fees, 'source_id_map')
+    subcategories = {row['slug'] for _, row in
+                     parse_xs_records(os.path.join(FUNCTIONS_DIR, 'import_subcategories.xs'), 'subcategories_data')}
+    sources = {row['name'] for _, row in
+               parse_xs_records(os.path.join(FUNCTIONS_DIR, 'import_sources.xs'), 'sources_data')}
+
+    with open(import_fees, encoding='utf-8') as handle:
+        rows = re.findall(r'\{subcategory_placeholder: "(\w+)", name: "([^"]*)".*?service_type: "([^"]*)".*?'
+                          r'source_placeholder: "(\w+)"\}', handle.read())
+
+    # import_fees skips rows whose subcategory or source it cannot resolve
+    return {
+        (subcategory_slugs[subcategory], name.lower(), service_type.lower())
+        for subcategory, name, service_type, source in rows
+        if subcategory_slugs.get(subcategory) in subcategories and source_names.get(source) in sources
+    }
+
+
+def test_csv_import_loads_the_same_fees_as_seed_database(tmp_path):
+    loader = SQLiteLoader(str(tmp_path / 'seed.sqlite3'), round_trip_ms=0)
+    try:
+        summaries = run_import(loader, 1000)
+        loaded = {
+            (slug, name.lower(), (service_type or '').lower())
+            for slug, name, service_type in loader.db.execute(
+                'SELECT subcategories.slug, fees.name, fees.service_type FROM fees '
+                'JOIN subcategories ON subcategories.id = fees.subcategory_id')
+        }
+    finally:
+        loader.close()
+
+    assert [summary['rejected'] for summary in summaries] == [[]] * len(summaries)
+    assert loaded == seed_database_fees()
@@ -7,48 +7,116 @@ This script tests all 7 API endpoints including:
 - Error handling
 - Response validation
 
-Run: python test_api.py
+With --workers N the test cases after key generation run concurrently on
+N threads sharing one pooled session, so a full run takes about as long as
+the slowest test instead of the sum of all of them. Each test's wall time
+is saved to test_results.json.
+
+The rate limit test fires --burst requests (default 150) at one fresh key
+from 20 threads and checks that exactly 100 get through. It runs after the
+other tests have finished, so its burst does not skew their timings, and
+against a live API only with --rate-limit, since every run creates a key
+and spends the whole burst. It compares the
+latency of passed and blocked requests with /docs, which skips the key check
+and limiter. With --standin the suite runs against the local stand-in
+server (fees_standin.py). There it also moves the stand-in's clock to the
+limiter window's start + 1 hour and checks that the window resets.
+request_count is a lifetime total and is never reset.
+
+Run: python xano_hcktn_endpoint_test.py [--workers 6] [--standin] [--base-url URL] [--rate-limit] [--burst 150]
 """
 
+import argparse
 import requests
 import json
+import statistics
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
 
 BASE_URL = 'https://xmlb-8xh6-ww1h.n7e.xano.io/api:public'
 
-# Test results storage
+# Per-key limit enforced by functions/auth_api_key.xs
+RATE_LIMIT = 100
+
+# Requests test_rate_limiting fires at one key, and the threads firing them
+RATE_LIMIT_BURST = 150
+RATE_LIMIT_WORKERS = 20
+
+# Local stand-in server started by --standin (None when testing a live API)
+standin_server = None
+
+# Test results storage (shared by worker threads, guarded by results_lock)
 test_results = {
     'passed': [],
     'failed': [],
     'warnings': [],
-    'total': 0
+    'total': 0,
+    'timings': {}
 }
+results_lock = threading.Lock()
+
+# Output of the test case running on the current thread, printed as one block
+_output = threading.local()
+
+# One pooled keep-alive session shared by every test and thread
+session = requests.Session()
+
+def configure_session(pool_size: int):
+    """Size the shared session's connection pool for the number of concurrent requests"""
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+def log(message: str = ""):
+    """Print a line, or buffer it while a test case runs so concurrent output doesn't interleave"""
+    lines = getattr(_output, 'lines', None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+def run_test(test, *args):
+    """Run one test case, record its wall time and print its output as one block"""
+    _output.lines = []
+    started = time.perf_counter()
+    try:
+        return test(*args)
+    finally:
+        elapsed = time.perf_counter() - started
+        lines, _output.lines = _output.lines, None
+        with results_lock:
+            test_results['timings'][test.__name__] = round(elapsed, 3)
+            print("\n".join(lines))
+            print(f"   ({test.__name__} took {elapsed:.2f}s)")
 
 def print_test(name: str, status: str, message: str = ""):
     """Print test result with formatting"""
-    test_results['total'] += 1
     symbol = "✅" if status == "PASS" else "❌" if status == "FAIL" else "⚠️"
-    print(f"{symbol} [{status}] {name}")
+    log(f"{symbol} [{status}] {name}")
     if message:
-        print(f"   {message}")
-    
-    if status == "PASS":
-        test_results['passed'].append(name)
-    elif status == "FAIL":
-        test_results['failed'].append(name)
-    else:
-        test_results['warnings'].append(name)
+        log(f"   {message}")
+    
+    with results_lock:
+        test_results['total'] += 1
+        if status == "PASS":
+            test_results['passed'].append(name)
+        elif status == "FAIL":
+            test_results['failed'].append(name)
+        else:
+            test_results['warnings'].append(name)
 
 def test_get_docs():
     """Test GET /docs endpoint (no authentication required)"""
-    print("\n" + "="*60)
-    print("Testing GET /docs")
-    print("="*60)
+    log("\n" + "="*60)
+    log("Testing GET /docs")
+    log("="*60)
     
     try:
-        response = requests.get(f'{BASE_URL}/docs')
+        response = session.get(f'{BASE_URL}/docs')
         response.raise_for_status()
         data = response.json()
         
@@ -89,13 +157,13 @@ def test_get_docs():
 
 def test_generate_api_key():
     """Test POST /api_key/generate endpoint"""
-    print("\n" + "="*60)
-    print("Testing POST /api_key/generate")
-    print("="*60)
+    log("\n" + "="*60)
+    log("Testing POST /api_key/generate")
+    log("="*60)
     
     try:
         # Test without email
-        response = requests.post(
+        response = session.post(
             f'{BASE_URL}/api_key/generate',
             json={},
             headers={'Accept': 'application/json'}
@@ -118,7 +186,7 @@ def test_generate_api_key():
             return None
         
         # Test with email
-        response2 = requests.post(
+        response2 = session.post(
             f'{BASE_URL}/api_key/generate',
             json={'user_email': 'test@example.com'},
             headers={'Accept': 'application/json'}
@@ -139,9 +207,9 @@ def test_generate_api_key():
 
 def test_get_fees(api_key: str):
     """Test GET /fees endpoint"""
-    print("\n" + "="*60)
-    print("Testing GET /fees")
-    print("="*60)
+    log("\n" + "="*60)
+    log("Testing GET /fees")
+    log("="*60)
     
     if not api_key:
         print_test("GET /fees - Skipped", "WARN", "No API key available")
@@ -149,7 +217,7 @@ def test_get_fees(api_key: str):
     
     # Test 1: Basic request
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees',
             params={'api_key': api_key, 'page': 1, 'per_page': 5}
         )
@@ -167,7 +235,7 @@ def test_get_fees(api_key: str):
     
     # Test 2: With category filter
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees',
             params={'api_key': api_key, 'category': 'identity', 'per_page': 5}
         )
@@ -180,7 +248,7 @@ def test_get_fees(api_key: str):
     
     # Test 3: With search
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees',
             params={'api_key': api_key, 'search': 'NIN', 'per_page': 5}
         )
@@ -193,7 +261,7 @@ def test_get_fees(api_key: str):
     
     # Test 4: Pagination
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees',
             params={'api_key': api_key, 'page': 1, 'per_page': 10}
         )
@@ -209,7 +277,7 @@ def test_get_fees(api_key: str):
     
     # Test 5: Missing API key
     try:
-        response = requests.get(f'{BASE_URL}/fees', params={'page': 1})
+        response = session.get(f'{BASE_URL}/fees', params={'page': 1})
         # Xano returns 400 (Bad Request) for missing required parameters
         if response.status_code == 400:
             print_test("GET /fees - Missing API key (error handling)", "PASS")
@@ -221,7 +289,7 @@ def test_get_fees(api_key: str):
     
     # Test 6: Invalid API key
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees',
             params={'api_key': 'invalid_key_12345'}
         )
@@ -236,9 +304,9 @@ def test_get_fees(api_key: str):
 
 def test_get_fees_by_id(api_key: str):
     """Test GET /fees/{id} endpoint"""
-    print("\n" + "="*60)
-    print("Testing GET /fees/{id}")
-    print("="*60)
+    log("\n" + "="*60)
+    log("Testing GET /fees/{id}")
+    log("="*60)
     
     if not api_key:
         print_test("GET /fees/{id} - Skipped", "WARN", "No API key available")
@@ -246,7 +314,7 @@ def test_get_fees_by_id(api_key: str):
     
     # Test 1: Valid ID
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees/1',
             params={'api_key': api_key}
         )
@@ -262,9 +330,49 @@ def test_get_fees_by_id(api_key: str):
     except Exception as e:
         print_test("GET /fees/{id} - Valid ID (1)", "FAIL", str(e))
     
-    # Test 2: Invalid ID (404)
+    # Test 2: Nested response shape (the record and its four relationships)
+    try:
+        response = session.get(
+            f'{BASE_URL}/fees/1',
+            params={'api_key': api_key}
+        )
+        response.raise_for_status()
+        data = response.json()
+        
+        fee_keys = {'id', 'subcategory_id', 'source_id', 'name', 'amount', 'currency', 'service_type',
+                    'payment_code', 'description', 'meta', 'created_at', 'updated_at'}
+        problems = [f"missing fee fields: {sorted(fee_keys - set(data))}"] if fee_keys - set(data) else []
+        
+        # A relationship key is present exactly when the fee references it, and
+        # is null only if the referenced row does not exist
+        for key, parent_key, child in (('subcategory', 'subcategory_id', 'category'), ('source', 'source_id', 'agency')):
+            if data.get(parent_key) is None:
+                if key in data:
+                    problems.append(f"'{key}' present although {parent_key} is null")
+                continue
+            nested = data.get(key)
+            if key not in data:
+                problems.append(f"'{key}' missing")
+            elif nested is not None:
+                if nested.get('id') != data[parent_key]:
+                    problems.append(f"{key}.id does not match {parent_key}")
+                child_id = nested.get(f'{child}_id')
+                if (child in nested) != (child_id is not None):
+                    problems.append(f"'{key}.{child}' presence does not match {key}.{child}_id")
+                elif nested.get(child) is not None and nested[child].get('id') != child_id:
+                    problems.append(f"{key}.{child}.id does not match {key}.{child}_id")
+        
+        if problems:
+            print_test("GET /fees/{id} - Nested shape", "FAIL", "; ".join(problems))
+        else:
+            print_test("GET /fees/{id} - Nested shape", "PASS",
+                      f"subcategory: {'subcategory' in data}, source: {'source' in data}")
+    except Exception as e:
+        print_test("GET /fees/{id} - Nested shape", "FAIL", str(e))
+    
+    # Test 3: Invalid ID (404)
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees/99999',
             params={'api_key': api_key}
         )
@@ -276,9 +384,9 @@ def test_get_fees_by_id(api_key: str):
     except Exception as e:
         print_test("GET /fees/{id} - Invalid ID", "WARN", str(e))
     
-    # Test 3: Missing API key
+    # Test 4: Missing API key
     try:
-        response = requests.get(f'{BASE_URL}/fees/1')
+        response = session.get(f'{BASE_URL}/fees/1')
         # Xano returns 400 (Bad Request) for missing required parameters
         if response.status_code == 400:
             print_test("GET /fees/{id} - Missing API key", "PASS")
@@ -290,9 +398,9 @@ def test_get_fees_by_id(api_key: str):
 
 def test_get_fees_search(api_key: str):
     """Test GET /fees/search endpoint"""
-    print("\n" + "="*60)
-    print("Testing GET /fees/search")
-    print("="*60)
+    log("\n" + "="*60)
+    log("Testing GET /fees/search")
+    log("="*60)
     
     if not api_key:
         print_test("GET /fees/search - Skipped", "WARN", "No API key available")
@@ -300,7 +408,7 @@ def test_get_fees_search(api_key: str):
     
     # Test 1: Valid search
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees/search',
             params={'q': 'NIN', 'api_key': api_key}
         )
@@ -318,7 +426,7 @@ def test_get_fees_search(api_key: str):
     
     # Test 2: Search too short
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees/search',
             params={'q': 'a', 'api_key': api_key}
         )
@@ -332,7 +440,7 @@ def test_get_fees_search(api_key: str):
     
     # Test 3: Missing query parameter
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/fees/search',
             params={'api_key': api_key}
         )
@@ -346,16 +454,16 @@ def test_get_fees_search(api_key: str):
 
 def test_get_categories(api_key: str):
     """Test GET /categories endpoint"""
-    print("\n" + "="*60)
-    print("Testing GET /categories")
-    print("="*60)
+    log("\n" + "="*60)
+    log("Testing GET /categories")
+    log("="*60)
     
     if not api_key:
         print_test("GET /categories - Skipped", "WARN", "No API key available")
         return
     
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/categories',
             params={'api_key': api_key}
         )
@@ -384,16 +492,16 @@ def test_get_categories(api_key: str):
 
 def test_get_metadata(api_key: str):
     """Test GET /metadata endpoint"""
-    print("\n" + "="*60)
-    print("Testing GET /metadata")
-    print("="*60)
+    log("\n" + "="*60)
+    log("Testing GET /metadata")
+    log("="*60)
     
     if not api_key:
         print_test("GET /metadata - Skipped", "WARN", "No API key available")
         return
     
     try:
-        response = requests.get(
+        response = session.get(
             f'{BASE_URL}/metadata',
             params={'api_key': api_key}
         )
@@ -433,24 +541,117 @@ def test_get_metadata(api_key: str):
     except Exception as e:
         print_test("GET /metadata - Basic request", "FAIL", str(e))
 
+def median_ms(latencies) -> float:
+    return statistics.median(latencies) * 1000 if latencies else 0.0
+
 def test_rate_limiting(api_key: str):
-    """Test rate limiting (100 requests/hour)"""
-    print("\n" + "="*60)
-    print("Testing Rate Limiting")
-    print("="*60)
+    """Test rate limiting (100 requests/hour) under concurrent load"""
+    log("\n" + "="*60)
+    log("Testing Rate Limiting")
+    log("="*60)
     
     if not api_key:
         print_test("Rate Limiting - Skipped", "WARN", "No API key available")
         return
     
-    # Note: We won't actually hit 100 requests in this test
-    # But we can verify the rate limiting logic exists
-    print_test("Rate Limiting - Test setup", "INFO",
-              "Rate limit is 100 requests/hour per API key")
-    print_test("Rate Limiting - Manual verification needed", "WARN",
-              "To fully test, make 101 requests rapidly and verify 101st is blocked")
+    # Use a fresh key so the requests made by earlier tests don't count
+    try:
+        response = session.post(f'{BASE_URL}/api_key/generate', json={}, headers={'Accept': 'application/json'})
+        response.raise_for_status()
+        burst_key = response.json()['api_key']
+    except Exception as e:
+        print_test("Rate Limiting - Generate burst key", "FAIL", str(e))
+        return
+    
+    # Fire more requests than the limit allows, all at once from one key
+    limit = RATE_LIMIT
+    burst = RATE_LIMIT_BURST
+    
+    def send(path: str, params: Dict[str, Any]):
+        started = time.perf_counter()
+        status = session.get(f'{BASE_URL}{path}', params=params, headers={'Accept': 'application/json'}).status_code
+        return status, time.perf_counter() - started
+    
+    # Baseline: the same burst against /docs, which runs no key check or limiter
+    with ThreadPoolExecutor(max_workers=RATE_LIMIT_WORKERS) as pool:
+        baseline = list(pool.map(lambda _: send('/docs', {}), range(burst)))
+        results = list(pool.map(lambda _: send('/metadata', {'api_key': burst_key}), range(burst)))
+    
+    statuses = [status for status, _ in results]
+    passed = statuses.count(200)
+    blocked = sum(1 for status in statuses if status in (401, 403, 429))
+    other = burst - passed - blocked
+    summary = (f"{burst} concurrent requests from {RATE_LIMIT_WORKERS} threads: {passed} passed, "
+               f"{blocked} blocked ({statuses.count(403)} with 403), {other} other")
+    
+    if passed > limit:
+        print_test("Rate Limiting - Concurrent burst", "FAIL",
+                  f"{summary} (more than {limit} got through)")
+    elif blocked == 0:
+        print_test("Rate Limiting - Concurrent burst", "FAIL", f"{summary} (nothing was blocked)")
+    elif other or passed < limit:
+        print_test("Rate Limiting - Concurrent burst", "WARN", f"{summary} (expected exactly {limit} to pass)")
+    else:
+        print_test("Rate Limiting - Concurrent burst", "PASS", summary)
+    
+    # A blocked request stops at the limiter, so blocked minus /docs is
+    # roughly what the key check and limiter add to every request
+    docs_ms = median_ms([elapsed for _, elapsed in baseline])
+    passed_ms = median_ms([elapsed for status, elapsed in results if status == 200])
+    blocked_ms = median_ms([elapsed for status, elapsed in results if status in (401, 403, 429)])
+    print_test("Rate Limiting - Limiter latency", "PASS",
+              f"median /docs {docs_ms:.1f}ms, passed /metadata {passed_ms:.1f}ms, blocked {blocked_ms:.1f}ms "
+              f"(key check + limiter ~{blocked_ms - docs_ms:.1f}ms)")
+    
+    test_rate_limit_window(burst_key)
+
+def test_rate_limit_window(burst_key: str):
+    """Check that a key blocked by the limiter is let through again an hour after its window opened"""
+    if standin_server is None:
+        print_test("Rate Limiting - Window reset", "WARN",
+                  "Not checked against a live API (the window lasts an hour); run with --standin")
+        return
+    
+    standin = standin_server.standin
+    clock = standin.limiter.clock
+    record = standin.key_record(burst_key)
+    window_seconds = standin.limiter.window_seconds
+    old_window = standin.limiter.window(record['id'])
+    resets_at = old_window['resets_at']
+    
+    def status():
+        return session.get(f'{BASE_URL}/metadata', params={'api_key': burst_key}).status_code
+    
+    # One second before the window ends the key is still blocked
+    clock.advance(resets_at - clock() - 1)
+    before_reset = status()
+    
+    # At the window's start + 1h the next request opens a new window,
+    # counted from 1
+    clock.advance(1.001)
+    after_reset = status()
+    new_record = standin.key_record(burst_key)
+    window = standin.limiter.window(new_record['id'])
+    
+    problems = []
+    if before_reset != 403:
+        problems.append(f"1s before the reset: expected 403, got {before_reset}")
+    if after_reset != 200:
+        problems.append(f"at the reset: expected 200, got {after_reset}")
+    if window['started_at'] < old_window['resets_at']:
+        problems.append("the window did not move on")
+    if new_record['request_count'] != record['request_count'] + 1:
+        problems.append("request_count did not carry on from its lifetime total")
+    if window['count'] != 1:
+        problems.append(f"new window count is {window['count']}, expected 1")
+    
+    if problems:
+        print_test("Rate Limiting - Window reset", "FAIL", "; ".join(problems))
+    else:
+        print_test("Rate Limiting - Window reset", "PASS",
+                  f"403 until the window's start + {window_seconds:g}s, then 200 with a new window")
 
-def print_summary():
+def print_summary(wall_time: Optional[float] = None, workers: int = 1):
     """Print test summary"""
     print("\n" + "="*60)
     print("TEST SUMMARY")
@@ -468,56 +669,110 @@ def print_summary():
     success_rate = (len(test_results['passed']) / test_results['total'] * 100) if test_results['total'] > 0 else 0
     print(f"\nSuccess Rate: {success_rate:.1f}%")
     
+    if wall_time is not None:
+        timings = test_results['timings']
+        print(f"Wall time: {wall_time:.2f}s with {workers} worker(s) "
+              f"(sum of test times: {sum(timings.values()):.2f}s)")
+        if timings:
+            slowest = max(timings, key=timings.get)
+            print(f"Slowest test: {slowest} ({timings[slowest]:.2f}s)")
+    
     # Save results to file
     with open('test_results.json', 'w') as f:
         json.dump({
             'timestamp': datetime.now().isoformat(),
+            'base_url': BASE_URL,
+            'workers': workers,
             'summary': {
                 'total': test_results['total'],
                 'passed': len(test_results['passed']),
                 'failed': len(test_results['failed']),
                 'warnings': len(test_results['warnings']),
-                'success_rate': success_rate
+                'success_rate': success_rate,
+                'wall_time_seconds': round(wall_time, 3) if wall_time is not None else None
             },
             'passed': test_results['passed'],
             'failed': test_results['failed'],
-            'warnings': test_results['warnings']
+            'warnings': test_results['warnings'],
+            'timings_seconds': test_results['timings']
         }, f, indent=2)
     
     print("\nTest results saved to: test_results.json")
 
+# Test cases that only need an API key and don't depend on each other
+AUTHENTICATED_TESTS = [
+    test_get_fees,
+    test_get_fees_by_id,
+    test_get_fees_search,
+    test_get_categories,
+    test_get_metadata
+]
+
 def main():
     """Run all tests"""
+    global BASE_URL, RATE_LIMIT_BURST, standin_server
+    parser = argparse.ArgumentParser(description='Test every endpoint of the Nigerian Government Fees API')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Run independent test cases concurrently on this many threads (default: 1)')
+    parser.add_argument('--base-url', default=BASE_URL, help='API base URL (default: the live API)')
+    parser.add_argument('--standin', action='store_true',
+                        help='Test a local stand-in server (fees_standin.py) instead of --base-url')
+    parser.add_argument('--rate-limit', action='store_true',
+                        help='Run the rate limit test against --base-url too (always runs with --standin)')
+    parser.add_argument('--burst', type=int, default=RATE_LIMIT_BURST,
+                        help=f'Concurrent requests fired at one key by the rate limit test (default: {RATE_LIMIT_BURST})')
+    args = parser.parse_args()
+    workers = max(1, args.workers)
+    configure_session(max(workers, RATE_LIMIT_WORKERS))
+    
+    BASE_URL = args.base_url
+    RATE_LIMIT_BURST = args.burst
+    if args.standin:
+        from fees_standin import Clock, FeesStandIn, start_server
+        standin_server = start_server(FeesStandIn(rate_limit=RATE_LIMIT, clock=Clock()))
+        BASE_URL = standin_server.base_url
+    
     print("="*60)
     print("Nigerian Government Fees API - Test Suite")
     print("="*60)
     print(f"Base URL: {BASE_URL}")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Test public endpoints first
-    test_get_docs()
-    api_key = test_generate_api_key()
-    
-    # If we couldn't generate a key, try using a placeholder
-    # (User will need to provide their own key)
-    if not api_key:
-        print("\n⚠️  Could not generate API key. Some tests will be skipped.")
-        print("   You can provide an API key by setting it in the script.")
-        api_key = None  # User can manually set this
-    
-    # Test authenticated endpoints
-    if api_key:
-        test_get_fees(api_key)
-        test_get_fees_by_id(api_key)
-        test_get_fees_search(api_key)
-        test_get_categories(api_key)
-        test_get_metadata(api_key)
-        test_rate_limiting(api_key)
-    else:
-        print("\n⚠️  Skipping authenticated endpoint tests (no API key)")
+    print(f"Workers: {workers}")
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Test public endpoints first (/docs needs no key, so it runs alongside key generation)
+        docs = pool.submit(run_test, test_get_docs)
+        if workers == 1:
+            docs.result()
+        api_key = pool.submit(run_test, test_generate_api_key).result()
+        
+        # If we couldn't generate a key, try using a placeholder
+        # (User will need to provide their own key)
+        if not api_key:
+            print("\n⚠️  Could not generate API key. Some tests will be skipped.")
+            print("   You can provide an API key by setting it in the script.")
+            api_key = None  # User can manually set this
+        
+        # Test authenticated endpoints
+        if api_key:
+            for test in [pool.submit(run_test, test, api_key) for test in AUTHENTICATED_TESTS]:
+                test.result()
+        else:
+            print("\n⚠️  Skipping authenticated endpoint tests (no API key)")
+        docs.result()
+    
+    # Alone, after the parallel phase: the burst would otherwise compete with
+    # the tests above for threads and connections
+    if api_key and (args.standin or args.rate_limit):
+        run_test(test_rate_limiting, api_key)
+    elif api_key:
+        print_test("Rate Limiting - Skipped", "WARN",
+                  f"Not run against a live API (it creates a key and spends {RATE_LIMIT_BURST} requests); "
+                  "pass --rate-limit to run it")
     
     # Print summary
-    print_summary()
+    print_summary(time.perf_counter() - started, workers)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,86 @@
+// Apply a change in catalog counts to the catalog_stats row instead of recounting the catalog
+// Each statement is a single UPDATE that adds to the stored value, so concurrent writers
+// cannot overwrite each other's deltas; the nightly refresh_catalog_stats task is the only
+// full recount and corrects any drift
+function "catalog_stats/apply_delta" {
+  input {
+    // Change per total, e.g. {total_fees: -1} or {total_agencies: 3}
+    json totals?
+  
+    // Change in fee count per category id, e.g. {"3": 2, "5": -1}
+    json category_fee_counts?
+  
+    // Fees were added, changed or deleted, so last_database_update moves
+    bool fees_changed?=false
+  }
+
+  stack {
+    var $totals {
+      value = $input.totals|first_notnull:{}
+    }
+  
+    var $category_deltas {
+      value = $input.category_fee_counts|first_notnull:{}
+    }
+  
+    // Column names go into the SQL text, so only the summary's own totals are accepted
+    precondition ((($totals|keys)|diff:["total_fees", "total_categories", "total_agencies", "total_subcategories", "total_sources"]|count) == 0) {
+      error_type = "inputerror"
+      error = "Unknown catalog_stats total"
+    }
+  
+    db.get catalog_stats {
+      field_name = "id"
+      field_value = 1
+    } as $existing
+  
+    conditional {
+      // No summary row yet: build it from scratch, which already counts this write
+      if ($existing == null) {
+        function.run "catalog_stats/refresh" {
+          input = {}
+        } as $stats
+      }
+    
+      else {
+        foreach ($totals|keys) {
+          each as $column {
+            db.direct_query {
+              sql = "UPDATE catalog_stats SET " ~ $column ~ " = COALESCE(" ~ $column ~ ", 0) + ? WHERE id = 1"
+              response_type = "list"
+              arg = $totals|get:$column
+            }
+          }
+        }
+      
+        foreach ($category_deltas|keys) {
+          each as $category_id {
+            db.direct_query {
+              sql = "UPDATE catalog_stats SET category_fee_counts = COALESCE(category_fee_counts, '{}'::jsonb) || jsonb_build_object(?::text, COALESCE((category_fee_counts ->> ?::text)::int, 0) + ?) WHERE id = 1"
+              response_type = "list"
+              arg = $category_id
+              arg = $category_id
+              arg = $category_deltas|get:$category_id
+            }
+          }
+        }
+      
+        conditional {
+          if ($input.fees_changed) {
+            db.direct_query {
+              sql = "UPDATE catalog_stats SET last_database_update = GREATEST(COALESCE(last_database_update, 0), ?) WHERE id = 1"
+              response_type = "list"
+              arg = now
+            }
+          }
+        }
+      }
+    }
+  
+    var $result {
+      value = {totals: $totals, category_fee_counts: $category_deltas}
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
@@ -1,23 +1,40 @@
-// Authentication function for API key validation
-// Checks Authorization: Bearer {key} or x-api-key: {key} headers
-// Validates API key from headers, checks against api_keys table, and updates request tracking
+// Authentication and rate limiting for every public endpoint
+// Accepts the api_key query parameter with or without a "Bearer " prefix
+// Validates the key, enforces 100 requests/hour atomically, and records usage (see API_KEY_ACCOUNTING)
 function "auth/api_key" {
   input {
-    // API key from Authorization header or x-api-key header
+    // API key from the api_key query parameter
     text api_key?
   }
 
   stack {
+    var $api_key_value {
+      value = $input.api_key
+    }
+  
+    // If api_key starts with "Bearer ", extract the actual key
+    conditional {
+      if ($api_key_value != null && (($api_key_value|index:"Bearer ") == 0)) {
+        var.update $api_key_value {
+          value = $api_key_value|replace:"Bearer ":""
+        }
+  
+        var.update $api_key_value {
+          value = $api_key_value|trim
+        }
+      }
+    }
+  
     // Check if API key was provided
-    precondition ($input.api_key != null && ($input.api_key|strlen) > 0) {
+    precondition ($api_key_value != null && ($api_key_value|strlen) > 0) {
       error_type = "accessdenied"
-      error = "Missing API Key. Please provide Authorization: Bearer {key} or x-api-key: {key} header."
+      error = "Missing API Key. Please provide api_key query parameter."
     }
   
     // Query api_keys table for matching key
     db.get api_keys {
       field_name = "key"
-      field_value = $input.api_key
+      field_value = $api_key_value
     } as $key_record
   
     // Check if key exists and is active
@@ -26,13 +43,150 @@ function "auth/api_key" {
       error = "Invalid or inactive API Key."
     }
   
-    // Increment request_count and update last_request_at
-    db.edit api_keys {
-      field_name = "id"
-      field_value = $key_record.id
-      data = {
-        request_count  : ($key_record.request_count|first_notnull:0) + 1
-        last_request_at: now
+    // ===== RATE LIMITING BLOCK START =====
+    // This entire block can be removed to disable rate limiting
+    // Rate limit: 100 requests per hour per API key
+  
+    // Limit, window and the limiter's error message, shared by the Redis
+    // limiter, its error check and the database fallback below
+    var $rate_limit {
+      value = {max: 100, window_seconds: 3600, error: "Rate limit exceeded"}
+    }
+  
+    // redis.ratelimit increments the key's counter and opens a fresh window
+    // when the previous one has expired in one atomic step, so simultaneous
+    // requests cannot both read 99 and both pass
+    var $rate_limited {
+      value = false
+    }
+  
+    // Set when Redis itself fails (outage, timeout) rather than the limit being hit
+    var $redis_failed {
+      value = false
+    }
+  
+    try_catch {
+      try {
+        redis.ratelimit {
+          key = "ratelimit:api_key:" ~ ($key_record.id|to_text)
+          max = $rate_limit.max
+          ttl = $rate_limit.window_seconds
+          error = $rate_limit.error
+        } as $rate_limit_status
+      }
+  
+      // Only the limiter's own error means the key is over its budget. Any
+      // other error is Redis being unavailable, and the key is then limited
+      // by the database fallback below instead of locking out every key
+      // (see Rate Limits in API_DOCUMENTATION.md)
+      catch {
+        conditional {
+          if ($error.message == $rate_limit.error) {
+            var.update $rate_limited {
+              value = true
+            }
+          }
+        
+          else {
+            var.update $redis_failed {
+              value = true
+            }
+          
+            debug.log {
+              value = "rate limiter unavailable, using the database fallback for api key " ~ ($key_record.id|to_text) ~ ": " ~ ($error.message|first_notnull:"unknown error")
+            }
+          }
+        }
+      }
+    }
+  
+    // Database fallback while Redis is down: one conditional UPDATE opens a
+    // new window at last_reset_at once the previous one has expired, counts
+    // the request, and matches no row once the window holds the maximum.
+    // Postgres locks the row for the UPDATE, so concurrent requests cannot
+    // both take the last slot. It also records the request's usage
+    conditional {
+      if ($redis_failed) {
+        var $window_expired_before {
+          value = now - ($rate_limit.window_seconds * 1000)
+        }
+      
+        db.direct_query {
+          sql = "UPDATE api_keys SET window_request_count = CASE WHEN last_reset_at IS NULL OR last_reset_at <= ? THEN 1 ELSE COALESCE(window_request_count, 0) + 1 END, last_reset_at = CASE WHEN last_reset_at IS NULL OR last_reset_at <= ? THEN ? ELSE last_reset_at END, request_count = COALESCE(request_count, 0) + 1, last_request_at = ? WHERE id = ? AND (last_reset_at IS NULL OR last_reset_at <= ? OR COALESCE(window_request_count, 0) < ?) RETURNING id"
+          response_type = "list"
+          arg = $window_expired_before
+          arg = $window_expired_before
+          arg = now
+          arg = now
+          arg = $key_record.id
+          arg = $window_expired_before
+          arg = $rate_limit.max
+        } as $fallback_counted
+      
+        var.update $rate_limited {
+          value = ($fallback_counted|count) == 0
+        }
+      }
+    }
+  
+    // Keep the existing 403 error contract
+    precondition ($rate_limited == false) {
+      error_type = "accessdenied"
+      error = "Rate limit exceeded. Maximum 100 requests per hour. Please try again later."
+    }
+  
+    // ===== RATE LIMITING BLOCK END =====
+  
+    // Usage accounting: "exact" writes api_keys on every request; "batched"
+    // (the default) buffers the increment in Redis and the flush_api_key_usage
+    // task folds it into api_keys, so a read request stays a read. With
+    // Redis down the fallback UPDATE above has already recorded the request
+    var $accounting_mode {
+      value = $redis_failed ? "fallback" : ($env.API_KEY_ACCOUNTING|first_notnull:"batched")
+    }
+  
+    conditional {
+      if ($accounting_mode == "exact") {
+        // Increment request_count and update last_request_at in a single
+        // additive write, so concurrent requests and flushes cannot overwrite
+        // each other's counts
+        db.direct_query {
+          sql = "UPDATE api_keys SET request_count = COALESCE(request_count, 0) + 1, last_request_at = ? WHERE id = ?"
+          response_type = "list"
+          arg = now
+          arg = $key_record.id
+        } as $usage_applied
+      }
+    
+      elseif ($accounting_mode == "batched") {
+        // One list per key per minute with one element per request, so
+        // auth/flush_usage can take a past minute's requests with atomic
+        // shifts without racing new requests
+        var $usage_entry {
+          value = ($key_record.id|to_text) ~ ":" ~ ((now / 60000)|floor|to_text)
+        }
+      
+        redis.push {
+          key = "usage:api_key:" ~ $usage_entry
+          value = 1
+        } as $buffered_count
+      
+        // The first request on the list queues it for the flush, so the
+        // flush never has to scan the keyspace
+        conditional {
+          if ($buffered_count == 1) {
+            redis.push {
+              key = "usage:pending"
+              value = $usage_entry
+            } as $pending_length
+          }
+        }
+      
+        redis.set {
+          key = "usage:last_request_at:" ~ ($key_record.id|to_text)
+          data = now
+          ttl = 86400
+        }
       }
     }
   
@@ -40,6 +194,6 @@ function "auth/api_key" {
       value = {key_record: $key_record, authenticated: true}
     }
   }
-
+  
   response = $result
 }
\ No newline at end of file
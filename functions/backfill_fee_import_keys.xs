@@ -0,0 +1,101 @@
+// Set natural_key and content_hash on fees imported before idempotent imports (run once after deploying)
+// Exact duplicates left by earlier re-seeds are deleted (keeping the lowest id); rows that share
+// a natural key but differ in content are left unkeyed and reported for manual review
+function "fees/backfill_import_keys" {
+  input {
+  }
+
+  stack {
+    db.query fees {
+      where = $db.fees.natural_key != null
+      output = ["id", "natural_key", "content_hash"]
+      return = {type: "list"}
+    } as $keyed_fees
+  
+    var $keys {
+      value = $keyed_fees|index_by:"natural_key"
+    }
+  
+    db.query fees {
+      where = $db.fees.natural_key == null
+      sort = {fees.id: "asc"}
+      return = {type: "list"}
+    } as $unkeyed_fees
+  
+    var $result {
+      value = {keyed: 0, duplicates_removed: 0}
+    }
+  
+    var $conflicts {
+      value = []
+    }
+  
+    foreach ($unkeyed_fees) {
+      each as $fee {
+        function.run "fees/import_key" {
+          input = {
+            subcategory_id: $fee.subcategory_id
+            source_id     : $fee.source_id
+            name          : $fee.name
+            amount        : $fee.amount
+            currency      : $fee.currency
+            service_type  : $fee.service_type
+            payment_code  : $fee.payment_code
+            description   : $fee.description
+            meta          : $fee.meta
+          }
+        } as $import_key
+      
+        var $keeper {
+          value = $keys|get:$import_key.natural_key:null
+        }
+      
+        conditional {
+          if ($keeper == null) {
+            // Key only: updated_at is left alone so /fees/changes does not report every fee
+            db.edit fees {
+              field_name = "id"
+              field_value = $fee.id
+              data = {
+                natural_key : $import_key.natural_key
+                content_hash: $import_key.content_hash
+              }
+            }
+          
+            var.update $keys {
+              value = $keys
+                |set:$import_key.natural_key:{id: $fee.id, content_hash: $import_key.content_hash}
+            }
+          
+            var.update $result {
+              value = $result|set:"keyed":($result.keyed + 1)
+            }
+          }
+        
+          elseif ($keeper.content_hash == $import_key.content_hash) {
+            function.run "fees/delete" {
+              input = {fee_id: $fee.id}
+            }
+          
+            var.update $result {
+              value = $result
+                |set:"duplicates_removed":($result.duplicates_removed + 1)
+            }
+          }
+        
+          else {
+            array.push $conflicts {
+              value = {id: $fee.id, duplicate_of: $keeper.id, natural_key: $import_key.natural_key}
+            }
+          }
+        }
+      }
+    }
+  
+    var.update $result {
+      value = $result|set:"conflicts":$conflicts
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
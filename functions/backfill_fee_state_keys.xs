@@ -0,0 +1,54 @@
+// Set meta.state_key on fees whose key is missing or out of step with meta.state: rows
+// stored before GET /fees matched on it, or written outside fees/import_key (the import
+// paths). Runs after deploying and nightly (tasks/backfill_fee_state_keys.xs).
+// The content_hash is recomputed with the key included, so the next import does not rewrite
+// these rows; updated_at is left alone so /fees/changes does not report them
+function "fees/backfill_state_keys" {
+  input {
+  }
+
+  stack {
+    db.query fees {
+      where = $db.fees.meta != null
+      sort = {fees.id: "asc"}
+      return = {type: "list"}
+    } as $fees
+  
+    var $result {
+      value = {keyed: 0}
+    }
+  
+    foreach ($fees|filter:(($$.meta|get:"state":null) != null && ($$.meta|get:"state_key":null) != ($$.meta.state|to_lower))) {
+      each as $fee {
+        function.run "fees/import_key" {
+          input = {
+            subcategory_id: $fee.subcategory_id
+            source_id     : $fee.source_id
+            name          : $fee.name
+            amount        : $fee.amount
+            currency      : $fee.currency
+            service_type  : $fee.service_type
+            payment_code  : $fee.payment_code
+            description   : $fee.description
+            meta          : $fee.meta
+          }
+        } as $import_key
+      
+        db.edit fees {
+          field_name = "id"
+          field_value = $fee.id
+          data = {
+            meta        : $import_key.data.meta
+            content_hash: $import_key.content_hash
+          }
+        }
+      
+        var.update $result {
+          value = $result|set:"keyed":($result.keyed + 1)
+        }
+      }
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
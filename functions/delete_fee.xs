@@ -0,0 +1,60 @@
+// Delete a fee and record a tombstone so GET /fees/changes can report the deletion
+function "fees/delete" {
+  input {
+    // ID of the fee to delete
+    int fee_id filters=min:1
+  }
+
+  stack {
+    db.get fees {
+      field_name = "id"
+      field_value = $input.fee_id
+    } as $fee
+  
+    precondition ($fee != null) {
+      error_type = "notfound"
+      error = "Fee not found with ID " ~ ($input.fee_id|to_text)
+    }
+  
+    // Category whose fee count drops (none if the subcategory link is broken)
+    db.get subcategories {
+      field_name = "id"
+      field_value = $fee.subcategory_id
+    } as $subcategory
+  
+    // Delete and tombstone together so delta sync never misses a deletion
+    db.transaction {
+      stack {
+        db.del fee_search_index {
+          field_name = "fee_id"
+          field_value = $input.fee_id
+        }
+      
+        db.del fees {
+          field_name = "id"
+          field_value = $input.fee_id
+        }
+      
+        db.add fee_tombstones {
+          data = {fee_id: $input.fee_id, deleted_at: now}
+        } as $tombstone
+      }
+    }
+  
+    // Keep the /metadata and /categories summary row current with a delta
+    // rather than recounting the whole catalog for one deletion
+    function.run "catalog_stats/apply_delta" {
+      input = {
+        totals             : {total_fees: -1}
+        category_fee_counts: ($subcategory != null) ? ({}|set:($subcategory.category_id|to_text):-1) : {}
+        fees_changed       : true
+      }
+    } as $catalog_stats
+  
+    var $result {
+      value = {deleted: true, fee_id: $input.fee_id}
+    }
+  }
+
+  response = $result
+}
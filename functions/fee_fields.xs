@@ -0,0 +1,52 @@
+// Parse the fields= projection shared by /fees and /fees/{id}
+// Returns the requested field names, or [] for the full record; compact=true
+// without fields selects the list-view fields (id, name, amount, currency)
+function "fees/fields" {
+  input {
+    // Comma-separated field names from the fields query parameter
+    text fields?
+  
+    // Return the compact field set when no fields are given
+    bool compact?=false
+  
+    // Field names the endpoint can return
+    json allowed
+  }
+
+  stack {
+    var $requested {
+      value = ($input.fields|first_notnull:"")|split:","
+    }
+  
+    array.map ($requested) {
+      by = $this|trim|to_lower
+    } as $requested
+  
+    var $fields {
+      value = ($requested|filter:(($$|strlen) > 0))|unique
+    }
+  
+    var $unknown {
+      value = $fields|diff:$input.allowed
+    }
+  
+    precondition (($unknown|count) == 0) {
+      error_type = "inputerror"
+      error = "Unknown field(s): " ~ ($unknown|join:", ") ~ ". Allowed: " ~ ($input.allowed|join:", ")
+    }
+  
+    conditional {
+      if (($fields|count) == 0 && $input.compact) {
+        var.update $fields {
+          value = ["id", "name", "amount", "currency"]
+        }
+      }
+    }
+  
+    var $result {
+      value = {fields: $fields}
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
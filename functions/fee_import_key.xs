@@ -0,0 +1,63 @@
+// Natural key and content hash of a fee row for idempotent imports
+// natural_key identifies the fee across re-imports (subcategory + name + service type);
+// content_hash changes only when a stored field changes, so unchanged rows can be skipped
+function "fees/import_key" {
+  input {
+    int subcategory_id
+    int source_id?
+    text name filters=trim
+    decimal amount?
+    text currency? filters=trim|upper
+    text service_type? filters=trim
+    text payment_code? filters=trim
+    text description?
+    json meta?
+  }
+
+  stack {
+    // The row as it will be stored (empty strings are stored as null)
+    var $data {
+      value = {
+        subcategory_id: $input.subcategory_id
+        source_id     : $input.source_id
+        name          : $input.name
+        amount        : $input.amount
+        currency      : (($input.currency|strlen) > 0) ? $input.currency : null
+        service_type  : (($input.service_type|strlen) > 0) ? $input.service_type : null
+        payment_code  : (($input.payment_code|strlen) > 0) ? $input.payment_code : null
+        description   : (($input.description|strlen) > 0) ? $input.description : null
+        meta          : $input.meta
+      }
+    }
+  
+    // meta.state_key is the lowercased state, matched by GET /fees?state=
+    conditional {
+      if (($input.meta|get:"state":null) != null) {
+        var.update $data {
+          value = $data
+            |set:"meta":($input.meta|set:"state_key":($input.meta.state|to_lower))
+        }
+      }
+    }
+  
+    var $natural_key {
+      value = [$input.subcategory_id|to_text, $input.name|to_lower, $input.service_type|first_notnull:""|to_lower]|join:"|"
+    }
+  
+    var $content_hash {
+      value = $data|json_encode|sha256
+    }
+  
+    var $result {
+      value = {
+        natural_key : $natural_key
+        content_hash: $content_hash
+        data        : $data
+          |set:"natural_key":$natural_key
+          |set:"content_hash":$content_hash
+      }
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
@@ -0,0 +1,66 @@
+// Compute a fee's fee_search_index row (search_text, name_text, search_terms, name_terms, words)
+function "fees/search_terms" {
+  input {
+    text name?
+    text description?
+    text service_type?
+    text payment_code?
+  }
+
+  stack {
+    function.run "search/trigrams" {
+      input = {value: $input.name}
+    } as $name_index
+  
+    // Each field is normalized on its own and the fields are joined with
+    // " | ", which normalized queries never contain, so a substring match
+    // stays inside one field
+    var $field_texts {
+      value = ($name_index.normalized != "") ? [$name_index.normalized] : []
+    }
+  
+    var $search_grams {
+      value = $name_index.grams
+    }
+  
+    foreach ([$input.service_type, $input.payment_code, $input.description]) {
+      each as $field {
+        function.run "search/trigrams" {
+          input = {value: $field}
+        } as $field_index
+      
+        conditional {
+          if ($field_index.normalized != "") {
+            array.push $field_texts {
+              value = $field_index.normalized
+            }
+          
+            array.merge $search_grams {
+              value = $field_index.grams
+            }
+          }
+        }
+      }
+    }
+  
+    var $search_text {
+      value = $field_texts|join:" | "
+    }
+  
+    function.run "search/words" {
+      input = {value: $search_text}
+    } as $full_words
+  
+    var $result {
+      value = {
+        search_text : $search_text
+        name_text   : $name_index.normalized
+        search_terms: $search_grams|unique
+        name_terms  : $name_index.grams
+        words       : $full_words.words
+      }
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
@@ -0,0 +1,129 @@
+// Fold usage buffered in Redis by auth/api_key (batched accounting) into api_keys
+// One UPDATE per active key per minute instead of one write per request
+function "auth/flush_usage" {
+  input {
+  }
+
+  stack {
+    // auth/api_key queues "<key id>:<minute>" on usage:pending the first time
+    // a key is used in a minute, so only counters with pending usage are
+    // visited and no KEYS scan is needed
+    var $current_minute {
+      value = (now / 60000)|floor
+    }
+  
+    redis.count {
+      key = "usage:pending"
+    } as $pending_entries
+  
+    var $flushed {
+      value = {keys: 0, requests: 0}
+    }
+  
+    // Only the entries queued before this flush started; later ones wait for the next run
+    for ($pending_entries) {
+      each as $index {
+        redis.shift {
+          key = "usage:pending"
+        } as $usage_entry
+      
+        conditional {
+          if ($usage_entry != null) {
+            var $entry_parts {
+              value = $usage_entry|split:":"
+            }
+          
+            var $key_id {
+              value = ($entry_parts|first)|to_int
+            }
+          
+            var $counter_key {
+              value = "usage:api_key:" ~ $usage_entry
+            }
+          
+            conditional {
+              // The current minute is still being counted: requeue it
+              if ((($entry_parts|last)|to_int) >= $current_minute) {
+                redis.push {
+                  key = "usage:pending"
+                  value = $usage_entry
+                } as $pending_length
+              }
+            
+              else {
+                redis.count {
+                  key = $counter_key
+                } as $queued_requests
+              
+                // Each request is one element on the minute's list. Shifting
+                // takes elements one at a time and atomically, so a late push
+                // is never lost, and Redis drops the list once it is empty
+                var $pending_count {
+                  value = 0
+                }
+              
+                for ($queued_requests) {
+                  each as $request_index {
+                    redis.shift {
+                      key = $counter_key
+                    } as $taken
+                  
+                    conditional {
+                      if ($taken != null) {
+                        var.update $pending_count {
+                          value = $pending_count + 1
+                        }
+                      }
+                    }
+                  }
+                }
+              
+                // A request pushed while the list was being taken stays on it;
+                // requeue the entry so the next run picks it up. Once the list
+                // is gone, a late push sees length 1 and requeues it itself
+                redis.count {
+                  key = $counter_key
+                } as $remaining
+              
+                conditional {
+                  if ($remaining > 0) {
+                    redis.push {
+                      key = "usage:pending"
+                      value = $usage_entry
+                    } as $pending_length
+                  }
+                }
+              
+                conditional {
+                  if ($pending_count > 0) {
+                    redis.get {
+                      key = "usage:last_request_at:" ~ ($key_id|to_text)
+                    } as $last_request_at
+                  
+                    // One additive UPDATE, so overlapping flushes and exact
+                    // mode writes cannot overwrite each other's counts
+                    db.direct_query {
+                      sql = "UPDATE api_keys SET request_count = COALESCE(request_count, 0) + ?, last_request_at = GREATEST(COALESCE(last_request_at, 0), ?) WHERE id = ?"
+                      response_type = "list"
+                      arg = $pending_count
+                      arg = ($last_request_at|first_notnull:now)|to_int
+                      arg = $key_id
+                    } as $usage_applied
+                  
+                    var.update $flushed {
+                      value = $flushed
+                        |set:"keys":($flushed.keys + 1)
+                        |set:"requests":($flushed.requests + $pending_count)
+                    }
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+
+  response = $flushed
+}
\ No newline at end of file
@@ -0,0 +1,168 @@
+// Typo-tolerant fee search used by GET /fees/search?mode=fuzzy
+// Returns up to `limit` fee ids, best match first
+function "fees/fuzzy_search" {
+  input {
+    // Raw search query
+    text q
+  
+    // Maximum ids returned
+    int limit?=20
+  }
+
+  stack {
+    function.run "search/words" {
+      input = {value: $input.q}
+    } as $query_words
+  
+    // Each query word fills one of six slots of the candidate query's where
+    // clause. Longer queries keep their six longest words, the most selective
+    // ones; the rest do not narrow the match
+    var $ordered_words {
+      value = []
+    }
+  
+    foreach ($query_words.words) {
+      each as $word {
+        array.push $ordered_words {
+          value = {
+            word    : $word
+            sort_key: ((1000 - ($word|strlen))|to_text) ~ $word
+          }
+        }
+      }
+    }
+  
+    var $search_words {
+      value = ($ordered_words|sort:sort_key:text:false|map:$$.word)|array_slice:0:6
+    }
+  
+    // For every query word, the catalog words within one edit of it
+    var $alternatives {
+      value = []
+    }
+  
+    foreach ($search_words) {
+      each as $word {
+        conditional {
+          // Words of three characters or fewer match exactly: a one-edit
+          // lookup would let "nin" match "nine"
+          if (($word|strlen) <= 3) {
+            array.push $alternatives {
+              value = {word: $word, terms: [$word]}
+            }
+          }
+        
+          else {
+            function.run "search/variants" {
+              input = {word: $word}
+            } as $word_variants
+          
+            // GIN lookup on the precomputed deletion variants. Only words within
+            // one edit share a variant, so the result is small and is not paged
+            db.query search_vocabulary {
+              where = $db.search_vocabulary.variants overlaps $word_variants.variants
+              sort = {search_vocabulary.term: "asc"}
+              return = {type: "list"}
+            } as $corrections
+          
+            array.push $alternatives {
+              value = {
+                word : $word
+                terms: ($corrections|map:$$.term)|merge:[$word]|unique
+              }
+            }
+          }
+        }
+      }
+    }
+  
+    // One slot per query word (null when the query has fewer words)
+    var $terms_1 {
+      value = ($alternatives|get:0:{terms: null}).terms
+    }
+  
+    var $terms_2 {
+      value = ($alternatives|get:1:{terms: null}).terms
+    }
+  
+    var $terms_3 {
+      value = ($alternatives|get:2:{terms: null}).terms
+    }
+  
+    var $terms_4 {
+      value = ($alternatives|get:3:{terms: null}).terms
+    }
+  
+    var $terms_5 {
+      value = ($alternatives|get:4:{terms: null}).terms
+    }
+  
+    var $terms_6 {
+      value = ($alternatives|get:5:{terms: null}).terms
+    }
+  
+    // Fees holding a spelling of every query word (one GIN overlaps per
+    // word, ANDed), sorted so the page taken is stable. Only fees that match
+    // the whole query are paged, so none are crowded out by partial matches
+    db.query fee_search_index {
+      join = {
+        fee: {
+          table: "fees"
+          where: $db.fee_search_index.fee_id == $db.fee.id
+        }
+      }
+    
+      where = $terms_1 != null && $db.fee_search_index.words overlaps $terms_1 && ($terms_2 == null || $db.fee_search_index.words overlaps $terms_2) && ($terms_3 == null || $db.fee_search_index.words overlaps $terms_3) && ($terms_4 == null || $db.fee_search_index.words overlaps $terms_4) && ($terms_5 == null || $db.fee_search_index.words overlaps $terms_5) && ($terms_6 == null || $db.fee_search_index.words overlaps $terms_6)
+      sort = {fee.name: "asc", fee_search_index.fee_id: "asc"}
+      eval = {name: $db.fee.name}
+      return = {type: "list", paging: {page: 1, per_page: 500}}
+    } as $candidates
+  
+    // Rank exact word hits first, then fees whose name holds the match, then
+    // by name. When more than 500 fees match, the first 500 by name are ranked
+    var $ranked {
+      value = []
+    }
+  
+    foreach ($candidates.items) {
+      each as $candidate {
+        var $exact {
+          value = 0
+        }
+      
+        foreach ($alternatives) {
+          each as $alternative {
+            conditional {
+              if ((($candidate.words|intersect:[$alternative.word])|count) > 0) {
+                math.add $exact {
+                  value = 1
+                }
+              }
+            }
+          }
+        }
+      
+        var $name_words {
+          value = $candidate.name|first_notnull:""|unaccent|to_lower
+        }
+      
+        var $in_name {
+          value = ($alternatives|filter:($name_words|icontains:$$.word))|count
+        }
+      
+        array.push $ranked {
+          value = {
+            fee_id  : $candidate.fee_id
+            sort_key: ((99 - $exact)|to_text) ~ ((99 - $in_name)|to_text) ~ ($name_words)
+          }
+        }
+      }
+    }
+  
+    var $ranked_ids {
+      value = ($ranked|sort:sort_key:text:false|map:$$.fee_id)|array_slice:0:$input.limit
+    }
+  }
+
+  response = $ranked_ids
+}
\ No newline at end of file
@@ -18,6 +18,11 @@ function import_agencies {
       ]
     }
   
+    // Agencies before the import, for the catalog_stats delta
+    db.query agencies {
+      return = {type: "count"}
+    } as $total_before
+  
     // Array to store created agencies
     var $created {
       value = []
@@ -56,6 +61,17 @@ function import_agencies {
       }
     }
   
+    // Keep the /metadata summary row current with the change in the agencies count
+    db.query agencies {
+      return = {type: "count"}
+    } as $total_after
+  
+    function.run "catalog_stats/apply_delta" {
+      input = {
+        totals: {total_agencies: $total_after - $total_before}
+      }
+    } as $catalog_stats
+  
     // Import result
     var $result {
       value = {imported: $count, agencies: $created}
@@ -0,0 +1,479 @@
+// Set-based import of one batch of seed rows (see examples/seed_import.py)
+// Foreign keys are resolved with one query per referenced table, rows whose
+// slug/name already exists are skipped, and the rest go in with one db.bulk.add.
+// Fees are matched on natural_key: new ones are bulk-added (falling back to add_or_edit
+// if a concurrent import wins the race for a key), ones whose content_hash changed are
+// rewritten, and unchanged ones are skipped (see functions/fee_import_key.xs).
+// Written fees are added to the search index and vocabulary in the same pass
+function "import/bulk" {
+  input {
+    // agencies, categories, sources, subcategories or fees
+    text table filters=trim|lower
+  
+    // Rows keyed by slug/name rather than id:
+    //   agencies      {name, slug, website, notes}
+    //   categories    {name, slug, description}
+    //   sources       {name, url, document_ref, notes, agency_slug}
+    //   subcategories {name, slug, description, category_slug}
+    //   fees          {subcategory_slug, source_name, name, amount, currency,
+    //                  service_type, payment_code, description, meta}
+    json rows
+  }
+
+  stack {
+    precondition ($input.table == "agencies" || $input.table == "categories" || $input.table == "sources" || $input.table == "subcategories" || $input.table == "fees") {
+      error_type = "inputerror"
+      error = "Unknown table: " ~ $input.table
+    }
+  
+    var $rows {
+      value = $input.rows|first_notnull:[]
+    }
+  
+    var $imported {
+      value = []
+    }
+  
+    var $updated {
+      value = []
+    }
+  
+    var $rejected {
+      value = []
+    }
+  
+    // New fees per category id, for the catalog_stats delta
+    var $category_deltas {
+      value = {}
+    }
+  
+    conditional {
+      if ($input.table == "agencies") {
+        db.query agencies {
+          where = $db.agencies.slug in ($rows|map:$$.slug)
+          output = ["slug"]
+          return = {type: "list"}
+        } as $existing
+      
+        var $existing_by_key {
+          value = $existing|index_by:"slug"
+        }
+      
+        var $new_rows {
+          value = $rows|filter:(($existing_by_key|get:$$.slug:null) == null)
+        }
+      
+        db.bulk.add agencies {
+          items = $new_rows
+        } as $imported
+      }
+    
+      elseif ($input.table == "categories") {
+        db.query categories {
+          where = $db.categories.slug in ($rows|map:$$.slug)
+          output = ["slug"]
+          return = {type: "list"}
+        } as $existing
+      
+        var $existing_by_key {
+          value = $existing|index_by:"slug"
+        }
+      
+        var $new_rows {
+          value = $rows|filter:(($existing_by_key|get:$$.slug:null) == null)
+        }
+      
+        db.bulk.add categories {
+          items = $new_rows
+        } as $imported
+      }
+    
+      elseif ($input.table == "sources") {
+        // One lookup for every agency the batch references
+        db.query agencies {
+          where = $db.agencies.slug in ($rows|map:$$.agency_slug)
+          output = ["id", "slug"]
+          return = {type: "list"}
+        } as $agencies
+      
+        var $agencies_by_slug {
+          value = $agencies|index_by:"slug"
+        }
+      
+        db.query sources {
+          where = $db.sources.name in ($rows|map:$$.name)
+          output = ["name"]
+          return = {type: "list"}
+        } as $existing
+      
+        var $existing_by_key {
+          value = $existing|index_by:"name"
+        }
+      
+        array.map ($rows|filter:(($existing_by_key|get:$$.name:null) == null)) {
+          by = $this
+            |set:"agency_id":($agencies_by_slug|get:$this.agency_slug:{}|get:"id":null)
+        } as $resolved
+      
+        var.update $rejected {
+          value = $resolved|filter:($$.agency_id == null)
+        }
+      
+        array.map ($resolved|filter:($$.agency_id != null)) {
+          by = $this|unset:"agency_slug"
+        } as $new_rows
+      
+        db.bulk.add sources {
+          items = $new_rows
+        } as $imported
+      }
+    
+      elseif ($input.table == "subcategories") {
+        // One lookup for every category the batch references
+        db.query categories {
+          where = $db.categories.slug in ($rows|map:$$.category_slug)
+          output = ["id", "slug"]
+          return = {type: "list"}
+        } as $categories
+      
+        var $categories_by_slug {
+          value = $categories|index_by:"slug"
+        }
+      
+        db.query subcategories {
+          where = $db.subcategories.slug in ($rows|map:$$.slug)
+          output = ["slug"]
+          return = {type: "list"}
+        } as $existing
+      
+        var $existing_by_key {
+          value = $existing|index_by:"slug"
+        }
+      
+        array.map ($rows|filter:(($existing_by_key|get:$$.slug:null) == null)) {
+          by = $this
+            |set:"category_id":($categories_by_slug|get:$this.category_slug:{}|get:"id":null)
+        } as $resolved
+      
+        var.update $rejected {
+          value = $resolved|filter:($$.category_id == null)
+        }
+      
+        array.map ($resolved|filter:($$.category_id != null)) {
+          by = $this|unset:"category_slug"
+        } as $new_rows
+      
+        db.bulk.add subcategories {
+          items = $new_rows
+        } as $imported
+      }
+    
+      else {
+        // One lookup per referenced table for the whole batch
+        db.query subcategories {
+          where = $db.subcategories.slug in ($rows|map:$$.subcategory_slug)
+          output = ["id", "slug", "category_id"]
+          return = {type: "list"}
+        } as $subcategories
+      
+        var $subcategories_by_slug {
+          value = $subcategories|index_by:"slug"
+        }
+      
+        db.query sources {
+          where = $db.sources.name in ($rows|map:$$.source_name)
+          output = ["id", "name"]
+          return = {type: "list"}
+        } as $sources
+      
+        var $sources_by_name {
+          value = $sources|index_by:"name"
+        }
+      
+        array.map ($rows) {
+          by = $this
+            |set:"subcategory_id":($subcategories_by_slug|get:$this.subcategory_slug:{}|get:"id":null)
+            |set:"source_id":($sources_by_name|get:$this.source_name:{}|get:"id":null)
+        } as $resolved
+      
+        var.update $rejected {
+          value = $resolved|filter:($$.subcategory_id == null || $$.source_id == null)
+        }
+      
+        // Natural key and content hash per row; a key repeated within the batch keeps its first row
+        var $keyed_rows {
+          value = []
+        }
+      
+        var $batch_keys {
+          value = {}
+        }
+      
+        foreach ($resolved|filter:($$.subcategory_id != null && $$.source_id != null)) {
+          each as $row {
+            function.run "fees/import_key" {
+              input = $row|unset:"subcategory_slug"|unset:"source_name"
+            } as $import_key
+          
+            conditional {
+              if (($batch_keys|get:$import_key.natural_key:null) == null) {
+                var.update $batch_keys {
+                  value = $batch_keys|set:$import_key.natural_key:true
+                }
+              
+                array.push $keyed_rows {
+                  value = $import_key
+                }
+              }
+            }
+          }
+        }
+      
+        // One lookup for every fee the batch already has in the table
+        db.query fees {
+          where = $db.fees.natural_key in ($keyed_rows|map:$$.natural_key)
+          output = ["id", "natural_key", "content_hash"]
+          return = {type: "list"}
+        } as $existing
+      
+        var $existing_by_key {
+          value = $existing|index_by:"natural_key"
+        }
+      
+        array.map ($keyed_rows|filter:(($existing_by_key|get:$$.natural_key:null) == null)) {
+          by = $this.data
+        } as $new_rows
+      
+        // A concurrent import can insert one of these natural keys between the lookup
+        // above and this insert; the unique index then rejects the whole batch. In that
+        // case re-read the keys, leave the ones the other import wrote to it, and add the
+        // rest one by one keyed on natural_key, as import_fees does
+        try_catch {
+          try {
+            db.bulk.add fees {
+              items = $new_rows
+            } as $bulk_imported
+          
+            var.update $imported {
+              value = $bulk_imported
+            }
+          }
+        
+          catch {
+            // Only a unique-index violation is that race; any other error fails the batch
+            precondition (($error.message|first_notnull:"")|icontains:"duplicate") {
+              error_type = "standard"
+              error = $error.message|first_notnull:"Bulk insert into fees failed"
+            }
+          
+            db.query fees {
+              where = $db.fees.natural_key in ($new_rows|map:$$.natural_key)
+              output = ["natural_key"]
+              return = {type: "list"}
+            } as $raced
+          
+            var $raced_by_key {
+              value = $raced|index_by:"natural_key"
+            }
+          
+            foreach ($new_rows|filter:(($raced_by_key|get:$$.natural_key:null) == null)) {
+              each as $new_row {
+                db.add_or_edit fees {
+                  field_name = "natural_key"
+                  field_value = $new_row.natural_key
+                  data = $new_row
+                } as $fee_record
+              
+                array.push $imported {
+                  value = $fee_record
+                }
+              }
+            }
+          }
+        }
+      
+        // Search index rows for the whole batch, written together, and the
+        // batch's new fees counted per category
+        var $index_rows {
+          value = []
+        }
+      
+        var $subcategories_by_id {
+          value = $subcategories|index_by:"id"
+        }
+      
+        foreach ($imported) {
+          each as $fee_record {
+            var $fee_category {
+              value = ($subcategories_by_id|get:($fee_record.subcategory_id|to_text)).category_id|to_text
+            }
+          
+            var.update $category_deltas {
+              value = $category_deltas|set:$fee_category:(($category_deltas|get:$fee_category:0) + 1)
+            }
+          
+            function.run "fees/search_terms" {
+              input = {
+                name        : $fee_record.name
+                description : $fee_record.description
+                service_type: $fee_record.service_type
+                payment_code: $fee_record.payment_code
+              }
+            } as $search_terms
+          
+            array.push $index_rows {
+              value = $search_terms|set:"fee_id":$fee_record.id
+            }
+          }
+        }
+      
+        conditional {
+          if (($index_rows|count) > 0) {
+            db.bulk.add fee_search_index {
+              items = $index_rows
+            }
+          }
+        }
+      
+        // Changed fees are rewritten one by one (updated_at is only touched here); unchanged ones are skipped
+        var $written_words {
+          value = []
+        }
+      
+        foreach ($keyed_rows) {
+          each as $import_key {
+            var $current {
+              value = $existing_by_key|get:$import_key.natural_key:null
+            }
+          
+            conditional {
+              if ($current != null && $current.content_hash != $import_key.content_hash) {
+                db.edit fees {
+                  field_name = "id"
+                  field_value = $current.id
+                  data = $import_key.data|set:"updated_at":now
+                } as $fee_record
+              
+                function.run "fees/search_terms" {
+                  input = {
+                    name        : $fee_record.name
+                    description : $fee_record.description
+                    service_type: $fee_record.service_type
+                    payment_code: $fee_record.payment_code
+                  }
+                } as $search_terms
+              
+                db.add_or_edit fee_search_index {
+                  field_name = "fee_id"
+                  field_value = $fee_record.id
+                  data = $search_terms|set:"fee_id":$fee_record.id
+                }
+              
+                array.merge $written_words {
+                  value = $search_terms.words
+                }
+              
+                array.push $updated {
+                  value = $fee_record
+                }
+              }
+            }
+          }
+        }
+      
+        // Vocabulary: one lookup for the batch's words, one insert for the new ones
+        array.merge $written_words {
+          value = $index_rows|map:$$.words|flatten
+        }
+      
+        var $words {
+          value = $written_words|unique
+        }
+      
+        db.query search_vocabulary {
+          where = $db.search_vocabulary.term in $words
+          output = ["term"]
+          return = {type: "list"}
+        } as $known_words
+      
+        var $known_by_term {
+          value = $known_words|index_by:"term"
+        }
+      
+        var $vocabulary_rows {
+          value = []
+        }
+      
+        foreach ($words|filter:(($known_by_term|get:$$:null) == null)) {
+          each as $word {
+            function.run "search/variants" {
+              input = {word: $word}
+            } as $word_variants
+          
+            array.push $vocabulary_rows {
+              value = {term: $word, variants: $word_variants.variants}
+            }
+          }
+        }
+      
+        // Same race as the fee insert: if another import added one of these terms
+        // first, write them one by one keyed on term instead
+        try_catch {
+          try {
+            conditional {
+              if (($vocabulary_rows|count) > 0) {
+                db.bulk.add search_vocabulary {
+                  items = $vocabulary_rows
+                }
+              }
+            }
+          }
+        
+          catch {
+            precondition (($error.message|first_notnull:"")|icontains:"duplicate") {
+              error_type = "standard"
+              error = $error.message|first_notnull:"Bulk insert into search_vocabulary failed"
+            }
+          
+            foreach ($vocabulary_rows) {
+              each as $vocabulary_row {
+                db.add_or_edit search_vocabulary {
+                  field_name = "term"
+                  field_value = $vocabulary_row.term
+                  data = $vocabulary_row
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  
+    // Keep the /metadata and /categories summary row current with this
+    // batch's inserts (a per-batch delta; the nightly task recounts)
+    conditional {
+      if (($imported|count) > 0 || ($updated|count) > 0) {
+        function.run "catalog_stats/apply_delta" {
+          input = {
+            totals             : {}|set:("total_" ~ $input.table):($imported|count)
+            category_fee_counts: $category_deltas
+            fees_changed       : $input.table == "fees"
+          }
+        } as $catalog_stats
+      }
+    }
+  
+    var $result {
+      value = {
+        table   : $input.table
+        received: $rows|count
+        imported: $imported|count
+        updated : $updated|count
+        skipped : ($rows|count) - ($imported|count) - ($updated|count) - ($rejected|count)
+        rejected: $rejected
+      }
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
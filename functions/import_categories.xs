@@ -16,6 +16,11 @@ function import_categories {
       ]
     }
   
+    // Categories before the import, for the catalog_stats delta
+    db.query categories {
+      return = {type: "count"}
+    } as $total_before
+  
     // Array to store created categories
     var $created {
       value = []
@@ -53,6 +58,17 @@ function import_categories {
       }
     }
   
+    // Keep the /metadata summary row current with the change in the categories count
+    db.query categories {
+      return = {type: "count"}
+    } as $total_after
+  
+    function.run "catalog_stats/apply_delta" {
+      input = {
+        totals: {total_categories: $total_after - $total_before}
+      }
+    } as $catalog_stats
+  
     // Import result
     var $result {
       value = {imported: $count, categories: $created}
@@ -1,4 +1,5 @@
 // Import fees from CSV data, mapping subcategories and sources by slug/name
+// Idempotent: rows are matched on natural_key and only inserted or rewritten when their content_hash changes
 function import_fees {
   input {
   }
@@ -19,12 +20,21 @@ function import_fees {
       value = {}
     }
   
+    // Map subcategory id to its category id, for the per-category fee counts
+    var $subcat_category_map {
+      value = {}
+    }
+  
     foreach ($subcategories) {
       each as $subcat {
         // Build slug to id mapping
         var.update $subcat_map {
           value = $subcat_map|set:$subcat.slug:$subcat.id
         }
+      
+        var.update $subcat_category_map {
+          value = $subcat_category_map|set:($subcat.id|to_text):($subcat.category_id|to_text)
+        }
       }
     }
   
@@ -229,11 +239,31 @@ function import_fees {
       value = $university_fees
     }
   
-    // Array to store created fees
+    // Existing fees by natural key, loaded once so unchanged rows cost no query
+    db.query fees {
+      where = $db.fees.natural_key != null
+      output = ["id", "natural_key", "content_hash"]
+      return = {type: "list"}
+    } as $existing_fees
+  
+    var $existing_by_key {
+      value = $existing_fees|index_by:"natural_key"
+    }
+  
+    // Fees written by this run (inserted or changed)
     var $created {
       value = []
     }
   
+    var $counts {
+      value = {inserted: 0, updated: 0, unchanged: 0, rejected: 0}
+    }
+  
+    // Inserted fees per category id, applied to catalog_stats at the end
+    var $category_deltas {
+      value = {}
+    }
+  
     foreach ($all_fees) {
       each as $fee {
         // Resolve subcategory slug from placeholder
@@ -259,87 +289,135 @@ function import_fees {
       
         conditional {
           if ($subcategory_id != null && $source_id != null) {
-            // Build fee data object
-            var $fee_data {
-              value = {
+            function.run "fees/import_key" {
+              input = {
                 subcategory_id: $subcategory_id
                 source_id     : $source_id
                 name          : $fee.name
+                amount        : $fee.amount
                 currency      : $fee.currency
                 service_type  : $fee.service_type
+                payment_code  : $fee.payment_code
                 description   : $fee.description
+                meta          : ((($fee.meta|strlen) > 0) ? ($fee.meta|json_decode) : null)
               }
+            } as $import_key
+          
+            var $existing {
+              value = $existing_by_key|get:$import_key.natural_key:null
             }
           
-            conditional {
-              if ($fee.amount != null) {
-                var.update $fee_data {
-                  value = $fee_data|set:"amount":$fee.amount
-                }
-              }
+            var $fee_record {
+              value = null
             }
           
             conditional {
-              if (($fee.payment_code|strlen) > 0) {
-                var.update $fee_data {
-                  value = $fee_data
-                    |set:"payment_code":$fee.payment_code
+              if ($existing == null) {
+                // New fee; keyed on natural_key so a concurrent import edits instead of duplicating
+                db.add_or_edit fees {
+                  field_name = "natural_key"
+                  field_value = $import_key.natural_key
+                  data = $import_key.data
+                } as $fee_record
+              
+                var.update $counts {
+                  value = $counts|set:"inserted":($counts.inserted + 1)
+                }
+              
+                var $fee_category {
+                  value = $subcat_category_map|get:($subcategory_id|to_text)
+                }
+              
+                var.update $category_deltas {
+                  value = $category_deltas|set:$fee_category:(($category_deltas|get:$fee_category:0) + 1)
+                }
+              }
+            
+              elseif ($existing.content_hash != $import_key.content_hash) {
+                // Changed fee: the only case that touches updated_at
+                db.edit fees {
+                  field_name = "id"
+                  field_value = $existing.id
+                  data = $import_key.data|set:"updated_at":now
+                } as $fee_record
+              
+                var.update $counts {
+                  value = $counts|set:"updated":($counts.updated + 1)
+                }
+              }
+            
+              else {
+                var.update $counts {
+                  value = $counts|set:"unchanged":($counts.unchanged + 1)
                 }
               }
             }
           
             conditional {
-              if (($fee.meta|strlen) > 0) {
-                // Parse JSON meta
-                var $meta_parsed {
-                  value = $fee.meta|json_decode
+              if ($fee_record != null) {
+                // A repeated row in the same run is compared against what was just written
+                var.update $existing_by_key {
+                  value = $existing_by_key
+                    |set:$import_key.natural_key:{id: $fee_record.id, content_hash: $import_key.content_hash}
+                }
+              
+                // Index the new or changed fee for /fees/search
+                function.run "fees/search_terms" {
+                  input = {
+                    name        : $fee_record.name
+                    description : $fee_record.description
+                    service_type: $fee_record.service_type
+                    payment_code: $fee_record.payment_code
+                  }
+                } as $search_terms
+              
+                db.add_or_edit fee_search_index {
+                  field_name = "fee_id"
+                  field_value = $fee_record.id
+                  data = $search_terms|set:"fee_id":$fee_record.id
                 }
               
-                var.update $fee_data {
-                  value = $fee_data|set:"meta":$meta_parsed
+                // Learn the fee's words for fuzzy spelling correction
+                function.run "search/add_vocabulary" {
+                  input = {words: $search_terms.words}
+                }
+              
+                array.push $created {
+                  value = $fee_record
                 }
               }
             }
-          
-            // Add fee record
-            db.add fees {
-              data = {
-                subcategory_id: $subcategory_id
-                source_id     : $source_id
-                name          : $fee.name
-                currency      : $fee.currency
-                service_type  : $fee.service_type
-                description   : $fee.description
-                amount        : $fee.amount
-                payment_code  : $fee.payment_code
-                meta          : ((($fee.meta|strlen) > 0) ? ($fee.meta|json_decode) : null)
-              }
-            } as $fee_record
-          
-            array.push $created {
-              value = $fee_record
+          }
+        
+          else {
+            var.update $counts {
+              value = $counts|set:"rejected":($counts.rejected + 1)
             }
           }
         }
       }
     }
   
-    // Count imported fees
-    var $count {
-      value = 0
-    }
-  
-    foreach ($created) {
-      each as $item {
-        math.add $count {
-          value = 1
-        }
+    conditional {
+      if (($created|count) > 0) {
+        // Keep the /metadata and /categories summary row current; changed
+        // fees keep their subcategory (it is part of the natural key), so
+        // only inserts move the counts
+        function.run "catalog_stats/apply_delta" {
+          input = {
+            totals             : {total_fees: $counts.inserted}
+            category_fee_counts: $category_deltas
+            fees_changed       : true
+          }
+        } as $catalog_stats
       }
     }
   
-    // Import result
+    // Import result: imported counts the rows written (inserted + updated)
     var $result {
-      value = {imported: $count, fees: $created}
+      value = $counts
+        |set:"imported":($created|count)
+        |set:"fees":$created
     }
   }
 
@@ -40,6 +40,11 @@ function import_sources {
       ]
     }
   
+    // Sources before the import, for the catalog_stats delta
+    db.query sources {
+      return = {type: "count"}
+    } as $total_before
+  
     // Array to store created sources
     var $created {
       value = []
@@ -88,6 +93,17 @@ function import_sources {
       }
     }
   
+    // Keep the /metadata summary row current with the change in the sources count
+    db.query sources {
+      return = {type: "count"}
+    } as $total_after
+  
+    function.run "catalog_stats/apply_delta" {
+      input = {
+        totals: {total_sources: $total_after - $total_before}
+      }
+    } as $catalog_stats
+  
     // Import result
     var $result {
       value = {imported: $count, sources: $created}
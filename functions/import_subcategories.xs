@@ -37,9 +37,15 @@ function import_subcategories {
         {name: "JAMB", slug: "jamb", description: "JAMB UTME, DE and service fees", category_slug: "education"}
         {name: "IKEDC Tariff", slug: "ikedc-tariff", description: "Ikeja Electric tariff structure", category_slug: "electricity"}
         {name: "EKEDC Tariff", slug: "ekedc-tariff", description: "Eko Electric tariff structure", category_slug: "electricity"}
+        {name: "UNILAG", slug: "unilag", description: "University of Lagos acceptance, application and prospectus fees", category_slug: "education"}
       ]
     }
   
+    // Subcategories before the import, for the catalog_stats delta
+    db.query subcategories {
+      return = {type: "count"}
+    } as $total_before
+  
     // Array to store created subcategories
     var $created {
       value = []
@@ -87,6 +93,17 @@ function import_subcategories {
       }
     }
   
+    // Keep the /metadata summary row current with the change in the subcategories count
+    db.query subcategories {
+      return = {type: "count"}
+    } as $total_after
+  
+    function.run "catalog_stats/apply_delta" {
+      input = {
+        totals: {total_subcategories: $total_after - $total_before}
+      }
+    } as $catalog_stats
+  
     // Import result
     var $result {
       value = {imported: $count, subcategories: $created}
@@ -0,0 +1,126 @@
+// Recompute the catalog_stats summary row read by GET /metadata and GET /categories
+// A full recount: run by the nightly task and when the row does not exist yet. Write
+// paths apply deltas instead (see functions/apply_catalog_stats_delta.xs)
+function "catalog_stats/refresh" {
+  input {
+  }
+
+  stack {
+    // Count total fees
+    db.query fees {
+      return = {type: "count"}
+    } as $total_fees
+  
+    // Count total categories
+    db.query categories {
+      return = {type: "count"}
+    } as $total_categories
+  
+    // Count total agencies
+    db.query agencies {
+      return = {type: "count"}
+    } as $total_agencies
+  
+    // Count total subcategories
+    db.query subcategories {
+      return = {type: "count"}
+    } as $total_subcategories
+  
+    // Count total sources
+    db.query sources {
+      return = {type: "count"}
+    } as $total_sources
+  
+    // Per-category fee counts for GET /categories: one pass over fees joined
+    // to subcategories, projected to the category id and grouped. The pass is
+    // paid nightly instead of on every write or /categories request
+    db.query fees {
+      join = {
+        subcategory: {
+          table: "subcategories"
+          where: $db.fees.subcategory_id == $db.subcategory.id
+        }
+      }
+    
+      eval = {category_id: $db.subcategory.category_id}
+      output = ["category_id"]
+      return = {type: "list"}
+    } as $fee_categories
+  
+    array.group_by ($fee_categories) {
+      by = $this.category_id
+    } as $fees_by_category
+  
+    var $category_fee_counts {
+      value = {}
+    }
+  
+    foreach ($fees_by_category|keys) {
+      each as $category_id {
+        var.update $category_fee_counts {
+          value = $category_fee_counts|set:$category_id:(($fees_by_category|get:$category_id)|count)
+        }
+      }
+    }
+  
+    // Latest fee update (served by the updated_at index)
+    db.query fees {
+      sort = {fees.updated_at: "desc"}
+      return = {type: "single"}
+    } as $latest_fee
+  
+    // Latest deletion, so removing a fee also moves last_database_update
+    db.query fee_tombstones {
+      sort = {fee_tombstones.deleted_at: "desc"}
+      return = {type: "single"}
+    } as $latest_tombstone
+  
+    var $last_update {
+      value = ($latest_fee != null) ? $latest_fee.updated_at : now
+    }
+  
+    conditional {
+      if ($latest_tombstone != null) {
+        var.update $last_update {
+          value = $last_update|max:$latest_tombstone.deleted_at
+        }
+      }
+    }
+  
+    var $stats {
+      value = {
+        total_fees          : $total_fees
+        total_categories    : $total_categories
+        total_agencies      : $total_agencies
+        total_subcategories : $total_subcategories
+        total_sources       : $total_sources
+        category_fee_counts : $category_fee_counts
+        last_database_update: $last_update
+        refreshed_at        : now
+      }
+    }
+  
+    db.get catalog_stats {
+      field_name = "id"
+      field_value = 1
+    } as $existing
+  
+    conditional {
+      if ($existing == null) {
+        db.add catalog_stats {
+          data = $stats|set:"id":1
+        } as $stats_record
+      }
+    
+      else {
+        db.edit catalog_stats {
+          field_name = "id"
+          field_value = 1
+          data = $stats
+        } as $stats_record
+      }
+    }
+  }
+
+  response = $stats
+}
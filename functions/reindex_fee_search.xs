@@ -0,0 +1,41 @@
+// Rebuild fee_search_index and search_vocabulary for every fee (run once after deploying the search index or changing fees/search_terms)
+function "fees/reindex_search" {
+  input {
+  }
+
+  stack {
+    db.query fees {
+      return = {type: "list"}
+    } as $fees
+  
+    foreach ($fees) {
+      each as $fee {
+        function.run "fees/search_terms" {
+          input = {
+            name        : $fee.name
+            description : $fee.description
+            service_type: $fee.service_type
+            payment_code: $fee.payment_code
+          }
+        } as $terms
+      
+        db.add_or_edit fee_search_index {
+          field_name = "fee_id"
+          field_value = $fee.id
+          data = $terms|set:"fee_id":$fee.id
+        }
+      
+        // Learn the fee's words for fuzzy spelling correction
+        function.run "search/add_vocabulary" {
+          input = {words: $terms.words}
+        }
+      }
+    }
+  
+    var $result {
+      value = {reindexed: $fees|count}
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
@@ -0,0 +1,43 @@
+// Add words to search_vocabulary with their one-deletion variants (fuzzy mode index)
+function "search/add_vocabulary" {
+  input {
+    text[] words?
+  }
+
+  stack {
+    var $added {
+      value = 0
+    }
+  
+    foreach ($input.words|first_notnull:[]) {
+      each as $word {
+        db.has search_vocabulary {
+          field_name = "term"
+          field_value = $word
+        } as $known
+      
+        conditional {
+          if ($known == false) {
+            function.run "search/variants" {
+              input = {word: $word}
+            } as $word_variants
+          
+            db.add search_vocabulary {
+              data = {term: $word, variants: $word_variants.variants}
+            }
+          
+            math.add $added {
+              value = 1
+            }
+          }
+        }
+      }
+    }
+  
+    var $result {
+      value = {added: $added}
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
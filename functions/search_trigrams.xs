@@ -0,0 +1,45 @@
+// Normalize text for search and split it into trigrams
+// Lower-cases, strips accents, and turns punctuation into spaces ("N.I.N" -> "n i n")
+function "search/trigrams" {
+  input {
+    // Text to normalize
+    text value?
+  }
+
+  stack {
+    var $normalized {
+      value = "/[^a-z0-9]+/"|regex_replace:" ":($input.value|first_notnull:""|unaccent|to_lower)
+    }
+  
+    var.update $normalized {
+      value = $normalized|trim
+    }
+  
+    var $grams {
+      value = []
+    }
+  
+    // Trigrams are taken per word so they never span a word boundary
+    foreach ($normalized|split:" ") {
+      each as $word {
+        conditional {
+          if (($word|strlen) >= 3) {
+            for (($word|strlen) - 2) {
+              each as $index {
+                array.push $grams {
+                  value = $word|substr:$index:3
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  
+    var $result {
+      value = {normalized: $normalized, grams: $grams|unique}
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
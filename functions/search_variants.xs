@@ -0,0 +1,36 @@
+// Return a word plus every variant with one character deleted (symmetric delete spelling correction)
+// Words of three characters or fewer get no deletions; fees/fuzzy_search
+// skips the variant lookup for such query words so they match exactly
+function "search/variants" {
+  input {
+    text word
+  }
+
+  stack {
+    var $length {
+      value = $input.word|strlen
+    }
+  
+    var $variants {
+      value = [$input.word]
+    }
+  
+    conditional {
+      if ($length > 3) {
+        for ($length) {
+          each as $index {
+            array.push $variants {
+              value = ($input.word|substr:0:$index) ~ ($input.word|substr:($index + 1):($length - $index - 1))
+            }
+          }
+        }
+      }
+    }
+  
+    var $result {
+      value = {variants: $variants|unique}
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
@@ -0,0 +1,59 @@
+// Split text into canonical search words for fuzzy matching
+// Normalizes like search/trigrams, joins spelled-out initials ("n i n" -> "nin")
+// and maps known long forms to their abbreviation ("national identification number" -> "nin")
+function "search/words" {
+  input {
+    // Text to split
+    text value?
+  }
+
+  stack {
+    // Long forms users type for the same thing, mapped to one canonical word
+    var $synonyms {
+      value = [
+        {phrase: "national identification number", term: "nin"}
+        {phrase: "national identity number", term: "nin"}
+        {phrase: "national identity management commission", term: "nimc"}
+        {phrase: "joint admissions and matriculation board", term: "jamb"}
+        {phrase: "unified tertiary matriculation examination", term: "utme"}
+        {phrase: "national examinations council", term: "neco"}
+        {phrase: "senior school certificate examination", term: "ssce"}
+        {phrase: "basic education certificate examination", term: "bece"}
+        {phrase: "nigeria immigration service", term: "nis"}
+        {phrase: "eko electricity distribution company", term: "ekedc"}
+        {phrase: "e passport", term: "passport"}
+        {phrase: "license", term: "licence"}
+      ]
+    }
+  
+    var $text {
+      value = "/[^a-z0-9]+/"|regex_replace:" ":($input.value|first_notnull:""|unaccent|to_lower)
+    }
+  
+    // Join single characters separated by spaces ("n i n" -> "nin")
+    var.update $text {
+      value = "/\\b([a-z0-9]) (?=[a-z0-9]\\b)/"|regex_replace:"$1":$text
+    }
+  
+    // Pad with spaces so phrases only match whole words
+    var.update $text {
+      value = " " ~ ($text|trim) ~ " "
+    }
+  
+    foreach ($synonyms) {
+      each as $synonym {
+        var.update $text {
+          value = $text|replace:(" " ~ $synonym.phrase ~ " "):(" " ~ $synonym.term ~ " ")
+        }
+      }
+    }
+  
+    var $result {
+      value = {
+        words: (($text|trim|split:" ")|filter:(($$|strlen) > 0))|unique
+      }
+    }
+  }
+
+  response = $result
+}
\ No newline at end of file
@@ -23,16 +23,19 @@ table api_keys {
     bool is_active?=true
   
     // Number of requests made with this API key
-    // Total number of requests made using this API key
+    // Total number of requests made using this API key (lifetime; never reset)
     int request_count?
   
     // Timestamp of the last request made with this API key
     // Timestamp of the most recent request using this API key
     timestamp last_request_at?
   
-    // Timestamp when the request count was last reset
-    // Timestamp when the request count was last reset
+    // Start of the database fallback rate-limit window
+    // Only moves while the Redis limiter is unavailable (see functions/auth_api_key.xs)
     timestamp last_reset_at?=now
+  
+    // Requests counted in the fallback window starting at last_reset_at
+    int window_request_count?
   }
 
   index = [
@@ -0,0 +1,36 @@
+table catalog_stats {
+  auth = false
+
+  schema {
+    // Primary key (the summary is a single row with id 1)
+    int id
+  
+    // Number of fees
+    int total_fees?
+  
+    // Number of categories
+    int total_categories?
+  
+    // Number of agencies
+    int total_agencies?
+  
+    // Number of subcategories
+    int total_subcategories?
+  
+    // Number of sources
+    int total_sources?
+  
+    // Fee count per category id, e.g. {"3": 41}; categories without fees are absent
+    json category_fee_counts?
+  
+    // Latest fee update or deletion
+    timestamp last_database_update?
+  
+    // Time the summary was last recomputed
+    timestamp refreshed_at?=now
+  }
+
+  index = [
+    {type: "primary", field: [{name: "id"}]}
+  ]
+}
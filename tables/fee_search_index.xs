@@ -0,0 +1,37 @@
+table fee_search_index {
+  auth = false
+
+  schema {
+    // Primary key for the index row
+    int id
+  
+    // Fee this row indexes
+    int fee_id {
+      table = "fees"
+    }
+  
+    // Normalized name, service type, payment code and description,
+    // separated by " | " so a substring match cannot span two fields
+    text search_text?
+  
+    // Normalized name (tier 1 substring check)
+    text name_text?
+  
+    // Trigrams of search_text
+    text[] search_terms?
+  
+    // Trigrams of the normalized name (name matches rank first)
+    text[] name_terms?
+  
+    // Canonical words of search_text with synonyms applied (fuzzy mode)
+    text[] words?
+  }
+
+  index = [
+    {type: "primary", field: [{name: "id"}]}
+    {type: "btree|unique", field: [{name: "fee_id", op: "asc"}]}
+    {type: "gin", field: [{name: "search_terms"}]}
+    {type: "gin", field: [{name: "name_terms"}]}
+    {type: "gin", field: [{name: "words"}]}
+  ]
+}
\ No newline at end of file
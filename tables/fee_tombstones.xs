@@ -0,0 +1,20 @@
+table fee_tombstones {
+  auth = false
+
+  schema {
+    // Primary key for the tombstone
+    int id
+  
+    // ID of the fee that was deleted
+    int fee_id
+  
+    // Time the fee was deleted
+    timestamp deleted_at?=now
+  }
+
+  index = [
+    {type: "primary", field: [{name: "id"}]}
+    {type: "btree", field: [{name: "deleted_at", op: "asc"}]}
+    {type: "btree", field: [{name: "fee_id", op: "asc"}]}
+  ]
+}
@@ -33,9 +33,18 @@ table fees {
     // Detailed description of the fee
     text description?
   
-    // Additional metadata stored as JSON
+    // Additional metadata stored as JSON; meta.state gets a lowercased meta.state_key
+    // copy on write for the GET /fees state filter (see functions/fee_import_key.xs;
+    // tasks/backfill_fee_state_keys.xs keys rows written any other way). The public
+    // endpoints strip state_key from the meta they return
     json meta?
   
+    // Import identity: subcategory_id|name|service_type, lowercased (see functions/fee_import_key.xs)
+    text natural_key?
+  
+    // SHA-256 of the stored fields; re-imports skip rows whose hash is unchanged
+    text content_hash?
+  
     // Time the record was created
     timestamp created_at?=now
   
@@ -45,8 +54,11 @@ table fees {
 
   index = [
     {type: "primary", field: [{name: "id"}]}
-    {type: "btree", field: [{name: "subcategory_id", op: "asc"}]}
+    {type: "btree", field: [{name: "subcategory_id", op: "asc"}, {name: "name", op: "asc"}]}
     {type: "btree", field: [{name: "source_id", op: "asc"}]}
     {type: "btree", field: [{name: "name", op: "asc"}]}
+    {type: "btree", field: [{name: "updated_at", op: "asc"}, {name: "id", op: "asc"}]}
+    {type: "gin", field: [{name: "meta"}]}
+    {type: "btree|unique", field: [{name: "natural_key", op: "asc"}]}
   ]
 }
\ No newline at end of file
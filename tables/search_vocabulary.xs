@@ -0,0 +1,21 @@
+table search_vocabulary {
+  auth = false
+
+  schema {
+    // Primary key for the vocabulary entry
+    int id
+  
+    // Canonical word that appears in at least one fee
+    text term filters=trim|lower
+  
+    // The word and every variant with one character deleted; two words whose
+    // variant sets overlap are within one edit of each other
+    text[] variants?
+  }
+
+  index = [
+    {type: "primary", field: [{name: "id"}]}
+    {type: "btree|unique", field: [{name: "term", op: "asc"}]}
+    {type: "gin", field: [{name: "variants"}]}
+  ]
+}
\ No newline at end of file
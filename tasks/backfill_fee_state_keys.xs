@@ -0,0 +1,14 @@
+// Re-key meta.state_key nightly for fees written outside the import paths, so GET /fees?state= finds them
+task "backfill_fee_state_keys" {
+  stack {
+    function.run "fees/backfill_state_keys" {
+      input = {}
+    } as $backfill
+  
+    debug.log {
+      value = "fee state keys backfilled: " ~ ($backfill.keyed|to_text) ~ " fees"
+    }
+  }
+
+  schedule = [{starts_on: 2026-05-01 02:30:00+0000, freq: 86400}]
+}
\ No newline at end of file
@@ -0,0 +1,14 @@
+// Flush buffered API key usage counters into api_keys every minute
+task "flush_api_key_usage" {
+  stack {
+    function.run "auth/flush_usage" {
+      input = {}
+    } as $flushed
+  
+    debug.log {
+      value = "api key usage flushed: " ~ ($flushed.requests|to_text) ~ " requests across " ~ ($flushed.keys|to_text) ~ " keys"
+    }
+  }
+
+  schedule = [{starts_on: 2026-05-01 00:00:00+0000, freq: 60}]
+}
\ No newline at end of file
@@ -0,0 +1,14 @@
+// Recompute catalog_stats nightly; write paths only apply deltas, so this corrects any drift
+task "refresh_catalog_stats" {
+  stack {
+    function.run "catalog_stats/refresh" {
+      input = {}
+    } as $stats
+  
+    debug.log {
+      value = "catalog_stats refreshed: " ~ ($stats.total_fees|to_text) ~ " fees"
+    }
+  }
+
+  schedule = [{starts_on: 2026-05-01 02:00:00+0000, freq: 86400}]
+}